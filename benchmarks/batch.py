@@ -0,0 +1,89 @@
+""" Moves per second of single move calls against batches with Game.play
+
+    Records seeded Expert games played by the Solver (guessing a random hidden
+    cell whenever it gets stuck), then plays every game's moves again on a fresh
+    Game in each mode:
+        show        Game.show, Game.flag and Game.showAround one move at a time,
+                    printing the board after each as the command line does
+                    (printed to os.devnull)
+        calls       Game.reveal, Game.toggleFlag and Game.chord one move at a time
+        play N      Game.play with batches of N moves, "all" for one batch per game
+    Checks every mode ends on the recorded board and reports moves per second.
+
+    Usage: python benchmarks/batch.py [-n GAMES] [--rows R] [--cols C] [--mines M]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from minesweeper import Game, UNKNOWN
+from minesweeper.engine import START_MOVE, SHOW_MOVE, FLAG_MOVE, CHORD_MOVE
+from minesweeper.solver import Solver
+
+def record(rows, cols, mines, seed, rng):
+    """ Plays one game with the Solver, returns its moves as (action, pos) and its final state """
+    game = Game(rows, cols, mines, seed, renderMode="quiet")
+    game.recordMoves()
+    first = (rows // 2) * cols + cols // 2
+    game.start(first)
+    game.reveal(first)
+    solver = Solver(game)
+    while not game.lost and not game.checkEnd():
+        if not solver.step():
+            hidden = [pos for pos, value in enumerate(game.state) if value == UNKNOWN]
+            solver.update(game.reveal(rng.choice(hidden)))
+    return list(zip(game.log.actions, game.log.positions)), game.state
+
+def single(game, moves, printing):
+    """ Plays moves one call at a time """
+    if printing: actions = {SHOW_MOVE: game.show, FLAG_MOVE: game.flag, CHORD_MOVE: game.showAround}
+    else: actions = {SHOW_MOVE: game.reveal, FLAG_MOVE: game.toggleFlag, CHORD_MOVE: game.chord}
+    for action, pos in moves:
+        if action == START_MOVE: game.start(pos)
+        else: actions[action](pos)
+
+def batched(game, moves, size):
+    """ Plays moves with Game.play, size moves at a time """
+    for first in range(0, len(moves), size):
+        game.play(moves[first:first + size])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-n", "--games", type=int, default=300)
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--mines", type=int, default=99)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    games = [(seed,) + record(args.rows, args.cols, args.mines, seed, rng) for seed in range(args.games)]
+    total = sum([len(moves) for seed, moves, state in games])
+    print("%d games on %dx%d with %d mines, %d moves" % (args.games, args.rows, args.cols, args.mines, total))
+
+    longest = max([len(moves) for seed, moves, state in games])
+    modes = [("show", lambda game, moves: single(game, moves, True), "full"),
+             ("calls", lambda game, moves: single(game, moves, False), "quiet")]
+    for size in (1, 16):
+        modes.append(("play %d" % size, lambda game, moves, size=size: batched(game, moves, size), "quiet"))
+    modes.append(("play all", lambda game, moves: batched(game, moves, longest), "quiet"))
+
+    print("%-10s %12s %10s" % ("mode", "moves/s", "time"))
+    with open(os.devnull, "w") as devnull:
+        for name, run, renderMode in modes:
+            boards = [Game(args.rows, args.cols, args.mines, seed, renderMode) for seed, moves, state in games]
+            startTime = time.perf_counter()
+            with contextlib.redirect_stdout(devnull):
+                for game, (seed, moves, state) in zip(boards, games):
+                    run(game, moves)
+            elapsed = time.perf_counter() - startTime
+            if any([game.state != state for game, (seed, moves, state) in zip(boards, games)]):
+                sys.exit(name + " did not end on the recorded boards")
+            print("%-10s %12d %8.3fs" % (name, total / elapsed, elapsed))
+
+if __name__ == "__main__":
+    main()
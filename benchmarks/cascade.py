@@ -0,0 +1,35 @@
+""" Worst case cascade benchmark for the floodReveal() engine
+
+    Starts a Game with no mines, so the first reveal cascades over the whole board,
+    and reports how long the reveal took and how many cells it opened.
+    The old recursive reveal could not finish this at all: it needed one
+    stack frame per cell in the cascade and hit the recursion limit.
+
+    Usage: python benchmarks/cascade.py [--rows N] [--cols N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from minesweeper import Game
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--cols", type=int, default=1000)
+    args = parser.parse_args()
+
+    game = Game(args.rows, args.cols, 0)
+    game.start(0)
+    startTime = time.perf_counter()
+    changed = game.reveal(0)
+    elapsed = time.perf_counter() - startTime
+    print("%dx%d zero board: revealed %d cells in %.3fs (%.0f cells/s)"
+          % (args.rows, args.cols, len(changed), elapsed, len(changed) / elapsed))
+    if len(changed) != args.rows * args.cols: sys.exit("cascade did not reveal every cell")
+
+if __name__ == "__main__":
+    main()
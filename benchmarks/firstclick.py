@@ -0,0 +1,42 @@
+""" First click latency on boards of growing size
+
+    Starts seeded games on square boards of 16% mines and times the first click
+    in two parts: Game.start, which places the mines, and the reveal of the
+    clicked cell, in the middle of the board, with its cascade. The seed is
+    fixed so every run opens the same region. Also reports the number of cells
+    revealed and of cells whose neighbour count was worked out, a row at a time.
+
+    Usage: python benchmarks/firstclick.py [--sizes N,N,...]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from minesweeper.engine import Game, NOT_COUNTED
+
+DENSITY = 0.16
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", default="30,300,1000,2000")
+    args = parser.parse_args()
+    print("%-10s %10s %10s %10s %10s %10s" % ("board", "mines", "start", "reveal", "revealed", "counted"))
+    for side in [int(size) for size in args.sizes.split(",")]:
+        mines = int(DENSITY * side * side)
+        #the first click is in the middle of the board
+        pos = (side // 2) * side + side // 2
+        game = Game(side, side, mines, 1, renderMode="quiet")
+        startTime = time.perf_counter()
+        game.start(pos)
+        started = time.perf_counter()
+        changed = game.reveal(pos)
+        revealed = time.perf_counter()
+        counted = len(game.counts) - game.counts.count(NOT_COUNTED)
+        print("%-10s %10d %8.1fms %8.1fms %10d %10d" % ("%dx%d" % (side, side), mines, 1000 * (started - startTime),
+              1000 * (revealed - started), len(changed), counted))
+
+if __name__ == "__main__":
+    main()
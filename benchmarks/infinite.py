@@ -0,0 +1,58 @@
+""" Memory used by an InfiniteGame exploring far beyond its memory budget
+
+    Reveals cells along a spiral walk over an ever growing area of an unbounded
+    board and reports, as the explored area grows, how many chunks have been
+    generated, how many are resident, how many were spilled to disk and the
+    bytes held by the resident chunks, which must stay within the budget.
+
+    Usage: python benchmarks/infinite.py [--budget BYTES] [--chunk-size N] [--moves N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from minesweeper.infinite import InfiniteGame
+
+def spiral(step):
+    """ Yields the (row, col) of a square spiral outwards from (0, 0), step cells apart """
+    row = col = 0
+    length = 1
+    yield row, col
+    while True:
+        for drow, dcol in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            for i in range(length):
+                row += drow * step
+                col += dcol * step
+                yield row, col
+            if drow == 0: continue
+            length += 1
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--budget", type=int, default=2**20, help="memory budget in bytes")
+    parser.add_argument("--chunk-size", type=int, default=32)
+    parser.add_argument("--moves", type=int, default=4000)
+    parser.add_argument("--seed", type=int, default=2018)
+    args = parser.parse_args()
+
+    game = InfiniteGame(0.16, args.seed, args.chunk_size, args.budget)
+    print("budget %d bytes, %d resident chunks of %dx%d" % (args.budget, game.maxChunks, args.chunk_size, args.chunk_size))
+    print("%8s %10s %10s %10s %10s %12s %8s" % ("moves", "revealed", "generated", "resident", "spilled", "bytes", "seconds"))
+    startTime = time.perf_counter()
+    moves = 0
+    for row, col in spiral(args.chunk_size // 2):
+        if moves == args.moves: break
+        #play around mines so the walk never ends the game
+        if game.stateAt(row, col) == 9 and not game.isMine(row, col):
+            game.reveal(row, col)
+        moves += 1
+        if moves % (args.moves // 10 or 1) == 0:
+            print("%8d %10d %10d %10d %10d %12d %8.2f" % (moves, game.numChecked, game.generated,
+                  len(game.chunks), len(game.spilled), game.residentBytes(), time.perf_counter() - startTime))
+    game.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+""" Memory benchmark for the minesweeper.Game board representation
+
+    Reports the bytes used per cell by a started Game for a range of board sizes,
+    next to the per-cell cost of the old layout (one Square object per cell with
+    an 8 element list of adjacent Squares), which is rebuilt here for comparison.
+    The neighbourTable shared by every Game of a shape is built before the Game
+    is measured and reported in a column of its own.
+
+    Usage: python benchmarks/memory.py [--max-cells N] [--legacy-max-cells N]
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from minesweeper import Game
+from minesweeper.engine import neighbourTable, MAX_TABLE_CELLS
+
+# board shapes as (rows, cols), mines are placed at Expert density (~20%)
+SIZES = [(8, 8), (16, 30), (100, 100), (316, 317), (1000, 1000), (2000, 2000), (2500, 4000)]
+
+class LegacySquare(object):
+    """ Copy of the per-cell object used by the original Game """
+    def __init__(self, shown = 9, mine = False, count = 0):
+        self.shown = shown
+        self.mine = mine
+        self.count = count
+        self.adj = []
+        for i in range(8): self.adj.append(None)
+
+def legacyBoard(row, col):
+    """ Builds the old list of linked Squares the same way the original Game.__init__ did """
+    state = [LegacySquare() for i in range(row*col)]
+    for i in range(row*col):
+        sqr = state[i]
+        r, c = divmod(i, col)
+        if r != 0:
+            if c != 0: sqr.adj[0] = state[i-col-1]
+            if c != col - 1: sqr.adj[2] = state[i-col+1]
+            sqr.adj[1] = state[i-col]
+        if r != row - 1:
+            if c != 0: sqr.adj[5] = state[i+col-1]
+            if c != col - 1: sqr.adj[7] = state[i+col+1]
+            sqr.adj[6] = state[i+col]
+        if c != 0: sqr.adj[3] = state[i-1]
+        if c != col - 1: sqr.adj[4] = state[i+1]
+    return state
+
+def arrayBoard(row, col):
+    """ Builds and starts a Game with the packed array board """
+    game = Game(row, col, row*col // 5)
+    game.start(0)
+    return game
+
+def sharedTable(row, col):
+    """ Builds the neighbourTable of the shape, as the first Game of that shape does """
+    neighbourTable.cache_clear()
+    return neighbourTable(row, col)
+
+def measure(build, row, col):
+    """ Returns the number of bytes still allocated after build(row, col) """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    board = build(row, col)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del board
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--max-cells", type=int, default=10**7)
+    parser.add_argument("--legacy-max-cells", type=int, default=10**6,
+                        help="largest board built with the old layout (it needs ~230 bytes per cell)")
+    args = parser.parse_args()
+
+    print("%12s %14s %14s %14s" % ("cells", "before B/cell", "after B/cell", "table B/cell"))
+    for row, col in SIZES:
+        cells = row * col
+        if cells > args.max_cells: break
+        before = "-"
+        if cells <= args.legacy_max_cells:
+            before = "%.1f" % (measure(legacyBoard, row, col) / cells)
+        table = "-"
+        if cells <= MAX_TABLE_CELLS:
+            table = "%.1f" % (measure(sharedTable, row, col) / cells)
+        after = "%.1f" % (measure(arrayBoard, row, col) / cells)
+        print("%12d %14s %14s %14s" % (cells, before, after, table))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+""" Cost of the instrumentation hooks
+
+    Plays the same seeded games three times through Game.start and Game.show
+    (revealing every safe cell in a random order, with quiet rendering):
+        off        without ever installing the hooks
+        removed    after installing the hooks and uninstalling them again
+        on         with the hooks installed and recording
+    and reports the time per Game.show call of each, and the summary of the
+    metrics recorded by the instrumented run.
+
+    Usage: python benchmarks/metrics.py [-n GAMES] [--rows R] [--cols C] [--mines M]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from minesweeper import Game
+from minesweeper import metrics
+
+def playAll(games, rows, cols, mines):
+    """ Plays the seeded games, returns (seconds, number of Game.show calls) """
+    calls = 0
+    startTime = time.perf_counter()
+    for seed in range(games):
+        game = Game(rows, cols, mines, seed, renderMode="quiet")
+        order = list(range(rows * cols))
+        random.Random(seed).shuffle(order)
+        game.start(order[0])
+        for pos in order:
+            if not game.mines[pos]:
+                game.show(pos)
+                calls += 1
+    return time.perf_counter() - startTime, calls
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-n", "--games", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--mines", type=int, default=99)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    def off():
+        return playAll(args.games, args.rows, args.cols, args.mines)
+    def removed():
+        metrics.enable().uninstall()
+        return off()
+    recorder = []
+    def on():
+        recorder.append(metrics.enable())
+        try: return off()
+        finally: recorder[-1].uninstall()
+
+    #the modes take turns so they all see the same machine conditions
+    results = {}
+    for i in range(args.repeat):
+        for name, run in (("off", off), ("removed", removed), ("on", on)):
+            result = run()
+            if name not in results or result < results[name]: results[name] = result
+    base = results["off"][0]
+    for name in ("off", "removed", "on"):
+        elapsed, calls = results[name]
+        print("%-8s %8.3fs %8.2fus per Game.show %+7.1f%%" % (name, elapsed, 1e6 * elapsed / calls, 100 * (elapsed - base) / base))
+    print()
+    print(recorder[-1].summary())
+
+if __name__ == "__main__":
+    main()
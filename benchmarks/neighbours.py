@@ -0,0 +1,82 @@
+""" Allocation savings of the shared neighbour tables
+
+    Plays the engine's adjacency-heavy paths on an Expert and a 100x100 board
+    (the largest shape given a table by default, see engine.MAX_TABLE_CELLS):
+    placing the mines, the cascade of a first click on a board whose mines are
+    all in the bottom rows, and a flagsAround/chord check of every revealed cell.
+    Each board is played twice:
+        lists   Game.adjacent builds a new list on every call (the tables turned off)
+        table   Game.adjacent reads the shared neighbourTable of the board's shape
+    For each it reports the adjacent() calls made, the lists they allocated, the
+    bytes those lists took, the time taken, and the one-off cost and size of
+    building the table for the shape.
+
+    Usage: python benchmarks/neighbours.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from minesweeper import engine
+from minesweeper.engine import Game, neighbourTable
+
+# (name, rows, cols, mines)
+SIZES = [
+    ("expert", 16, 30, 99),
+    ("100x100", 100, 100, 1600),
+]
+
+def play(rows, cols, mines, counter = None):
+    """ Places mines on the last rows, cascades from the top left corner and
+        checks every revealed cell for a chord; returns the Game
+        counter, if given, is a list whose first item counts adjacent() calls
+    """
+    game = Game(rows, cols, mines, 0, renderMode="quiet")
+    if counter is not None:
+        adjacent = game.adjacent
+        def counted(pos):
+            counter[0] += 1
+            return adjacent(pos)
+        game.adjacent = counted
+    game.start(0, range(rows * cols - mines, rows * cols))
+    game.reveal(0)
+    for pos in range(rows * cols):
+        if game.state[pos] <= 8: game.chord(pos)
+    return game
+
+def main():
+    print("%-8s %-6s %10s %10s %12s %10s" % ("board", "mode", "calls", "lists", "list bytes", "time"))
+    for name, rows, cols, mines in SIZES:
+        #the table is built twice, once timed and once traced since tracing slows it down
+        neighbourTable.cache_clear()
+        tracemalloc.start()
+        neighbourTable(rows, cols)
+        tableBytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        neighbourTable.cache_clear()
+        startTime = time.perf_counter()
+        neighbourTable(rows, cols)
+        buildTime = time.perf_counter() - startTime
+        #the average size of a list returned by the list building adjacent()
+        listSize = sum([sys.getsizeof(Game.adjacent(game, pos)) for game in [Game(rows, cols, 0, 0)]
+                        for pos in range(rows * cols)]) / (rows * cols)
+        for mode, limit in (("lists", 0), ("table", rows * cols)):
+            engine.MAX_TABLE_CELLS = limit
+            counter = [0]
+            play(rows, cols, mines, counter)
+            calls = counter[0]
+            #every call allocates a list in lists mode and nothing in table mode
+            lists = calls if mode == "lists" else 0
+            listBytes = int(lists * listSize)
+            startTime = time.perf_counter()
+            play(rows, cols, mines)
+            elapsed = time.perf_counter() - startTime
+            print("%-8s %-6s %10d %10d %12d %8.1fms" % (name, mode, calls, lists, listBytes, 1000 * elapsed))
+        print("%-8s table built once per shape in %.1fms, %d bytes shared by every Game of that shape\n"
+              % (name, 1000 * buildTime, tableBytes))
+
+if __name__ == "__main__":
+    main()
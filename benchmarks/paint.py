@@ -0,0 +1,85 @@
+""" Event handler latency of a large cascade in the GUI Boards
+
+    Clicks the middle of a nearly empty board, so one click reveals almost every
+    cell and wins, and times every Tk event from the mouse release until the
+    last Tile is painted and the end of game pop up is due:
+        release   the release handler, Board.showTile: the cascade in the Game
+                  and the first PAINT_SLICE of Tiles
+        events    every later event Tk handled, one slice of Tiles with Tk's
+                  redraw of the previous one
+    Each Board is run in two modes:
+        whole     PAINT_SLICE without limit, every Tile painted in the release
+                  handler the way Board.drawChanged worked before the slices
+        sliced    the default PAINT_SLICE
+    Reports the release handler, the number of later events, the longest
+    single event, which is the longest the window stopped answering input, and
+    the time until everything was painted. Needs a display.
+
+    Usage: python benchmarks/paint.py [--rows R] [--cols C] [--mines M]
+"""
+
+import _tkinter
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import tkinter as tk
+import minesweeperGUI
+from minesweeperGUI import Board, CanvasBoard, loadTileImages
+
+class Click(object):
+    """ Stand-in for the tkinter event passed to the Board's mouse handlers """
+    def __init__(self, widget, num):
+        self.widget = widget
+        self.num = num
+
+def drain(root):
+    """ Handles the pending Tk events one at a time, returns the seconds each took """
+    times = []
+    while True:
+        startTime = time.perf_counter()
+        if not root.tk.dooneevent(_tkinter.ALL_EVENTS | _tkinter.DONT_WAIT): return times
+        times.append(time.perf_counter() - startTime)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--cols", type=int, default=300)
+    parser.add_argument("--mines", type=int, default=5)
+    args = parser.parse_args()
+
+    #the end of game pop up would block the benchmark
+    minesweeperGUI.messagebox.showinfo = lambda title, msg: None
+    try:
+        root = tk.Tk()
+    except tk.TclError as error:
+        sys.exit("could not start Tk: " + str(error))
+    loadTileImages()
+    defaultSlice = minesweeperGUI.PAINT_SLICE
+    print("%-12s %-7s %10s %10s %8s %10s %10s" % ("board", "mode", "revealed", "release", "events", "longest",
+                                                  "painted"))
+    for boardClass in (Board, CanvasBoard):
+        board = boardClass(args.rows, args.cols, args.mines, root)
+        board.seed = 0
+        for mode, paintSlice in (("whole", float("inf")), ("sliced", defaultSlice)):
+            minesweeperGUI.PAINT_SLICE = paintSlice
+            board.replay()
+            drain(root)
+            first = board.tileOf((args.rows // 2) * args.cols + args.cols // 2)
+            board.pressTile(Click(first, 1))
+            drain(root)
+            startTime = time.perf_counter()
+            board.showTile(Click(first, 1))
+            release = time.perf_counter() - startTime
+            events = drain(root)
+            painted = time.perf_counter() - startTime
+            print("%-12s %-7s %10d %8.1fms %8d %8.1fms %8.1fms" % (boardClass.__name__, mode, board.game.numChecked,
+                  1000 * release, len(events), 1000 * max([release] + events), 1000 * painted))
+        board.destroy()
+    minesweeperGUI.PAINT_SLICE = defaultSlice
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
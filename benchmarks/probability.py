@@ -0,0 +1,54 @@
+""" Time of the exact mine probabilities on Expert boards
+
+    Plays seeded Expert games with a bot that always reveals the cell least
+    likely to be a mine, computing mineProbabilities before every move, and
+    reports the distribution of the time each computation took against the
+    16.7ms of a 60Hz frame. Runs once with the component memo cleared before
+    every computation (cold) and once keeping it between moves, as the GUI does
+    (warm).
+
+    Usage: python benchmarks/probability.py [--games N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from minesweeper.engine import Game
+from minesweeper.probability import countComponent, mineProbabilities
+
+FRAME = 1 / 60.0
+
+# plays one game, returns the seconds each mineProbabilities call took
+def play(seed, cold):
+    game = Game(16, 30, 99, seed, renderMode="quiet")
+    game.start(0)
+    game.reveal(0)
+    times = []
+    while not game.isOver():
+        if cold: countComponent.cache_clear()
+        startTime = time.perf_counter()
+        probabilities = mineProbabilities(game)
+        times.append(time.perf_counter() - startTime)
+        game.reveal(min(probabilities, key = probabilities.get))
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--games", type=int, default=50)
+    args = parser.parse_args()
+    print("%-5s %8s %8s %8s %8s %8s %12s" % ("memo", "calls", "mean", "p50", "p99", "max", "over frame"))
+    for mode in ("cold", "warm"):
+        countComponent.cache_clear()
+        times = []
+        for seed in range(args.games):
+            times.extend(play(seed, mode == "cold"))
+        times.sort()
+        over = len([t for t in times if t > FRAME])
+        print("%-5s %8d %6.2fms %6.2fms %6.2fms %6.2fms %12d" % (mode, len(times), 1000 * sum(times) / len(times),
+              1000 * times[len(times) // 2], 1000 * times[int(0.99 * len(times))], 1000 * times[-1], over))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+""" Throughput of the JSON lines protocol of the command line version through a pipe
+
+    Records seeded Expert games played by the Solver (guessing a random hidden
+    cell whenever it gets stuck), then plays them again through
+    "python -m minesweeper --protocol jsonl" in a child process:
+        single      one show, flag or chord command per move, all written
+                    ahead without waiting for the answers
+        batch       one batch command per game
+        lockstep    one command per move, waiting for every answer before
+                    sending the next, the way a bot that reads the board works
+    Checks every game ends with the recorded result and reports the best moves
+    per second of the runs, counted from the first command written to the last
+    event read. The events written ahead are parsed after the clock has stopped,
+    so the parsing in this process does not limit the child.
+
+    Usage: python benchmarks/protocol.py [-n GAMES] [--rows R] [--cols C] [--mines M] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+from minesweeper import Game, UNKNOWN
+from minesweeper.engine import START_MOVE
+from minesweeper.movelog import ACTION_NAMES
+from minesweeper.solver import Solver
+
+def record(rows, cols, mines, seed, rng):
+    """ Plays one game with the Solver, returns its moves as (action name, pos) and its result """
+    game = Game(rows, cols, mines, seed, renderMode="quiet")
+    game.recordMoves()
+    first = (rows // 2) * cols + cols // 2
+    game.start(first)
+    game.reveal(first)
+    solver = Solver(game)
+    while not game.lost and not game.checkEnd():
+        if not solver.step():
+            hidden = [pos for pos, value in enumerate(game.state) if value == UNKNOWN]
+            solver.update(game.reveal(rng.choice(hidden)))
+    #the protocol places the mines at the first show, the start move is not sent
+    moves = [(ACTION_NAMES[action], pos) for action, pos in zip(game.log.actions, game.log.positions)
+             if action != START_MOVE]
+    return moves, "lost" if game.lost else "won"
+
+def commands(games, rows, cols, mines, mode):
+    """ Returns the list of lines of every game, one list per game """
+    lines = []
+    for seed, moves, result in games:
+        game = [json.dumps({"cmd": "new", "rows": rows, "cols": cols, "mines": mines, "seed": seed})]
+        if mode == "batch": game.append(json.dumps({"cmd": "batch", "moves": moves}))
+        else: game.extend([json.dumps({"cmd": action, "pos": pos}) for action, pos in moves])
+        lines.append(game)
+    return lines
+
+def run(lines, mode):
+    """ Plays the lines through a child process, returns (seconds, results of the games) """
+    child = subprocess.Popen([sys.executable, "-m", "minesweeper", "--protocol", "jsonl"], cwd=ROOT,
+                             stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    child.stdout.readline()
+    results = []
+    data = ("\n".join([line for game in lines for line in game]) + "\n").encode()
+    startTime = time.perf_counter()
+    if mode == "lockstep":
+        for game in lines:
+            for line in game:
+                child.stdin.write((line + "\n").encode())
+                child.stdin.flush()
+                event = json.loads(child.stdout.readline())
+            results.append(event["result"])
+        child.stdin.close()
+        elapsed = time.perf_counter() - startTime
+    else:
+        def write():
+            child.stdin.write(data)
+            child.stdin.close()
+        writer = threading.Thread(target=write)
+        writer.start()
+        output = child.stdout.read()
+        elapsed = time.perf_counter() - startTime
+        writer.join()
+        events = iter(output.splitlines())
+        for game in lines:
+            for line in game:
+                event = json.loads(next(events))
+            results.append(event["result"])
+    child.wait()
+    return elapsed, results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-n", "--games", type=int, default=300)
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--mines", type=int, default=99)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    games = [(seed,) + record(args.rows, args.cols, args.mines, seed, rng) for seed in range(args.games)]
+    total = sum([len(moves) for seed, moves, result in games])
+    print("%d games on %dx%d with %d mines, %d moves" % (args.games, args.rows, args.cols, args.mines, total))
+    print("%-10s %12s %10s" % ("mode", "moves/s", "time"))
+    for mode in ("single", "batch", "lockstep"):
+        lines = commands(games, args.rows, args.cols, args.mines, mode)
+        times = []
+        for i in range(args.repeat):
+            elapsed, results = run(lines, mode)
+            if results != [result for seed, moves, result in games]:
+                sys.exit(mode + " did not end with the recorded results")
+            times.append(elapsed)
+        elapsed = min(times)
+        print("%-10s %12d %8.3fs" % (mode, total / elapsed, elapsed))
+
+if __name__ == "__main__":
+    main()
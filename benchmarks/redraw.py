@@ -0,0 +1,70 @@
+""" Redraw benchmark for the GUI Board
+
+    Plays a short game on a large custom board (first click, then a click on a mine)
+    and reports how many Tile images were redrawn and how long it took to
+    end the game and to restart it with Board.replay().
+    Needs a display for tkinter.
+
+    Usage: python benchmarks/redraw.py [--rows R] [--cols C] [--mines M]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+import tkinter as tk
+import minesweeperGUI
+from minesweeperGUI import Board, loadTileImages
+
+class Click(object):
+    """ Stand-in for the tkinter event passed to the Board's mouse handlers """
+    def __init__(self, widget, num):
+        self.widget = widget
+        self.num = num
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--cols", type=int, default=100)
+    parser.add_argument("--mines", type=int, default=1500)
+    args = parser.parse_args()
+
+    #the end of game popup would block the benchmark
+    minesweeperGUI.messagebox.showinfo = lambda title, msg: None
+    root = tk.Tk()
+    root.withdraw()
+    loadTileImages()
+    board = Board(args.rows, args.cols, args.mines, root)
+    board.seed = 0
+    board.replay()
+
+    first = board.tiles[args.rows // 2][args.cols // 2]
+    board.pressTile(Click(first, 1))
+    board.showTile(Click(first, 1))
+    mine = board.tileOf(board.game.mines.find(1))
+    before = board.drawCount
+    startTime = time.perf_counter()
+    board.showTile(Click(mine, 1))
+    root.update_idletasks()
+    endTime = time.perf_counter() - startTime
+    endDraws = board.drawCount - before
+
+    changedTiles = len(board.changed)
+    before = board.drawCount
+    startTime = time.perf_counter()
+    board.replay()
+    root.update_idletasks()
+    replayTime = time.perf_counter() - startTime
+    replayDraws = board.drawCount - before
+
+    cells = args.rows * args.cols
+    print("%dx%d board, %d mines, %d tiles changed in the game" % (args.rows, args.cols, args.mines, changedTiles))
+    print("end of game: %d redraws of %d tiles in %.1fms" % (endDraws, cells, 1000 * endTime))
+    print("replay:      %d redraws of %d tiles in %.1fms" % (replayDraws, cells, 1000 * replayTime))
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
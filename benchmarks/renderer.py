@@ -0,0 +1,68 @@
+""" Build time and memory of the GUI renderers
+
+    Builds a Board (one Label widget per Tile) and a CanvasBoard (one Canvas for the
+    whole minefield) for each board size and reports the time taken to build and
+    lay out the board, the time to destroy it, and the memory it added, both as
+    Python allocations (tracemalloc) and as process resident size (Tk's allocations).
+    Needs a display for tkinter.
+
+    Usage: python benchmarks/renderer.py [--sizes 100x100 300x300]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+import tkinter as tk
+from minesweeperGUI import Board, CanvasBoard, loadTileImages
+
+def residentBytes():
+    """ Returns the resident set size of this process, or 0 where /proc is not available """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+def measure(root, boardClass, rows, cols):
+    """ Returns (build seconds, destroy seconds, python bytes, resident bytes) for one board """
+    resident = residentBytes()
+    tracemalloc.start()
+    startTime = time.perf_counter()
+    board = boardClass(rows, cols, rows*cols // 6, root)
+    root.update()
+    buildTime = time.perf_counter() - startTime
+    python = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    resident = residentBytes() - resident
+
+    startTime = time.perf_counter()
+    board.clearFrame()
+    board.destroy()
+    root.update()
+    destroyTime = time.perf_counter() - startTime
+    return buildTime, destroyTime, python, resident
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", nargs="+", default=["100x100", "300x300"])
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    loadTileImages()
+
+    print("%-9s %-12s %10s %10s %12s %12s" % ("size", "renderer", "build s", "destroy s", "python MB", "resident MB"))
+    for size in args.sizes:
+        rows, cols = [int(n) for n in size.split("x")]
+        for boardClass in (Board, CanvasBoard):
+            build, destroy, python, resident = measure(root, boardClass, rows, cols)
+            print("%-9s %-12s %10.3f %10.3f %12.1f %12.1f"
+                  % (size, boardClass.__name__, build, destroy, python / 2**20, resident / 2**20))
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
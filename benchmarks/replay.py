@@ -0,0 +1,58 @@
+""" Headless replay speed of recorded move logs
+
+    Records seeded games played by the Solver (guessing a random hidden cell
+    whenever it gets stuck), then rebuilds every game from its move log with
+    movelog.replay, checks the replayed board matches the recorded one and
+    reports the replay speed in moves per second.
+
+    Usage: python benchmarks/replay.py [-n GAMES] [--rows R] [--cols C] [--mines M]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from minesweeper import Game, UNKNOWN
+from minesweeper.movelog import replay
+from minesweeper.solver import Solver
+
+def record(rows, cols, mines, seed, rng):
+    """ Plays one game with the Solver, returns its move log and final state """
+    game = Game(rows, cols, mines, seed, renderMode="quiet")
+    game.recordMoves()
+    first = (rows // 2) * cols + cols // 2
+    game.start(first)
+    game.reveal(first)
+    solver = Solver(game)
+    while not game.lost and not game.checkEnd():
+        if not solver.step():
+            hidden = [pos for pos, value in enumerate(game.state) if value == UNKNOWN]
+            solver.update(game.reveal(rng.choice(hidden)))
+    return game.log, game.state
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-n", "--games", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--mines", type=int, default=99)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    games = [record(args.rows, args.cols, args.mines, seed, rng) for seed in range(args.games)]
+    moves = sum([len(log) for log, state in games])
+
+    startTime = time.perf_counter()
+    replayed = [replay(log) for log, state in games]
+    elapsed = time.perf_counter() - startTime
+    mismatches = sum([1 for game, (log, state) in zip(replayed, games) if game.state != state])
+
+    print("%d games on %dx%d with %d mines, %d moves" % (args.games, args.rows, args.cols, args.mines, moves))
+    print("replayed in %.3fs: %d moves/s, %d mismatched" % (elapsed, moves / elapsed, mismatches))
+    if mismatches: sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+""" Resize latency of the GUI Boards with and without reusing their Tiles
+
+    Resizes a Board and a CanvasBoard from Expert to 100x100 and back a few
+    times, timing each resize up to the point Tk has laid the window out again.
+    Each is run in two modes:
+        rebuild   every widget is destroyed and the Board built from nothing,
+                  the way Board.resize worked before the Tiles were pooled
+        pool      Board.resize, which reuses the Tiles it has and only creates
+                  or destroys the difference in size
+    Reports the median time of each step and the Tiles it created, destroyed
+    and reused. Needs a display.
+
+    Usage: python benchmarks/resize.py [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import tkinter as tk
+from minesweeperGUI import Board, CanvasBoard, loadTileImages
+
+# (name, rows, cols, mines) of every step, the Board starts on Expert
+STEPS = [("expert -> 100x100", 100, 100, 1500), ("100x100 -> expert", 16, 30, 99)]
+
+def resize(root, board, rows, cols, mines, mode):
+    """ Resizes board, returns (seconds, created, destroyed, reused) """
+    before = set([tile for tileRow in board.tiles for tile in tileRow])
+    startTime = time.perf_counter()
+    if mode == "rebuild":
+        board.clearFrame()
+        board.setUpFrame()
+    board.resize(rows, cols, mines)
+    root.update_idletasks()
+    elapsed = time.perf_counter() - startTime
+    after = set([tile for tileRow in board.tiles for tile in tileRow])
+    return elapsed, len(after - before), len(before - after), len(after & before)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    loadTileImages()
+    print("%-12s %-8s %-18s %10s %8s %10s %8s" % ("board", "mode", "step", "time", "created", "destroyed", "reused"))
+    for boardClass in (Board, CanvasBoard):
+        for mode in ("rebuild", "pool"):
+            board = boardClass(16, 30, 99, root)
+            root.update_idletasks()
+            results = dict([(name, []) for name, rows, cols, mines in STEPS])
+            for i in range(args.repeat):
+                for name, rows, cols, mines in STEPS:
+                    results[name].append(resize(root, board, rows, cols, mines, mode))
+            for name, rows, cols, mines in STEPS:
+                elapsed = statistics.median([result[0] for result in results[name]])
+                created, destroyed, reused = results[name][-1][1:]
+                print("%-12s %-8s %-18s %8.1fms %8d %10d %8d" % (boardClass.__name__, mode, name, 1000 * elapsed,
+                      created, destroyed, reused))
+            board.destroy()
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+""" Cold start cost of the GUI images
+
+    Every measurement runs in a new Python process so nothing is cached, and
+    times the same steps the GUI takes before its first Board is shown:
+        files   decoding the 14 tile-*.gif and 5 smile-*.gif files one by one,
+                the way the images were loaded before the sprite sheet
+        sheet   decoding images/sprites.gif once and cutting the 19 images from it
+    It also times the images of a second Board, which the files loader decoded
+    again for every Board and the sheet loader takes from the Sprites cache, and
+    cutting the images at zoom 2. Reports the median of the runs in milliseconds.
+    The image timings need a display, tkinter can only load images with Tk running.
+
+    Before them it reports what importing minesweeperGUI costs a new process,
+    as measured by python -X importtime, which needs no display:
+        total       the cumulative import time of minesweeperGUI
+        tkinter     the part of it spent importing tkinter
+        minesweeper the part of it spent importing the engine package
+
+    Usage: python benchmarks/startup.py [--runs N]
+"""
+
+import argparse
+import json
+import re
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# run in the new process, prints the times of the steps as JSON
+MEASURE = """
+import json, os, sys, time
+sys.path.insert(0, %(root)r)
+startTime = time.perf_counter()
+import tkinter as tk
+root = tk.Tk()
+root.withdraw()
+times = {"tk": time.perf_counter() - startTime}
+import minesweeperGUI
+def smileys():
+    if %(mode)r == "sheet": return minesweeperGUI.SPRITES.images("smile")
+    return [tk.PhotoImage(file=os.path.join(minesweeperGUI.IMAGE_DIR, "smile-%%d.gif" %% i)) for i in range(5)]
+def tiles():
+    if %(mode)r == "sheet": return minesweeperGUI.SPRITES.images("tile")
+    return [tk.PhotoImage(file=os.path.join(minesweeperGUI.IMAGE_DIR, "tile-%%d.gif" %% i)) for i in range(14)]
+startTime = time.perf_counter()
+images = tiles() + smileys()
+times["first"] = time.perf_counter() - startTime
+startTime = time.perf_counter()
+more = smileys()
+times["second"] = time.perf_counter() - startTime
+startTime = time.perf_counter()
+if %(mode)r == "sheet": minesweeperGUI.SPRITES.images("tile", 2)
+times["zoom"] = time.perf_counter() - startTime
+print(json.dumps(times))
+"""
+
+# the modules whose cumulative import time is reported, by column
+IMPORTS = (("total", "minesweeperGUI"), ("tkinter", "tkinter"), ("minesweeper", "minesweeper"))
+
+def measureImports():
+    """ Imports minesweeperGUI in a new process, returns the seconds of the IMPORTS columns """
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import minesweeperGUI"],
+                            capture_output=True, text=True, cwd=ROOT)
+    if output.returncode: sys.exit("could not import minesweeperGUI:\n" + output.stderr.strip().split("\n")[-1])
+    #lines are "import time: self [us] | cumulative | name", nested imports indented
+    cumulative = {}
+    for line in output.stderr.split("\n"):
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)$", line)
+        if match: cumulative[match.group(2)] = int(match.group(1)) / 1e6
+    return dict([(column, cumulative.get(module, 0.0)) for column, module in IMPORTS])
+
+def measure(mode):
+    """ Times the images with the mode loader in a new process, returns None if Tk could not start """
+    output = subprocess.run([sys.executable, "-c", MEASURE % {"root": ROOT, "mode": mode}],
+                            capture_output=True, text=True)
+    if output.returncode:
+        print("image timings skipped, could not start Tk: " + output.stderr.strip().split("\n")[-1])
+        return None
+    return json.loads(output.stdout)
+
+def medians(runs):
+    """ Returns the median milliseconds of every step of the runs """
+    return dict([(step, 1000 * statistics.median([run[step] for run in runs])) for step in runs[0]])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    median = medians([measureImports() for i in range(args.runs)])
+    print("%-6s %10s %10s %12s" % ("import", "total", "tkinter", "minesweeper"))
+    print("%-6s %8.2fms %8.2fms %10.2fms\n" % ("", median["total"], median["tkinter"], median["minesweeper"]))
+    if measure("sheet") is None: return
+    print("%-6s %10s %12s %14s %10s" % ("loader", "Tk()", "first Board", "second Board", "zoom 2"))
+    for mode in ("files", "sheet"):
+        median = medians([measure(mode) for i in range(args.runs)])
+        print("%-6s %8.2fms %10.2fms %12.2fms %8.2fms" % (mode, median["tk"], median["first"], median["second"],
+              median["zoom"]))
+
+if __name__ == "__main__":
+    main()
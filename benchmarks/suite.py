@@ -0,0 +1,218 @@
+""" Benchmark suite for the engine and GUI hot paths
+
+    Times each case on the Beginner, Intermediate and Expert boards and on larger
+    custom boards, with fixed seeds so every run plays the same boards.
+    Results are written as JSON and compared against a stored baseline; any case
+    slower than the baseline by more than the threshold plus the run to run noise
+    of the case is reported as a regression and makes the script exit with status 1.
+    The noise is the larger spread (median over min) of the two runs being compared,
+    and slowdowns shorter than NOISE_FLOOR are never counted.
+    Cases shorter than MIN_SAMPLE are run several times per sample and timed per call,
+    so a microsecond case is not one clock reading.
+    Refresh the baseline with --save-baseline in every change meant to alter performance.
+
+    Engine cases:
+        Game.__init__   building an empty Game, including the neighbourTable of its shape
+        Game.start      placing the mines
+        Game.show       a first click cascading over a whole board with no mines (quiet rendering)
+    GUI cases (skipped when tkinter cannot open a display):
+        Board.setUpBombs         the first click's mine placement
+        Board.getAdjacentTiles   one call for every Tile on the Board
+        Board.cascadeShow        the full cascade of the first click
+
+    Usage: python benchmarks/suite.py [--repeat N] [--output FILE] [--baseline FILE]
+                                      [--save-baseline] [--threshold 0.2] [--max-cells N]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, "..")
+sys.path.insert(0, ROOT)
+from minesweeper import Game
+from minesweeper.engine import neighbourTable
+
+# (name, rows, cols, mines), custom boards use Intermediate's mine density
+SIZES = [
+    ("beginner", 8, 8, 10),
+    ("intermediate", 16, 16, 40),
+    ("expert", 16, 30, 99),
+    ("100x100", 100, 100, 1600),
+    ("300x300", 300, 300, 14400),
+    ("1000x1000", 1000, 1000, 160000),
+]
+# the GUI needs a widget per Tile, so its cases stop at this many cells
+GUI_MAX_CELLS = 300 * 300
+SEED = 2018
+# shortest time in seconds a sample of a case is run for, shorter cases are run several times per sample
+MIN_SAMPLE = 0.05
+# most runs of a case per sample
+MAX_NUMBER = 1000
+# slowdowns of fewer seconds than this are timer and machine noise, never regressions
+NOISE_FLOOR = 5e-6
+
+class Click(object):
+    """ Stand-in for the tkinter event passed to the Board's mouse handlers """
+    def __init__(self, widget, num = 1):
+        self.widget = widget
+        self.num = num
+
+def sample(setup, run, number):
+    """ Calls run(setup()) number times, returns the seconds taken by run alone
+        The garbage collector is held off meanwhile, as timeit does, so a collection
+        set off by an earlier case is not timed as part of this one
+    """
+    elapsed = 0.0
+    gc.collect()
+    gc.disable()
+    try:
+        for i in range(number):
+            state = setup()
+            startTime = time.perf_counter()
+            run(state)
+            elapsed += time.perf_counter() - startTime
+    finally:
+        gc.enable()
+    return elapsed
+
+def timeCase(setup, run, repeat):
+    """ Takes repeat samples of run(setup()), timing only run, each sample running it
+        as many times as it takes to last MIN_SAMPLE (up to MAX_NUMBER times)
+        Returns a dict with the min and median seconds per call
+    """
+    number = 1
+    while number < MAX_NUMBER and sample(setup, run, number) < MIN_SAMPLE:
+        number = min(number * 10, MAX_NUMBER)
+    times = [sample(setup, run, number) / number for i in range(repeat)]
+    return {"min": min(times), "median": statistics.median(times), "repeat": repeat, "number": number}
+
+def engineCases(rows, cols, mines):
+    """ Returns a list of (case name, setup, run) for the command line Game """
+    first = (rows // 2) * cols + cols // 2
+    def empty():
+        game = Game(rows, cols, 0, SEED, renderMode="quiet")
+        game.start(first)
+        return game
+    return [
+        #the shared table of the shape is dropped first, or only the cache lookup would be timed
+        ("Game.__init__", neighbourTable.cache_clear, lambda state: Game(rows, cols, mines, SEED)),
+        ("Game.start", lambda: Game(rows, cols, mines, SEED), lambda game: game.start(first)),
+        ("Game.show", empty, lambda game: game.show(first)),
+    ]
+
+def guiCases(board, rows, cols):
+    """ Returns a list of (case name, setup, run) for a GUI Board of the given size """
+    first = board.tiles[rows // 2][cols // 2]
+    board.seed = SEED
+    def fresh():
+        board.replay()
+        return board
+    def armed():
+        fresh()
+        board.setUpBombs(Click(first))
+        return board
+    def allAdjacent(board):
+        for row in range(rows):
+            for col in range(cols):
+                board.getAdjacentTiles(row, col)
+    return [
+        ("Board.setUpBombs", fresh, lambda board: board.setUpBombs(Click(first))),
+        ("Board.getAdjacentTiles", lambda: board, allAdjacent),
+        ("Board.cascadeShow", armed, lambda board: board.cascadeShow([first.pos])),
+    ]
+
+def openGUI():
+    """ Returns a hidden Tk root with the tile images loaded, or None without a display """
+    try:
+        import tkinter as tk
+        from minesweeperGUI import Tile, loadTileImages
+        root = tk.Tk()
+    except Exception:
+        return None
+    root.withdraw()
+    if not Tile.images: loadTileImages()
+    return root
+
+def runSuite(repeat, maxCells):
+    """ Runs every case and returns the results as {"case@size": timing dict} """
+    results = {}
+    root = openGUI()
+    for name, rows, cols, mines in SIZES:
+        if rows * cols > maxCells: continue
+        cases = engineCases(rows, cols, mines)
+        board = None
+        if root is not None and rows * cols <= GUI_MAX_CELLS:
+            from minesweeperGUI import Board
+            board = Board(rows, cols, mines, root)
+            cases += guiCases(board, rows, cols)
+        for case, setup, run in cases:
+            key = case + "@" + name
+            results[key] = timeCase(setup, run, repeat)
+            print("%-36s %10.3fms" % (key, 1000 * results[key]["min"]))
+        if board is not None: board.destroy()
+    if root is None: print("GUI cases skipped: tkinter could not open a display")
+    else: root.destroy()
+    return results
+
+def spread(result):
+    """ Returns how much slower the median of a timed case was than its min, as a fraction """
+    return result["median"] / result["min"] - 1 if result["min"] else 0.0
+
+def compare(results, baseline, threshold):
+    """ Prints the change of every case against the baseline
+        Returns the list of cases that got slower by more than threshold plus their noise
+    """
+    regressions = []
+    print("\n%-36s %10s %10s %8s" % ("case", "baseline", "now", "change"))
+    for key in sorted(results):
+        if key not in baseline: continue
+        before = baseline[key]["min"]
+        now = results[key]["min"]
+        change = (now - before) / before if before else 0.0
+        noise = max(spread(baseline[key]), spread(results[key]))
+        mark = ""
+        if change > threshold + noise and now - before > NOISE_FLOOR:
+            regressions.append(key)
+            mark = "  REGRESSION"
+        print("%-36s %8.3fms %8.3fms %+7.1f%%%s" % (key, 1000 * before, 1000 * now, 100 * change, mark))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=os.path.join(HERE, "results.json"))
+    parser.add_argument("--baseline", default=os.path.join(HERE, "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown counted as a regression")
+    parser.add_argument("--max-cells", type=int, default=10**6, help="skip boards larger than this")
+    args = parser.parse_args()
+
+    results = runSuite(args.repeat, args.max_cells)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": SEED,
+        "results": results,
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2, sort_keys=True)
+    if args.save_baseline:
+        with open(args.baseline, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+        print("\nsaved baseline to " + args.baseline)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as baseline:
+            regressions = compare(results, json.load(baseline)["results"], args.threshold)
+        if regressions:
+            print("\n%d regression(s)" % len(regressions))
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+""" Scrolling frame time of the ViewportBoard on a very large board
+
+    Plays a mid-game on a 2000x2000 ViewportBoard, with a share of the safe cells
+    revealed at random, then times every scroll event up to the point Tk has
+    redrawn the view:
+        wheel       the mouse wheel scrolling down, WHEEL_UNITS rows at a time
+        sideways    the mouse wheel with Shift scrolling right
+        page        the scrollbar paging down a view at a time
+        drag        dragging along the diagonal of the minimap, one pixel at a time
+        jump        clicking random points of the minimap
+    Reports the mean, 99th percentile and worst time of each, the events slower
+    than a 60fps frame and the mean number of Tiles moved to new cells per event.
+    Needs a display.
+
+    Usage: python benchmarks/viewport.py [--size N] [--reveal 0.25] [--events N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import tkinter as tk
+from minesweeper.engine import START_MOVE
+from minesweeperGUI import ViewportBoard, loadTileImages, WHEEL_UNITS, MINIMAP_SIZE
+
+DENSITY = 0.16
+SEED = 2018
+FRAME = 1 / 60.0
+
+def scenarios(board, events, rnd):
+    """ Returns a list of (name, list of handler calls) """
+    rows, cols = board.rows, board.cols
+    diagonal = min(-(-rows // board.scale), -(-cols // board.scale))
+    return [
+        ("wheel", [lambda: board.scrollY("scroll", WHEEL_UNITS, "units")] * events),
+        ("sideways", [lambda: board.scrollX("scroll", WHEEL_UNITS, "units")] * events),
+        ("page", [lambda: board.scrollY("scroll", 1, "pages")] * min(events, rows // board.viewSize()[0])),
+        ("drag", [lambda i=i: board.jumpTo(i, i) for i in range(diagonal)]),
+        ("jump", [lambda x=rnd.randrange(MINIMAP_SIZE), y=rnd.randrange(MINIMAP_SIZE): board.jumpTo(x, y)
+                  for i in range(events // 5)]),
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--reveal", type=float, default=0.25, help="share of the cells revealed before scrolling")
+    parser.add_argument("--events", type=int, default=300)
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as error:
+        sys.exit("could not start Tk: " + str(error))
+    loadTileImages()
+    rnd = random.Random(SEED)
+    side = args.size
+    board = ViewportBoard(side, side, int(DENSITY * side * side), root)
+    board.seed = SEED
+    board.replay()
+    board.playMove(START_MOVE, (side // 2) * side + side // 2)
+    game = board.game
+    board.cascadeShow([pos for pos in range(side * side) if not game.mines[pos] and rnd.random() < args.reveal])
+    root.update()
+    print("%dx%d board, %d cells revealed, %d Tiles on the canvas" % (side, side, game.numChecked,
+          len(board.materialised)))
+
+    print("%-10s %8s %10s %10s %10s %8s %8s" % ("scroll", "events", "mean", "p99", "max", "> frame", "moved"))
+    for name, calls in scenarios(board, args.events, rnd):
+        board.jumpTo(0, 0)
+        root.update()
+        times = []
+        moved = 0
+        for call in calls:
+            before = set(board.materialised)
+            startTime = time.perf_counter()
+            call()
+            root.update_idletasks()
+            times.append(time.perf_counter() - startTime)
+            moved += len(set(board.materialised) - before)
+        times.sort()
+        p99 = times[min(len(times) - 1, int(0.99 * len(times)))]
+        print("%-10s %8d %8.2fms %8.2fms %8.2fms %8d %8.0f" % (name, len(times), 1000 * statistics.mean(times),
+              1000 * p99, 1000 * times[-1], len([t for t in times if t > FRAME]), moved / float(len(times))))
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+""" Rebuilds images/sprites.gif from the tile-*.gif and smile-*.gif images next to it
+
+    The GUI only reads the sprite sheet, so after editing one of the single
+    images run this to put it in the sheet. The 14 tiles go side by side on the
+    top row and the 5 smileys side by side below them. Needs a display, tkinter
+    can only load and write images with Tk running.
+
+    Usage: python images/buildsheet.py
+"""
+
+import os
+import tkinter as tk
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TILE_SIZE = 20
+SMILE_SIZE = 30
+
+def main():
+    root = tk.Tk()
+    root.withdraw()
+    sheet = tk.PhotoImage(width=14*TILE_SIZE, height=TILE_SIZE+SMILE_SIZE)
+    for i in range(14):
+        tile = tk.PhotoImage(file=os.path.join(HERE, "tile-"+str(i)+".gif"))
+        sheet.tk.call(sheet, "copy", tile, "-to", i*TILE_SIZE, 0)
+    for i in range(5):
+        smile = tk.PhotoImage(file=os.path.join(HERE, "smile-"+str(i)+".gif"))
+        sheet.tk.call(sheet, "copy", smile, "-to", i*SMILE_SIZE, TILE_SIZE)
+    sheet.write(os.path.join(HERE, "sprites.gif"), format="gif")
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+""" Minesweeper
+
+    The engine is importable on its own and cheap to import: it has no side effects
+    and does not load tkinter. The command line version runs with
+    "python -m minesweeper" and the GUI with "python minesweeperGUI.py".
+"""
+
+from minesweeper.engine import Game, floodReveal, UNKNOWN, FLAGGED, MINE, CELL_TEXT, RENDER_MODES
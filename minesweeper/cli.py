@@ -0,0 +1,134 @@
+""" Command line interface, run with "python -m minesweeper" """
+
+import argparse
+import os
+import sys
+import time
+from minesweeper.engine import Game, RENDER_MODES
+
+class App(object):
+    # boardPool is an optional generator.BoardPool to take no-guess boards from
+    # recordDir is an optional directory the move log of every finished game is saved in
+    # metrics is an optional metrics.Metrics whose summary is printed when a game ends
+    def __init__(self, renderMode = "full", boardPool = None, recordDir = None, metrics = None):
+        self.myGame = None
+        self.startTime = None
+        self.endTime = None
+        self.playing = False
+        self.renderMode = renderMode
+        self.boardPool = boardPool
+        self.recordDir = recordDir
+        self.metrics = metrics
+
+    def endGame(self, msg):
+        print(msg)
+        self.endTime = time.time()
+        elapsedTime = self.endTime - self.startTime
+        readableTime = str(int((elapsedTime / 60) / 60))
+        readableTime += ":" + str(int(elapsedTime / 60))
+        readableTime += ":" + str(elapsedTime % 60)[0:6]
+        print("Time: " + readableTime)
+        if msg == "You Lose!": self.myGame.printSolution()
+        if self.recordDir is not None:
+            path = os.path.join(self.recordDir, "game-%d.mlog" % self.myGame.seed)
+            self.myGame.log.save(path)
+            print("Moves saved to " + path)
+        if self.metrics is not None:
+            print(self.metrics.summary())
+            self.metrics.reset()
+        self.playing = False
+
+    def setUp(self):
+        prompt = "How many rows, columns, and mines?"
+        prompt += "\n(Please give input as 3 integers separated by spaces)\n-> "
+        cmd = input(prompt).split(' ')
+        self.myGame = Game(int(cmd[0]),int(cmd[1]),int(cmd[2]), renderMode=self.renderMode)
+        self.myGame.recordMoves()
+        if self.boardPool is not None: self.boardPool.prepare(self.myGame.row, self.myGame.col, self.myGame.minecount)
+        self.myGame.print()
+
+    def firstMove(self):
+        move = int(input("What is your first move?\n-> "))
+        mines = None
+        if self.boardPool is not None:
+            #falls back to a random board if no no-guess board is ready yet
+            mines = self.boardPool.take(self.myGame.row, self.myGame.col, self.myGame.minecount, move)
+        self.startTime = self.myGame.start(move, mines)
+        self.playing = self.myGame.show(move)
+        if (self.playing):
+            if self.myGame.checkEnd(): self.endGame("You Win!")
+        else:
+            self.endGame("You Lose!")
+
+    def makeMoves(self):
+        while self.playing:
+            cmd = input("Next move?\n-> ")
+            if cmd == "give up":
+                self.endGame("Giving up...")
+                continue
+            elif cmd == "quit":
+                print("Quitting Game!")
+                exit()
+            cmd = cmd.split(" ")
+            if (len(cmd) != 2) or (int(cmd[1]) >= len(self.myGame.state)) or (int(cmd[1]) < 0):
+                print("Invalid Input! Try Again.")
+            elif cmd[0] == "show" or cmd[0] == "s":
+                self.playing = self.myGame.show(int(cmd[1]))
+                if (self.playing):
+                    if self.myGame.checkEnd(): self.endGame("You Win!")
+                else: self.endGame("You Lose!")
+            elif cmd[0] == "chord" or cmd[0] == "c":
+                self.playing = self.myGame.showAround(int(cmd[1]))
+                if (self.playing):
+                    if self.myGame.checkEnd(): self.endGame("You Win!")
+                else: self.endGame("You Lose!")
+            elif cmd[0] == "flag" or cmd[0] == "f":
+                self.myGame.flag(int(cmd[1]))
+            else:
+                print("Invalid Input! Try Again.")
+
+    def playGame(self):
+        self.setUp()
+        self.firstMove()
+        self.makeMoves()
+        replay = True
+        while replay:
+            cmd = input("\nPlay Again? (y/n)\n-> ")
+            if cmd == "y":
+                replay = False
+                self.playGame()
+            elif cmd == "n":
+                replay = False
+                print("Quitting Game!")
+                exit()
+            else:
+                print("Please input 'y' for yes or 'n' for no") 
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog="python -m minesweeper", description="Command line Minesweeper")
+    parser.add_argument("--render", choices=RENDER_MODES, default="full",
+                        help="print the whole board, only the rows changed by each move, or nothing")
+    parser.add_argument("--no-guess", action="store_true",
+                        help="generate boards that can be solved without guessing in the background")
+    parser.add_argument("--record", metavar="DIR",
+                        help="save the move log of every finished game in DIR, replay them with python -m minesweeper.movelog")
+    parser.add_argument("--metrics", action="store_true",
+                        help="time the engine's hot paths and print a summary when each game ends")
+    parser.add_argument("--protocol", choices=("jsonl",),
+                        help="read one JSON command per line from stdin and write one JSON event per line, "
+                             "see minesweeper/protocol.py")
+    args = parser.parse_args(argv)
+    boardPool = None
+    if args.no_guess:
+        from minesweeper.generator import BoardPool
+        boardPool = BoardPool()
+    if args.record is not None: os.makedirs(args.record, exist_ok=True)
+    metrics = None
+    if args.metrics:
+        from minesweeper.metrics import enable
+        metrics = enable()
+    if args.protocol == "jsonl":
+        from minesweeper.protocol import serve
+        serve(sys.stdin.buffer, sys.stdout.buffer, boardPool, args.record, metrics)
+        return
+    App(args.render, boardPool, args.record, metrics).playGame()
@@ -0,0 +1,422 @@
+""" Minesweeper game engine
+
+    Game holds the board and the rules, with no user interface and no side effects
+    at import time, so the command line App, the tkinter GUI and the batch tools
+    (solver, simulator, generator) all build on it.
+"""
+
+import functools
+import random
+import time
+from array import array
+from collections import deque
+
+# values held in Game.state for every cell
+#   0 to 8 mean the cell is revealed and shows that many adjacent mines
+#   UNKNOWN is a hidden cell, FLAGGED is a hidden cell marked with a flag
+#   MINE is a revealed mine
+UNKNOWN = 9
+FLAGGED = 10
+MINE = 11
+
+# value held in Game.counts for a cell whose adjacent mines have not been counted yet
+NOT_COUNTED = 255
+
+# text printed for each Game.state value, two characters per cell
+CELL_TEXT = ("__",) + tuple([str(n) + " " for n in range(1, 9)]) + ("??", "!!", "MN")
+
+# action codes of the moves recorded in a movelog.MoveLog
+START_MOVE = 0
+SHOW_MOVE = 1
+FLAG_MOVE = 2
+CHORD_MOVE = 3
+
+# ways Game.print can render the board, see Game.print
+RENDER_MODES = ("full", "diff", "quiet")
+
+# reveal engine used by Game.reveal
+# reveals every cell in starts and cascades outwards from the ones that are zero
+#   adjacent(cell) returns the cells next to cell
+#   reveal(cell) reveals a single cell and returns its count,
+#       or None if the cell could not be revealed (already shown, flagged, ...)
+# cells are visited through an explicit queue so large open areas can't hit
+# the recursion limit, and since reveal() refuses cells that are already shown
+# every cell is revealed at most once
+# returns the list of newly revealed cells in the order they were revealed
+def floodReveal(starts, adjacent, reveal):
+    changed = []
+    queue = deque()
+    for cell in starts:
+        count = reveal(cell)
+        if count is None: continue
+        changed.append(cell)
+        if count == 0: queue.append(cell)
+    while queue:
+        for cell in adjacent(queue.popleft()):
+            count = reveal(cell)
+            if count is None: continue
+            changed.append(cell)
+            if count == 0: queue.append(cell)
+    return changed
+
+# boards with more cells than this compute their neighbours on every call
+# instead of sharing a neighbourTable, which takes about 150 bytes per cell:
+# a table of this size is about 1.5MB and builds in about 10ms, and with the
+# cache below at most 4 of them are kept alive
+MAX_TABLE_CELLS = 100 * 100
+
+# returns a tuple holding, for every position of a rows x cols board,
+# the tuple of the positions adjacent to it
+# tables are built once per shape and shared by every Game of that shape,
+# the most recently used shapes are kept
+@functools.lru_cache(maxsize = 4)
+def neighbourTable(rows, cols):
+    size = rows * cols
+    #every table entry refers to these same int objects
+    cells = list(range(size))
+    table = []
+    for row in range(rows):
+        above = (row - 1) * cols
+        below = (row + 1) * cols
+        for col in range(cols):
+            pos = row * cols + col
+            left = max(col - 1, 0)
+            right = min(col + 2, cols)
+            adjacent = cells[above + left:above + right] if row > 0 else []
+            if col > 0: adjacent.append(cells[pos - 1])
+            if col + 1 < cols: adjacent.append(cells[pos + 1])
+            if row + 1 < rows: adjacent += cells[below + left:below + right]
+            table.append(tuple(adjacent))
+    return tuple(table)
+
+class Game(object):
+    # seed is passed to the Game's own random.Random so a board can be replayed,
+    # one is drawn at random if it is None so every Game can be rebuilt from its seed
+    # renderMode is one of RENDER_MODES, see Game.print
+    # neighbours is the neighbourTable to look adjacent cells up in, by default the shared
+    # table of the board's shape when it has at most MAX_TABLE_CELLS cells, or False to
+    # work them out on every call without ever building a table
+    def __init__(self, row, col, minecount, seed = None, renderMode = "full", neighbours = None):
+        self.row = row
+        self.col = col
+        self.numChecked = 0
+        self.numFlags = 0
+        self.numExploded = 0
+        self.minecount = minecount
+        if seed is None: seed = random.getrandbits(63)
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.lost = False
+        self.started = False
+        #movelog.MoveLog the moves are recorded in, see recordMoves
+        self.log = None
+        self.renderMode = renderMode
+        size = row * col
+        #the board is stored as one packed byte array per property,
+        #each indexed by cell position (row * col + column)
+        #   self.mines[i] is 1 iff cell i is a mine
+        #   self.counts[i] is the number of mines adjacent to cell i, or NOT_COUNTED
+        #       until a cell of its row is first revealed or queried, see count
+        #   self.state[i] is what the player currently sees at cell i
+        self.mines = bytearray(size)
+        self.counts = bytearray([NOT_COUNTED]) * size
+        self.state = bytearray([UNKNOWN]) * size
+        #counters kept up to date by every move so the queries below are O(1)
+        #   self.flagCounts[i] is the number of flags adjacent to cell i
+        #   self.satisfied is the set of revealed numbers (1 to 8) with as many adjacent flags
+        self.flagCounts = bytearray(size)
+        self.satisfied = set()
+        #adjacent is looked up in the shared table of the board's shape when there is one,
+        #binding the table's __getitem__ makes each lookup a single C call with no new list
+        if neighbours is None and size <= MAX_TABLE_CELLS: neighbours = neighbourTable(row, col)
+        if neighbours: self.adjacent = neighbours.__getitem__
+
+    # returns a list of the positions adjacent to pos
+    # only used by games without a neighbourTable, see __init__
+    def adjacent(self, pos):
+        row, col = divmod(pos, self.col)
+        adj = []
+        for r in range(max(row - 1, 0), min(row + 2, self.row)):
+            for c in range(max(col - 1, 0), min(col + 2, self.col)):
+                if r != row or c != col: adj.append(r * self.col + c)
+        return adj
+
+    # first move of the game places all the Mines
+    # and ensures pos is not a Mine, preventing first click loss
+    # the mine counts of the cells are only worked out for the rows the game reveals, see count,
+    # so the first click costs the mines placed plus the rows it reveals, whatever the board size
+    # mines may give a prepared list of mine positions to use instead of random ones,
+    # e.g. a board taken from a generator.BoardPool
+    def start(self, pos, mines = None):
+        size = self.row * self.col
+        #get a list random indexes in range to be mines
+        if self.log is not None: self.log.appendStart(pos, mines)
+        if mines is None: mines = self.random.sample(range(size), self.minecount)
+        else: mines = list(mines)
+        #make sure the first checked square is not a mine
+        if pos in mines:
+            mines.remove(pos)
+            taken = set(mines)
+            temp = self.random.randrange(size)
+            while (temp == pos or temp in taken): temp = self.random.randrange(size)
+            mines.append(temp)
+        self.placeMines(mines)
+        return time.time()
+
+    # marks all the given positions as mines
+    def placeMines(self, mines):
+        for mine in mines:
+            self.mines[mine] = 1
+        self.started = True
+
+    # returns the number of mines adjacent to pos
+    # mines are counted a whole row at a time, the first time a cell of the row is revealed
+    # or queried, and kept in self.counts; counts asked for before the mines are placed are not kept
+    def count(self, pos):
+        count = self.counts[pos]
+        if count != NOT_COUNTED: return count
+        row, col = divmod(pos, self.col)
+        counts = self.rowCounts(row)
+        if self.started: self.counts[row * self.col:(row + 1) * self.col] = counts
+        return counts[col]
+
+    # returns the mine counts of every cell of row as bytes
+    # each row of self.mines is read as one big integer with a byte per cell, so shifting it by
+    # a byte lines every cell up with its left or right neighbour; no sum goes over 8 per byte,
+    # so the rows can be added whole without carrying
+    def rowCounts(self, row):
+        cols = self.col
+        mask = (1 << (8 * cols)) - 1
+        mines = self.mines
+        def across(r):
+            #each cell plus its left and right neighbours in row r
+            value = int.from_bytes(mines[r * cols:(r + 1) * cols], "little")
+            return value + ((value << 8) & mask) + (value >> 8)
+        own = int.from_bytes(mines[row * cols:(row + 1) * cols], "little")
+        total = across(row) - own
+        if row: total += across(row - 1)
+        if row + 1 < self.row: total += across(row + 1)
+        return total.to_bytes(cols, "little")
+
+    # starts recording every start, reveal, flag and chord in a movelog.MoveLog
+    # must be called before the first move, returns the log
+    def recordMoves(self):
+        from minesweeper.movelog import MoveLog
+        self.log = MoveLog(self.row, self.col, self.minecount, self.seed)
+        return self.log
+
+    # writes the game to path in the binary format of minesweeper.savefile
+    # elapsed is the number of seconds played so far
+    def save(self, path, elapsed = 0.0):
+        from minesweeper import savefile
+        savefile.save(self, path, elapsed)
+
+    # reads a game written by save
+    # returns (game, elapsed), the restored Game and the seconds played before it was saved
+    @staticmethod
+    def load(path, renderMode = "full"):
+        from minesweeper import savefile
+        return savefile.load(path, renderMode)
+
+    # returns true iff number of unchecked mines is the same and minecount
+    # i.e. the game has been won
+    def checkEnd(self):
+        return (self.row * self.col) - self.numChecked == self.minecount 
+
+    # query API, every query is O(1) as the counters behind it are kept up to date by the moves
+
+    # returns the number of hidden cells that are not flagged
+    def unknownLeft(self):
+        return self.row * self.col - self.numChecked - self.numFlags - self.numExploded
+
+    # returns the number of mines minus the number of flags
+    def minesLeft(self):
+        return self.minecount - self.numFlags
+
+    # returns true iff pos is a revealed number from 1 to 8 with as many adjacent flags
+    def isSatisfied(self, pos):
+        return pos in self.satisfied
+
+    # returns the set of satisfied numbers (see isSatisfied), which must not be modified
+    def satisfiedNumbers(self):
+        return self.satisfied
+
+    # returns true iff the game has been won
+    def isWon(self):
+        return not self.lost and self.checkEnd()
+
+    # returns true iff the game has been won or lost
+    def isOver(self):
+        return self.lost or self.checkEnd()
+
+    # rebuilds every counter of the query API from self.state, in O(rows * cols)
+    # for when the state was set directly, e.g. by savefile.load
+    def recount(self):
+        state = self.state
+        self.numFlags = state.count(FLAGGED)
+        self.numExploded = state.count(MINE)
+        self.numChecked = len(state) - state.count(UNKNOWN) - self.numFlags - self.numExploded
+        self.flagCounts = bytearray(len(state))
+        #only cells next to a flag can be satisfied numbers
+        flagged = set()
+        pos = state.find(FLAGGED)
+        while pos != -1:
+            for adj in self.adjacent(pos):
+                self.flagCounts[adj] += 1
+                flagged.add(adj)
+            pos = state.find(FLAGGED, pos + 1)
+        self.satisfied = set([pos for pos in flagged if 0 < state[pos] <= 8 and self.flagCounts[pos] == state[pos]])
+
+    def flag(self, pos):
+        self.toggleFlag(pos)
+        self.print((pos,))
+
+    def show(self, pos):
+        self.print(self.reveal(pos))
+        return not self.lost
+
+    # reveals the cells around pos if it is a revealed number with
+    # as many adjacent flags as its number, then prints the board
+    # returns false iff the game has been lost
+    def showAround(self, pos):
+        self.print(self.chord(pos))
+        return not self.lost
+
+    # toggles the flag on pos if it is still hidden, without printing
+    # returns 1 if a flag was placed, -1 if one was removed, 0 if pos is revealed
+    def toggleFlag(self, pos):
+        if self.log is not None: self.log.append(FLAG_MOVE, pos)
+        state = self.state
+        if state[pos] == UNKNOWN:
+            state[pos] = FLAGGED
+            change = 1
+        elif state[pos] == FLAGGED:
+            state[pos] = UNKNOWN
+            change = -1
+        else: return 0
+        self.numFlags += change
+        flagCounts = self.flagCounts
+        for adj in self.adjacent(pos):
+            flags = flagCounts[adj] = flagCounts[adj] + change
+            value = state[adj]
+            if 0 < value <= 8:
+                if flags == value: self.satisfied.add(adj)
+                else: self.satisfied.discard(adj)
+        return change
+
+    # plays a batch of moves without printing, for bots and servers that send many moves at once
+    # moves is a sequence of (action, pos) with the action codes of a movelog.MoveLog:
+    # SHOW_MOVE reveals, FLAG_MOVE toggles a flag, CHORD_MOVE chords and START_MOVE places the mines
+    # the moves are played in order and the batch stops after a move that loses the game
+    # returns (played, diff): the number of moves played, and an array("I") of
+    # pos, value, pos, value, ... holding every cell whose state changed once, with its new value
+    def play(self, moves):
+        actions = {SHOW_MOVE: self.reveal, CHORD_MOVE: self.chord, START_MOVE: self.start}
+        state = self.state
+        changed = []
+        #state of every toggled cell before the batch, flags toggled back leave no change
+        toggled = {}
+        played = 0
+        for action, pos in moves:
+            if self.lost: break
+            if action == FLAG_MOVE:
+                if pos not in toggled: toggled[pos] = state[pos]
+                self.toggleFlag(pos)
+            elif action in actions:
+                revealed = actions[action](pos)
+                if action != START_MOVE: changed += revealed
+            else:
+                raise ValueError("unknown move action " + repr(action))
+            played += 1
+        if toggled:
+            #a cell flagged and unflagged again may have been revealed afterwards
+            changed = list(dict.fromkeys(changed + [pos for pos, before in toggled.items() if state[pos] != before]))
+        diff = array("I", [0]) * (2 * len(changed))
+        diff[0::2] = array("I", changed)
+        diff[1::2] = array("I", [state[pos] for pos in changed])
+        return played, diff
+
+    # returns the number of flagged cells adjacent to pos
+    def flagsAround(self, pos):
+        return self.flagCounts[pos]
+
+    # returns true iff pos is a revealed number with as many adjacent flags as its number
+    def isSafe(self, pos):
+        value = self.state[pos]
+        return value <= 8 and self.flagCounts[pos] == value
+
+    # reveals pos if it is unknown, cascading to the adjacent cells if it is zero
+    # updates numChecked, and sets self.lost if pos was a mine
+    # returns the list of newly revealed positions
+    def reveal(self, pos):
+        if self.log is not None: self.log.append(SHOW_MOVE, pos)
+        return self.revealAll((pos,))
+
+    # reveals the hidden cells around pos if it is safe (see isSafe), cascading from zeros
+    # the middle click of the GUI, a wrong flag around pos loses the game
+    # returns the list of newly revealed positions
+    def chord(self, pos):
+        if self.log is not None: self.log.append(CHORD_MOVE, pos)
+        if not self.isSafe(pos): return []
+        return self.revealAll(self.adjacent(pos))
+
+    # reveals all the given positions, cascading from the ones that are zero
+    # updates numChecked, and sets self.lost if one of them was a mine
+    # returns the list of newly revealed positions
+    def revealAll(self, positions):
+        exploded = self.numExploded
+        changed = floodReveal(positions, self.adjacent, self.revealCell)
+        #a mine can only be revealed as one of positions, never by a cascade
+        exploded = self.numExploded - exploded
+        if exploded: self.lost = True
+        self.numChecked += len(changed) - exploded
+        return changed
+
+    # reveals the single cell pos if it is unknown
+    # returns its count (-1 for a mine), or None if it was not revealed
+    def revealCell(self, pos):
+        if self.state[pos] != UNKNOWN: return None
+        if self.mines[pos]:
+            self.state[pos] = MINE
+            self.numExploded += 1
+            return -1
+        count = self.counts[pos]
+        if count == NOT_COUNTED: count = self.count(pos)
+        self.state[pos] = count
+        if count and self.flagCounts[pos] == count: self.satisfied.add(pos)
+        return count
+
+    # returns the text of rows first to last-1 of values as one string
+    # each row is followed by a separator line, e.g. |??|1 |__|
+    # values is laid out like self.state, one byte per cell
+    def render(self, values, first = 0, last = None, numbered = False):
+        if last is None: last = self.row
+        col = self.col
+        line = "-" + "---" * col
+        lines = [] if numbered else [line]
+        for r in range(first, last):
+            row = "|" + "|".join([CELL_TEXT[v] for v in values[r*col:(r+1)*col]]) + "|"
+            if numbered: lines.append(str(r).rjust(len(str(self.row - 1))) + " " + row)
+            else: lines.extend((row, line))
+        return "\n".join(lines)
+
+    #prints out the current state according to self.renderMode
+    #   "full" prints the whole board
+    #   "diff" prints only the rows holding a position in changed, prefixed by their row number
+    #   "quiet" prints nothing
+    def print(self, changed = None):
+        if self.renderMode == "quiet": return
+        if self.renderMode == "diff" and changed is not None:
+            rows = sorted(set([pos // self.col for pos in changed]))
+            text = "\n".join([self.render(self.state, r, r + 1, True) for r in rows])
+            if text: print(text)
+            return
+        print(self.render(self.state) + "\n")
+
+    #prints out all the values of the current state
+    def printSolution(self):
+        if self.renderMode == "quiet": return
+        solution = bytearray([self.count(pos) for pos in range(self.row * self.col)])
+        for pos in range(len(solution)):
+            if self.mines[pos]: solution[pos] = MINE
+        print(self.render(solution))
@@ -0,0 +1,197 @@
+""" Background generator of no-guess boards
+
+    A BoardPool keeps bounded queues of boards that the Solver can finish without
+    guessing, generated ahead of time by worker processes. Queues are keyed by
+    (rows, cols, mines, region), where the board is split into square regions of
+    REGION_SIZE cells a side and region is the (row, col) of the region clicked first.
+
+    A board is queued for a region only if every cell of the region is a zero, so
+    any first click inside the region opens the same area, and the Solver can clear
+    the whole board from that opening. Taking a board for a first click is then a
+    dict lookup and a deque pop.
+
+    The queues of regions that are rarely opened, like the corners of Expert, may
+    never fill, so a configuration stops being filled once IDLE_BATCHES batches in
+    a row added no board to it, and starts again when a board is taken for it.
+
+    Usage:
+        pool = BoardPool()
+        pool.prepare(16, 30, 99)               # start filling queues for Expert
+        mines = pool.take(16, 30, 99, pos)     # list of mine positions, or None if empty
+        game.start(pos, mines)
+        pool.close()
+"""
+
+import logging
+import multiprocessing
+import random
+import threading
+from collections import deque
+from minesweeper.engine import Game
+from minesweeper.solver import Solver
+
+REGION_SIZE = 3
+# finished batches in a row that add no board to a configuration before it stops being filled,
+# most Expert batches find no board at all so a few empty ones in a row are no sign of full queues
+IDLE_BATCHES = 32
+
+log = logging.getLogger(__name__)
+
+def regionOf(cols, pos):
+    """ Returns the (row, col) of the region holding position pos on a board cols wide """
+    row, col = divmod(pos, cols)
+    return (row // REGION_SIZE, col // REGION_SIZE)
+
+def zeroRegions(game):
+    """ Returns the regions of a started Game whose cells are all zeros """
+    regions = []
+    for regionRow in range(0, game.row, REGION_SIZE):
+        for regionCol in range(0, game.col, REGION_SIZE):
+            zero = True
+            for row in range(regionRow, min(regionRow + REGION_SIZE, game.row)):
+                for col in range(regionCol, min(regionCol + REGION_SIZE, game.col)):
+                    pos = row * game.col + col
+                    if game.mines[pos] or game.count(pos): zero = False
+            if zero: regions.append((regionRow // REGION_SIZE, regionCol // REGION_SIZE))
+    return regions
+
+def solvable(rows, cols, mines, layout, pos):
+    """ Returns the set of positions opened if the Solver clears the board
+        from a first click at pos without guessing, otherwise None
+    """
+    game = Game(rows, cols, mines, renderMode="quiet")
+    game.start(pos, layout)
+    opened = set(game.reveal(pos))
+    solver = Solver(game)
+    if not solver.solve(): return None
+    return opened
+
+def generateBoards(task):
+    """ Worker entry point, tries count random layouts starting from seed
+        Returns a list of (layout, regions) for the layouts that are no-guess
+        from at least one region, regions being the regions they are no-guess from
+    """
+    rows, cols, mines, seed, count = task
+    rng = random.Random(seed)
+    boards = []
+    for attempt in range(count):
+        layout = rng.sample(range(rows * cols), mines)
+        game = Game(rows, cols, mines, renderMode="quiet")
+        game.placeMines(layout)
+        regions = []
+        #regions inside one opening share the same outcome, so solve each opening once
+        tried = {}
+        for region in zeroRegions(game):
+            pos = region[0] * REGION_SIZE * cols + region[1] * REGION_SIZE
+            if pos not in tried:
+                opened = solvable(rows, cols, mines, layout, pos)
+                for cell in (opened or (pos,)): tried[cell] = opened is not None
+            if tried[pos]: regions.append(region)
+        if regions: boards.append((layout, regions))
+    return boards
+
+class BoardPool(object):
+    def __init__(self, workers = None, depth = 4, batchSize = 20, seed = None):
+        """ Attributes:
+                self.depth: most boards kept per (rows, cols, mines, region) queue
+                self.batchSize: layouts tried by a worker per task
+                self.queues: dict of (rows, cols, mines, region) to a deque of mine layouts
+                self.configs: list of (rows, cols, mines) that are being filled
+                self.idle: dict of (rows, cols, mines) to the finished batches in a row that added no board to it
+                self.pool: multiprocessing.Pool of worker processes (one per core by default)
+                self.lock/self.wake: guard the queues, and wake the filler thread up
+                    when a board is taken or a configuration is added
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self.depth = depth
+        self.batchSize = batchSize
+        self.random = random.Random(seed)
+        self.queues = {}
+        self.configs = []
+        self.idle = {}
+        self.pool = multiprocessing.Pool(self.workers)
+        self.lock = threading.Lock()
+        self.wake = threading.Condition(self.lock)
+        self.closed = False
+        self.thread = threading.Thread(target=self.fill, daemon=True)
+        self.thread.start()
+
+    def prepare(self, rows, cols, mines):
+        """ Starts generating boards for the given configuration in the background """
+        with self.lock:
+            if (rows, cols, mines) in self.configs: return
+            self.configs.append((rows, cols, mines))
+            self.idle[(rows, cols, mines)] = 0
+            for regionRow in range((rows + REGION_SIZE - 1) // REGION_SIZE):
+                for regionCol in range((cols + REGION_SIZE - 1) // REGION_SIZE):
+                    self.queues[(rows, cols, mines, (regionRow, regionCol))] = deque()
+            self.wake.notify()
+
+    def take(self, rows, cols, mines, pos):
+        """ Returns the mine layout of the next no-guess board for a first click at pos,
+            or None if that queue is empty (or the configuration was never prepared)
+        """
+        with self.lock:
+            #taking a board, or finding none, is a reason to fill the configuration again
+            if (rows, cols, mines) in self.idle:
+                self.idle[(rows, cols, mines)] = 0
+                self.wake.notify()
+            queue = self.queues.get((rows, cols, mines, regionOf(cols, pos)))
+            if not queue: return None
+            return queue.popleft()
+
+    def size(self, rows, cols, mines):
+        """ Returns the number of boards ready for the given configuration """
+        with self.lock:
+            return sum(len(queue) for key, queue in self.queues.items() if key[:3] == (rows, cols, mines))
+
+    def hungry(self):
+        """ Returns the configurations that still have a queue with room and have not
+            gone IDLE_BATCHES batches without a new board, lock must be held
+        """
+        return [config for config in self.configs if self.idle[config] < IDLE_BATCHES
+                and any(len(queue) < self.depth for key, queue in self.queues.items() if key[:3] == config)]
+
+    def fill(self):
+        """ Filler thread, keeps one task per worker in flight for the configurations
+            that have room, and sorts the finished boards into their queues
+        """
+        pending = deque()
+        while True:
+            with self.lock:
+                while not self.closed and not pending and not self.hungry(): self.wake.wait()
+                if self.closed: return
+                configs = self.hungry()
+            while configs and len(pending) < self.workers:
+                config = configs[len(pending) % len(configs)]
+                task = config + (self.random.getrandbits(64), self.batchSize)
+                pending.append((config, self.pool.apply_async(generateBoards, (task,))))
+            config, result = pending.popleft()
+            #a terminated pool never finishes its results, so keep an eye on close()
+            while not result.ready():
+                if self.closed: return
+                result.wait(0.1)
+            try:
+                boards = result.get()
+            except Exception:
+                #get raises the worker's error, the batch counts as one that added nothing
+                log.exception("generating %dx%d boards with %d mines failed", *config)
+                boards = []
+            with self.lock:
+                added = 0
+                for layout, regions in boards:
+                    #a board is handed out once, to the emptiest of the queues it suits
+                    queues = [self.queues[config + (region,)] for region in regions]
+                    queue = min(queues, key=len)
+                    if len(queue) < self.depth:
+                        queue.append(layout)
+                        added += 1
+                self.idle[config] = 0 if added else self.idle[config] + 1
+
+    def close(self):
+        """ Stops the filler thread and the worker processes """
+        with self.lock:
+            self.closed = True
+            self.wake.notify()
+        self.pool.terminate()
+        self.pool.join()
@@ -0,0 +1,277 @@
+""" Unbounded Minesweeper board made of lazily generated chunks
+
+    The board is split into square chunks of chunkSize x chunkSize cells that are
+    only created when a reveal, a cascade or a lookup reaches them. The mines of a
+    chunk are derived from (seed, chunk row, chunk column) alone, so the counts
+    along a chunk's border are computed from the mine layout of its neighbours
+    without having to create those chunks, and a chunk that is dropped can always
+    be generated again identically.
+
+    At most memoryBudget bytes of chunks are kept in memory. When there are more,
+    the least recently used chunk is evicted: a chunk the player has touched
+    spills its revealed and flag bitplanes (minesweeper.savefile format) to a
+    file in spillDir and is rebuilt from it when it is needed again, an untouched
+    chunk is simply dropped.
+
+    Cells are addressed by (row, col), any integers including negative ones.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+from collections import OrderedDict
+
+from minesweeper.engine import floodReveal, UNKNOWN, FLAGGED, MINE, CELL_TEXT
+from minesweeper.savefile import packBits, unpackBits, planeSize, buildState, REVEALED_TABLE, FLAG_TABLE
+
+# below this density a cascade from a zero could reach an unbounded number of
+# cells: a cell is zero with probability (1 - density) ** 9, and zeros stop
+# forming an infinite connected region only when that is below about 0.41
+MIN_DENSITY = 0.1
+
+class Chunk(object):
+    """ The cells of one chunk, laid out like a Game's arrays with chunkSize columns
+
+        Attributes:
+            mines (bytearray): 1 iff the cell is a mine
+            counts (bytearray): number of mines adjacent to the cell, across chunk borders
+            state (bytearray): the Game.state value of the cell
+            touched (bool): True once a cell of the chunk was revealed or flagged
+    """
+    def __init__(self, mines, counts, state):
+        self.mines = mines
+        self.counts = counts
+        self.state = state
+        self.touched = False
+
+    def size(self):
+        return len(self.mines) + len(self.counts) + len(self.state)
+
+class InfiniteGame(object):
+    # density is the fraction of cells that are mines, at least MIN_DENSITY
+    # memoryBudget is the number of bytes of chunks kept in memory
+    # spillDir is where evicted chunks are written, a temporary directory by default
+    def __init__(self, density = 0.16, seed = None, chunkSize = 32, memoryBudget = 8 * 2**20, spillDir = None):
+        if not MIN_DENSITY <= density < 1:
+            raise ValueError("density must be between %s and 1" % MIN_DENSITY)
+        self.density = density
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.chunkSize = chunkSize
+        self.minesPerChunk = int(round(density * chunkSize * chunkSize))
+        #one chunk takes a byte per cell in each of its three arrays
+        self.maxChunks = max(4, memoryBudget // (3 * chunkSize * chunkSize))
+        self.spillDir = spillDir
+        self.ownSpillDir = False
+        self.chunks = OrderedDict()
+        self.spilled = set()
+        #cells kept free of mines around the first click
+        self.safe = set()
+        self.numChecked = 0
+        self.numFlags = 0
+        self.lost = False
+        self.started = False
+        #counters for benchmarks
+        self.generated = 0
+        self.evicted = 0
+        self.reloaded = 0
+
+    # the first move keeps the first click and its neighbours free of mines
+    def start(self, row, col):
+        self.safe = set([(row + dr, col + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)])
+        #chunks looked at before the first move were laid out without the safe cells,
+        #so they are generated again keeping any flags already placed on them
+        #they are all dropped first so the border counts come from the new layouts
+        #of their neighbours, not from the old mines still held by the others
+        oldChunks = self.chunks
+        self.chunks = OrderedDict()
+        for key, old in oldChunks.items():
+            chunk = self.generate(*key)
+            chunk.state = old.state
+            chunk.touched = old.touched
+            self.chunks[key] = chunk
+        self.started = True
+
+    # returns the mines of chunk (cy, cx) as a bytearray of 0 or 1 per cell
+    # the layout only depends on the seed, the chunk and the safe cells
+    def mineLayout(self, cy, cx):
+        size = self.chunkSize
+        rng = random.Random("%r/%d/%d" % (self.seed, cy, cx))
+        layout = bytearray(size * size)
+        for local in rng.sample(range(size * size), self.minesPerChunk):
+            row, col = divmod(local, size)
+            if (cy * size + row, cx * size + col) not in self.safe: layout[local] = 1
+        return layout
+
+    # returns a new Chunk (cy, cx) with every cell hidden
+    # counts on the border include the mines of the neighbouring chunks
+    def generate(self, cy, cx):
+        size = self.chunkSize
+        mines = self.mineLayout(cy, cx)
+        counts = bytearray(size * size)
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if dy == 0 and dx == 0: layout = mines
+                elif (cy + dy, cx + dx) in self.chunks: layout = self.chunks[(cy + dy, cx + dx)].mines
+                else: layout = self.mineLayout(cy + dy, cx + dx)
+                local = layout.find(1)
+                while local != -1:
+                    #the mine's row and column relative to this chunk's top left cell
+                    row, col = divmod(local, size)
+                    row += dy * size
+                    col += dx * size
+                    for r in range(max(row - 1, 0), min(row + 2, size)):
+                        for c in range(max(col - 1, 0), min(col + 2, size)):
+                            if r != row or c != col: counts[r * size + c] += 1
+                    local = layout.find(1, local + 1)
+        self.generated += 1
+        return Chunk(mines, counts, bytearray([UNKNOWN]) * (size * size))
+
+    # returns the path chunk (cy, cx) is spilled to
+    def spillPath(self, cy, cx):
+        if self.spillDir is None:
+            self.spillDir = tempfile.mkdtemp(prefix="minesweeper-")
+            self.ownSpillDir = True
+        return os.path.join(self.spillDir, "%d_%d.chunk" % (cy, cx))
+
+    # writes the revealed and flag bitplanes of chunk to disk
+    def spill(self, key, chunk):
+        with open(self.spillPath(*key), "wb") as output:
+            output.write(packBits(chunk.state.translate(REVEALED_TABLE)))
+            output.write(packBits(chunk.state.translate(FLAG_TABLE)))
+        self.spilled.add(key)
+
+    # regenerates chunk (cy, cx) and restores the state spilled by spill
+    def reload(self, cy, cx):
+        chunk = self.generate(cy, cx)
+        cells = self.chunkSize * self.chunkSize
+        path = self.spillPath(cy, cx)
+        with open(path, "rb") as spilled:
+            data = spilled.read()
+        plane = planeSize(cells)
+        revealed = unpackBits(data[:plane], cells)
+        flagged = unpackBits(data[plane:], cells)
+        chunk.state = buildState(chunk.mines, revealed, flagged, chunk.counts)
+        chunk.touched = True
+        os.remove(path)
+        self.spilled.discard((cy, cx))
+        self.reloaded += 1
+        return chunk
+
+    # returns the resident Chunk (cy, cx), creating or reloading it if needed
+    # and evicting the least recently used chunks over the memory budget
+    def chunk(self, cy, cx):
+        key = (cy, cx)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+        chunk = self.reload(cy, cx) if key in self.spilled else self.generate(cy, cx)
+        self.chunks[key] = chunk
+        while len(self.chunks) > self.maxChunks:
+            oldKey, old = self.chunks.popitem(last = False)
+            if old.touched: self.spill(oldKey, old)
+            self.evicted += 1
+        return chunk
+
+    # returns (chunk, index of the cell in the chunk's arrays) for cell (row, col)
+    def locate(self, cell):
+        cy, row = divmod(cell[0], self.chunkSize)
+        cx, col = divmod(cell[1], self.chunkSize)
+        return self.chunk(cy, cx), row * self.chunkSize + col
+
+    # returns the number of bytes held by the resident chunks
+    def residentBytes(self):
+        return sum([chunk.size() for chunk in self.chunks.values()])
+
+    # returns the Game.state value of cell (row, col)
+    def stateAt(self, row, col):
+        chunk, local = self.locate((row, col))
+        return chunk.state[local]
+
+    # returns true iff cell (row, col) is a mine
+    def isMine(self, row, col):
+        chunk, local = self.locate((row, col))
+        return chunk.mines[local] == 1
+
+    # returns the 8 cells adjacent to cell
+    def adjacent(self, cell):
+        row, col = cell
+        return [(row - 1, col - 1), (row - 1, col), (row - 1, col + 1), (row, col - 1),
+                (row, col + 1), (row + 1, col - 1), (row + 1, col), (row + 1, col + 1)]
+
+    # reveals the single cell if it is unknown, see Game.revealCell
+    def revealCell(self, cell):
+        chunk, local = self.locate(cell)
+        if chunk.state[local] != UNKNOWN: return None
+        chunk.touched = True
+        if chunk.mines[local]:
+            chunk.state[local] = MINE
+            return -1
+        count = chunk.state[local] = chunk.counts[local]
+        return count
+
+    # reveals all the given cells, cascading from the ones that are zero
+    # updates numChecked, and sets self.lost if one of them was a mine
+    # returns the list of newly revealed cells
+    def revealAll(self, cells):
+        if not self.started: self.start(*cells[0])
+        changed = floodReveal(cells, self.adjacent, self.revealCell)
+        exploded = 0
+        for cell in cells:
+            chunk, local = self.locate(cell)
+            if chunk.mines[local] and chunk.state[local] == MINE and not self.lost:
+                exploded += 1
+        if exploded: self.lost = True
+        self.numChecked += len(changed) - exploded
+        return changed
+
+    # reveals (row, col), the first call also starts the game there
+    # returns the list of newly revealed cells
+    def reveal(self, row, col):
+        return self.revealAll([(row, col)])
+
+    # toggles the flag on (row, col) if it is still hidden
+    # returns 1 if a flag was placed, -1 if one was removed, 0 if it is revealed
+    def toggleFlag(self, row, col):
+        chunk, local = self.locate((row, col))
+        value = chunk.state[local]
+        if value != UNKNOWN and value != FLAGGED: return 0
+        chunk.touched = True
+        chunk.state[local] = FLAGGED if value == UNKNOWN else UNKNOWN
+        change = 1 if value == UNKNOWN else -1
+        self.numFlags += change
+        return change
+
+    # returns the number of flagged cells adjacent to (row, col)
+    def flagsAround(self, row, col):
+        return sum([1 for cell in self.adjacent((row, col)) if self.stateAt(*cell) == FLAGGED])
+
+    # reveals the hidden cells around (row, col) if it is a revealed number
+    # with as many adjacent flags as its number, see Game.chord
+    # returns the list of newly revealed cells
+    def chord(self, row, col):
+        value = self.stateAt(row, col)
+        if value > 8 or self.flagsAround(row, col) != value: return []
+        return self.revealAll(self.adjacent((row, col)))
+
+    # returns the text of the rows x cols window whose top left cell is (top, left)
+    # in the same notation as Game.render
+    def render(self, top, left, rows, cols):
+        line = "-" + "---" * cols
+        lines = [line]
+        for row in range(top, top + rows):
+            text = [CELL_TEXT[self.stateAt(row, col)] for col in range(left, left + cols)]
+            lines.extend(("|" + "|".join(text) + "|", line))
+        return "\n".join(lines)
+
+    # removes the spilled chunks, and the spill directory if it was created by the game
+    def close(self):
+        for key in self.spilled:
+            path = self.spillPath(*key)
+            if os.path.exists(path): os.remove(path)
+        self.spilled.clear()
+        if self.ownSpillDir:
+            shutil.rmtree(self.spillDir, ignore_errors = True)
+            self.spillDir = None
+            self.ownSpillDir = False
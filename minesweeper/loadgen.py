@@ -0,0 +1,194 @@
+""" Load generator for minesweeper.server
+
+    Opens the given number of concurrent sessions, spread over a smaller number of
+    connections, and has every session play games of random reveals (skipping the
+    cells it knows are revealed) for the given duration, starting a new game
+    whenever one ends. Reports the moves per second served and the latency of
+    each kind of request on its own: the show requests are the moves, new and
+    close only start and end the games. Every session keeps one request in
+    flight, so once the server is saturated a request mostly waits behind the
+    other sessions' requests: the latency is about the number of sessions
+    divided by the requests served per second.
+
+    With --spawn a server is started in a subprocess on a temporary Unix socket
+    (or a local TCP port where Unix sockets are not available) and stopped at the end.
+
+    Usage: python -m minesweeper.loadgen [--sessions N] [--connections N] [--duration SECONDS]
+                                         [--host HOST] [--port PORT] [--unix PATH] [--spawn]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+
+class Connection(object):
+    """ A client connection on which many sessions send requests concurrently
+
+        Replies come back in request order, so each request waits on a future
+        queued when it was sent.
+
+        Attributes:
+            reader/writer: the asyncio streams of the connection
+            pending (deque): (future, time sent, op) of the requests waiting for their reply
+            latencies (dict): op to the list of seconds between sending each request of that op and getting its reply
+    """
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = deque()
+        self.latencies = {}
+        self.receiver = asyncio.ensure_future(self.receive())
+
+    async def receive(self):
+        while True:
+            line = await self.reader.readline()
+            if not line: break
+            future, startTime, op = self.pending.popleft()
+            self.latencies.setdefault(op, []).append(time.perf_counter() - startTime)
+            if not future.done(): future.set_result(json.loads(line))
+        for future, startTime, op in self.pending:
+            if not future.done(): future.set_exception(ConnectionError("server closed the connection"))
+
+    # sends request and returns its reply
+    async def request(self, request):
+        future = asyncio.get_event_loop().create_future()
+        self.pending.append((future, time.perf_counter(), request["op"]))
+        self.writer.write((json.dumps(request, separators=(",", ":")) + "\n").encode())
+        await self.writer.drain()
+        reply = await future
+        if "error" in reply: raise RuntimeError(reply["error"])
+        return reply
+
+    async def close(self):
+        self.writer.close()
+        self.receiver.cancel()
+        try:
+            await self.receiver
+        except asyncio.CancelledError:
+            pass
+
+# plays games of random reveals on one session until stopAt
+# returns (moves made, games finished)
+async def playSession(connection, rows, cols, mines, seed, stopAt):
+    rng = random.Random(seed)
+    loop = asyncio.get_event_loop()
+    moves = games = 0
+    while loop.time() < stopAt:
+        sessionId = (await connection.request({"op": "new", "rows": rows, "cols": cols, "mines": mines,
+                                               "seed": rng.randrange(2**31)}))["session"]
+        revealed = set()
+        while loop.time() < stopAt:
+            pos = rng.randrange(rows * cols)
+            if pos in revealed: continue
+            reply = await connection.request({"op": "show", "session": sessionId, "pos": pos})
+            moves += 1
+            revealed.update(reply["cells"][::2])
+            if reply["lost"] or reply["won"]:
+                games += 1
+                break
+        await connection.request({"op": "close", "session": sessionId})
+    return moves, games
+
+async def connect(host, port, path):
+    if path is not None: reader, writer = await asyncio.open_unix_connection(path, limit = 2**20)
+    else: reader, writer = await asyncio.open_connection(host, port, limit = 2**20)
+    return Connection(reader, writer)
+
+async def run(args, path):
+    connections = [await connect(args.host, args.port, path) for i in range(args.connections)]
+    loop = asyncio.get_event_loop()
+    startTime = loop.time()
+    stopAt = startTime + args.duration
+    sessions = [playSession(connections[n % len(connections)], args.rows, args.cols, args.mines, n, stopAt)
+                for n in range(args.sessions)]
+    results = await asyncio.gather(*sessions)
+    elapsed = loop.time() - startTime
+    for connection in connections: await connection.close()
+    latencies = {}
+    for connection in connections:
+        for op, times in connection.latencies.items():
+            latencies.setdefault(op, []).extend(times)
+    for times in latencies.values():
+        times.sort()
+    return results, latencies, elapsed
+
+# returns the value below which the given fraction of the sorted values fall
+def percentile(values, fraction):
+    if not values: return 0.0
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+# starts a server subprocess, returns (process, unix socket path or None, port)
+def spawn(args):
+    command = [sys.executable, "-m", "minesweeper.server", "--max-sessions", str(2 * args.sessions),
+               "--max-cells", str(2 * args.sessions * args.rows * args.cols)]
+    path = None
+    port = args.port
+    if hasattr(socket, "AF_UNIX"):
+        path = os.path.join(tempfile.mkdtemp(prefix="minesweeper-"), "server.sock")
+        command += ["--unix", path]
+    else:
+        command += ["--host", args.host, "--port", str(port)]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(command, cwd = root)
+    #wait for the server to start listening
+    for i in range(100):
+        try:
+            if path is not None:
+                probe = socket.socket(socket.AF_UNIX)
+                probe.connect(path)
+            else:
+                probe = socket.create_connection((args.host, port))
+            probe.close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return process, path, port
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog="python -m minesweeper.loadgen", description=__doc__.split("\n")[0])
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--mines", type=int, default=99)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--spawn", action="store_true", help="start a local server for the run")
+    args = parser.parse_args(argv)
+
+    process = None
+    path = args.unix
+    if args.spawn: process, path, args.port = spawn(args)
+    #a loop of its own rather than asyncio.run, which needs Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        results, latencies, elapsed = loop.run_until_complete(run(args, path))
+    finally:
+        loop.close()
+        if process is not None:
+            process.terminate()
+            process.wait()
+            if path is not None:
+                if os.path.exists(path): os.remove(path)
+                os.rmdir(os.path.dirname(path))
+    moves = sum([moves for moves, games in results])
+    games = sum([games for moves, games in results])
+    print("%d sessions over %d connections for %.1fs" % (args.sessions, args.connections, elapsed))
+    print("%d moves, %d games finished, %d moves/s" % (moves, games, moves / elapsed))
+    for op in ("show", "new", "close"):
+        times = latencies.get(op, [])
+        print("%-5s latency over %d requests: p50 %.2fms, p99 %.2fms, max %.2fms" % (op, len(times),
+              1000 * percentile(times, 0.5), 1000 * percentile(times, 0.99), 1000 * percentile(times, 1.0)))
+
+if __name__ == "__main__":
+    main()
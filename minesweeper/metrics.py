@@ -0,0 +1,167 @@
+""" Optional instrumentation of the engine and GUI hot paths
+
+    Metrics.install wraps the instrumented methods of the given classes so every
+    call records its latency and the number of cells it touched, and
+    Metrics.uninstall puts the original methods back. Nothing is wrapped until
+    install is called, so instrumentation costs nothing while it is off.
+
+    For every instrumented method a Metrics keeps the number of calls, the total
+    cells touched and a latency histogram with power of two buckets in
+    microseconds. Callbacks added with subscribe are called after every
+    instrumented call with (name, seconds, cells), e.g. to forward the metrics.
+
+    Instrumented methods, see GAME_HOOKS and BOARD_HOOKS:
+        Game.start, Game.reveal, Game.chord, Game.toggleFlag, Game.play
+        Board.setUpBombs, Board.showTile, Board.showAdjTiles, Board.cascadeShow,
+        Board.revealBombs, Board.paintNext
+    showTile, showAdjTiles and paintNext are whole Tk event handlers, so their
+    worst latency is the longest the GUI stopped answering input.
+"""
+
+import functools
+import time
+
+# progress functions passed to Metrics.install, read just before each call
+# so the cells revealed by it can be counted
+def gameProgress(game):
+    return game.numChecked
+
+def boardProgress(board):
+    return board.game.numChecked
+
+# (method name, cells) for every instrumented method,
+# cells(obj, result, before) returns the number of cells the call touched,
+# where before is the progress read just before the call
+# the Game hooks are the moves every front end ends up calling: the command line's
+# show, showAround and flag, the GUI, the protocol, the server and movelog replays
+GAME_HOOKS = (
+    ("start", lambda game, result, before: game.minecount),
+    ("reveal", lambda game, result, before: game.numChecked - before),
+    ("chord", lambda game, result, before: game.numChecked - before),
+    ("toggleFlag", lambda game, result, before: abs(result)),
+    ("play", lambda game, result, before: len(result[1]) // 2),
+)
+BOARD_HOOKS = (
+    ("setUpBombs", lambda board, result, before: board.numMines),
+    ("showTile", lambda board, result, before: board.game.numChecked - before),
+    ("showAdjTiles", lambda board, result, before: board.game.numChecked - before),
+    ("cascadeShow", lambda board, result, before: len(result)),
+    ("revealBombs", lambda board, result, before: board.numMines),
+    ("paintNext", lambda board, result, before: result),
+)
+
+# number of histogram buckets, the last one holds every call of 2**(BUCKETS-2)us or more
+BUCKETS = 32
+
+class Stat(object):
+    """ Metrics of one instrumented method
+
+        Attributes:
+            calls (int): number of calls
+            cells (int): total number of cells touched
+            total (float): total seconds spent in the method
+            worst (float): longest call in seconds
+            histogram (list): histogram[i] is the number of calls that took
+                less than 2**i microseconds (and at least 2**(i-1))
+    """
+    def __init__(self):
+        self.calls = 0
+        self.cells = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.histogram = [0] * BUCKETS
+
+    def add(self, seconds, cells):
+        self.calls += 1
+        self.cells += cells
+        self.total += seconds
+        if seconds > self.worst: self.worst = seconds
+        self.histogram[min(int(seconds * 1e6).bit_length(), BUCKETS - 1)] += 1
+
+    # returns the upper bound in seconds of the bucket holding the given fraction of calls
+    def percentile(self, fraction):
+        if not self.calls: return 0.0
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= fraction * self.calls: return min((2 ** bucket) / 1e6, self.worst)
+        return self.worst
+
+class Metrics(object):
+    """ Collects call counts, cells touched and latency histograms of the instrumented methods
+
+        Attributes:
+            stats (dict): instrumented method name, e.g. "Game.reveal", to its Stat
+            callbacks (list): functions called with (name, seconds, cells) after every call
+            originals (list): (class, method name, original function) of the wrapped methods
+    """
+    def __init__(self):
+        self.stats = {}
+        self.callbacks = []
+        self.originals = []
+
+    def subscribe(self, callback):
+        self.callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        self.callbacks.remove(callback)
+
+    def record(self, name, seconds, cells):
+        stat = self.stats.get(name)
+        if stat is None: stat = self.stats[name] = Stat()
+        stat.add(seconds, cells)
+        for callback in self.callbacks:
+            callback(name, seconds, cells)
+
+    # wraps the hooked methods of owner, a class, e.g. install(Game, GAME_HOOKS)
+    def install(self, owner, hooks, progress = None):
+        for method, cells in hooks:
+            original = getattr(owner, method)
+            self.originals.append((owner, method, original))
+            setattr(owner, method, self.wrap(owner.__name__ + "." + method, original, cells, progress))
+
+    # puts back every method wrapped by install
+    def uninstall(self):
+        for owner, method, original in reversed(self.originals):
+            setattr(owner, method, original)
+        del self.originals[:]
+
+    def wrap(self, name, original, cells, progress):
+        record = self.record
+        clock = time.perf_counter
+        @functools.wraps(original)
+        def instrumented(obj, *args, **kwargs):
+            before = progress(obj) if progress is not None else 0
+            startTime = clock()
+            result = original(obj, *args, **kwargs)
+            elapsed = clock() - startTime
+            record(name, elapsed, cells(obj, result, before))
+            return result
+        return instrumented
+
+    def reset(self):
+        self.stats.clear()
+
+    # returns the metrics as plain data, e.g. to serialise them
+    def snapshot(self):
+        return dict([(name, {"calls": stat.calls, "cells": stat.cells, "total": stat.total,
+                             "worst": stat.worst, "histogram": list(stat.histogram)})
+                     for name, stat in self.stats.items()])
+
+    # returns a table with one line per instrumented method
+    def summary(self):
+        lines = ["%-20s %8s %10s %10s %10s %10s %10s" % ("method", "calls", "cells", "mean", "p50", "p99", "max")]
+        for name in sorted(self.stats):
+            stat = self.stats[name]
+            lines.append("%-20s %8d %10d %8.1fus %8.1fus %8.1fus %8.1fus" % (name, stat.calls, stat.cells,
+                         1e6 * stat.total / stat.calls, 1e6 * stat.percentile(0.5),
+                         1e6 * stat.percentile(0.99), 1e6 * stat.worst))
+        return "\n".join(lines)
+
+# instruments Game, and boardClass if one is given, returns the Metrics collecting them
+def enable(boardClass = None):
+    from minesweeper.engine import Game
+    metrics = Metrics()
+    metrics.install(Game, GAME_HOOKS, gameProgress)
+    if boardClass is not None: metrics.install(boardClass, BOARD_HOOKS, boardProgress)
+    return metrics
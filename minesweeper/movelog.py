@@ -0,0 +1,146 @@
+""" Event-sourced move log of a Game, and deterministic replay
+
+    A MoveLog holds everything needed to rebuild a game: the board size, the
+    Game's seed, the mine layout if it was not drawn from the seed (a board taken
+    from a generator.BoardPool), and every move as an action code, a position and
+    a time.monotonic() timestamp relative to the start of the log. Moves are kept
+    in typed arrays, 13 bytes per move.
+
+    A Game records its moves once recordMoves() is called, the GUI Board and the
+    command line App always do. replay() rebuilds the game at full speed without
+    rendering, Board.replayLog plays it back in real time in the GUI.
+
+    Usage: python -m minesweeper.movelog LOG [LOG ...]
+        replays every log and prints its result and the replay speed
+"""
+
+import struct
+import sys
+import time
+from array import array
+
+from minesweeper.engine import Game, START_MOVE, SHOW_MOVE, FLAG_MOVE, CHORD_MOVE
+
+# action codes of the moves, defined next to the Game that records them
+START, SHOW, FLAG, CHORD = START_MOVE, SHOW_MOVE, FLAG_MOVE, CHORD_MOVE
+ACTION_NAMES = ("start", "show", "flag", "chord")
+
+MAGIC = b"MSWL"
+VERSION = 1
+# magic, version, rows, cols, minecount, seed, number of preset mines, number of moves
+HEADER = struct.Struct("<4sHIIIqII")
+
+class MoveLog(object):
+    """ The moves of one game in the order they were played
+
+        Attributes:
+            rows (int): number of rows of the board
+            cols (int): number of columns of the board
+            minecount (int): number of mines on the board
+            seed (int): the Game's seed
+            mines (array): the mine positions passed to Game.start, None if they came from the seed
+            actions (array): action code of every move
+            positions (array): position of every move
+            times (array): seconds from the start of the log to every move
+            origin (float): time.monotonic() when the log was created
+    """
+    def __init__(self, rows, cols, minecount, seed):
+        self.rows = rows
+        self.cols = cols
+        self.minecount = minecount
+        self.seed = seed
+        self.mines = None
+        self.actions = array("B")
+        self.positions = array("I")
+        self.times = array("d")
+        self.origin = time.monotonic()
+
+    def __len__(self):
+        return len(self.actions)
+
+    def append(self, action, pos):
+        self.actions.append(action)
+        self.positions.append(pos)
+        self.times.append(time.monotonic() - self.origin)
+
+    # records the first move, mines is the layout given to Game.start if any
+    def appendStart(self, pos, mines):
+        if mines is not None: self.mines = array("I", mines)
+        self.append(START, pos)
+
+    # yields (action, position, time) for every move
+    def moves(self):
+        return zip(self.actions, self.positions, self.times)
+
+    def save(self, path):
+        mines = self.mines if self.mines is not None else array("I")
+        header = HEADER.pack(MAGIC, VERSION, self.rows, self.cols, self.minecount,
+                             self.seed, len(mines), len(self))
+        with open(path, "wb") as output:
+            output.write(header)
+            for values in (mines, self.actions, self.positions, self.times):
+                output.write(littleEndian(values).tobytes())
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as saved:
+            data = saved.read()
+        if len(data) < HEADER.size or data[:4] != MAGIC:
+            raise ValueError(path + " is not a minesweeper move log")
+        magic, version, rows, cols, minecount, seed, numMines, numMoves = HEADER.unpack_from(data)
+        if version != VERSION: raise ValueError(path + " has unsupported version " + str(version))
+        log = MoveLog(rows, cols, minecount, seed)
+        offset = HEADER.size
+        fields = []
+        for typecode, count in (("I", numMines), ("B", numMoves), ("I", numMoves), ("d", numMoves)):
+            values = array(typecode)
+            size = values.itemsize * count
+            values.frombytes(data[offset:offset + size])
+            if len(values) != count: raise ValueError(path + " is truncated")
+            fields.append(littleEndian(values))
+            offset += size
+        mines, log.actions, log.positions, log.times = fields
+        #a preset layout holds minecount mines, so an empty one is the same as none
+        if len(mines): log.mines = mines
+        return log
+
+# returns values with its items in little endian order, the byte order of saved logs
+def littleEndian(values):
+    if sys.byteorder == "little": return values
+    values = array(values.typecode, values)
+    values.byteswap()
+    return values
+
+# rebuilds the game of log by playing all its moves, without printing anything
+# returns the Game as it was after the last move
+def replay(log, renderMode = "quiet"):
+    game = Game(log.rows, log.cols, log.minecount, log.seed, renderMode)
+    actions = {SHOW: game.reveal, FLAG: game.toggleFlag, CHORD: game.chord}
+    for action, pos in zip(log.actions, log.positions):
+        if action == START: game.start(pos, log.mines)
+        else: actions[action](pos)
+    return game
+
+def main(argv = None):
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        print(__doc__.strip().split("\n")[-2].strip())
+        sys.exit(2)
+    totalMoves = 0
+    totalTime = 0.0
+    for path in paths:
+        log = MoveLog.load(path)
+        startTime = time.perf_counter()
+        game = replay(log)
+        elapsed = time.perf_counter() - startTime
+        totalMoves += len(log)
+        totalTime += elapsed
+        result = "lost" if game.lost else "won" if game.isWon() else "unfinished"
+        playTime = log.times[-1] if len(log) else 0.0
+        print("%s: %dx%d %d mines, %d moves, %s in %.1fs" % (path, log.rows, log.cols, log.minecount,
+                                                          len(log), result, playTime))
+    if totalTime > 0:
+        print("replayed %d moves at %d moves/s" % (totalMoves, totalMoves / totalTime))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+""" Exact mine probabilities of the hidden cells of a Game
+
+    Every revealed number next to hidden cells gives a constraint: its hidden
+    neighbours hold exactly its number minus its adjacent flags of mines (flags
+    are taken to be mines). The hidden cells next to a number form the frontier,
+    which splits into components that share no constraint and can be counted
+    independently:
+        - cells of a component touched by exactly the same constraints are
+          grouped, a group of n cells holding m mines counts C(n, m) times
+        - a backtracking search over the groups counts, for every number of
+          mines in the component, the configurations and the mines each group
+          holds over all of them
+        - component results are memoised, so after a move only the components
+          it touched are counted again
+    The components are then combined with the hidden cells off the frontier,
+    which share the remaining mines uniformly, weighting every split of the
+    remaining mines by the number of ways to place it.
+
+    Counts are exact integers, only the final probabilities are floats.
+"""
+
+import functools
+import gc
+from operator import itemgetter, sub
+try:
+    from math import comb
+except ImportError:
+    #math.comb is new in Python 3.8
+    def comb(n, k):
+        if not 0 <= k <= n: return 0
+        result = 1
+        for i in range(min(k, n - k)):
+            result = result * (n - i) // (i + 1)
+        return result
+
+from minesweeper.engine import UNKNOWN
+
+# returns the constraints of game as a list of (hidden cells, mines among them),
+# one for every revealed number next to a hidden cell that is not flagged
+def constraints(game):
+    state = game.state
+    found = []
+    for pos, value in enumerate(state):
+        if value == 0 or value > 8: continue
+        hidden = tuple([adj for adj in game.adjacent(pos) if state[adj] == UNKNOWN])
+        if hidden: found.append((hidden, value - game.flagCounts[pos]))
+    return found
+
+# splits constraints into independent components
+# returns a list of components, each a tuple of constraints sorted so equal
+# components compare equal, for the memoised countComponent
+def components(found):
+    #union-find over the cells, every constraint joins its cells
+    parent = {}
+    def root(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+    for cells, mines in found:
+        for cell in cells:
+            parent.setdefault(cell, cell)
+        first = root(cells[0])
+        for cell in cells[1:]:
+            parent[root(cell)] = first
+    grouped = {}
+    for constraint in found:
+        grouped.setdefault(root(constraint[0][0]), set()).add(constraint)
+    return [tuple(sorted(group)) for group in grouped.values()]
+
+# returns a function picking the items at indices of a tuple as a new tuple, in a single C call
+def picker(indices):
+    if not indices: return lambda values: ()
+    if len(indices) == 1:
+        index = indices[0]
+        return lambda values: (values[index],)
+    return itemgetter(*indices)
+
+# counts the mine configurations of one component, a tuple of constraints
+# returns (groups, counts), where groups is a list of tuples of cells and
+# counts maps every possible number of mines k in the component to
+# (configurations with k mines, [mines held by each group summed over those configurations])
+@functools.lru_cache(maxsize = 256)
+def countComponent(component):
+    #group the cells by the set of constraints they are in
+    signature = {}
+    for index, (cells, mines) in enumerate(component):
+        for cell in cells:
+            signature.setdefault(cell, []).append(index)
+    bySignature = {}
+    for cell in sorted(signature):
+        bySignature.setdefault(tuple(signature[cell]), []).append(cell)
+    #walk the constraints breadth first so few of them are open at any point of the walk,
+    #and decide the groups in the order their constraints are reached
+    cellsOf = [cells for cells, mines in component]
+    walk = [0]
+    reached = set(walk)
+    for index in walk:
+        for cell in cellsOf[index]:
+            for other in signature[cell]:
+                if other not in reached:
+                    reached.add(other)
+                    walk.append(other)
+    rank = dict([(index, step) for step, index in enumerate(walk)])
+    order = sorted(bySignature, key = lambda key: sorted([rank[c] for c in key]))
+    groups = [tuple(bySignature[key]) for key in order]
+    sizes = [len(group) for group in groups]
+    last = {}
+    for i, key in enumerate(order):
+        for c in key:
+            last[c] = i
+    #active[i] lists the constraints with a decided group and an undecided one before group i is decided,
+    #a state holds the mines each of them still needs, in that order
+    active = [()]
+    for i, key in enumerate(order):
+        ahead = set(active[i]).union(key)
+        active.append(tuple(sorted([c for c in ahead if last[c] > i])))
+    left = [len(cells) for cells in cellsOf]
+
+    #forward[i] maps each state reachable before group i to the configurations of the groups
+    #before i reaching it, as a dict of their mines to the number of configurations
+    forward = [{(): {0: 1}}]
+    steps = []
+    for i, key in enumerate(order):
+        size = sizes[i]
+        for c in key:
+            left[c] -= size
+        position = dict([(c, n) for n, c in enumerate(active[i])])
+        width = len(active[i])
+        #the needs of the group's constraints are picked from the state followed by their numbers,
+        #a constraint not in the state yet still needs its number
+        needStart = tuple([component[c][1] for c in key])
+        pickNeed = picker([position[c] if c in position else width + n for n, c in enumerate(key)])
+        needLeft = [left[c] for c in key]
+        #the state after the group is picked from the state before it followed by the needs
+        #left to the group's constraints
+        pickNext = picker([width + key.index(c) if c in key else position[c] for c in active[i + 1]])
+        reached = {}
+        moves = []
+        for state, ways in forward[i].items():
+            need = pickNeed(state + needStart)
+            #the group's mines must leave every one of its constraints satisfiable
+            low = max(0, max(map(sub, need, needLeft)))
+            high = min(size, min(need))
+            for mines in range(low, high + 1):
+                weight = comb(size, mines)
+                nextState = pickNext(state + tuple([n - mines for n in need]))
+                moves.append((state, mines, nextState, weight))
+                counts = reached.get(nextState)
+                if counts is None: counts = reached[nextState] = {}
+                for total, count in ways.items():
+                    counts[total + mines] = counts.get(total + mines, 0) + count * weight
+        forward.append(reached)
+        steps.append(moves)
+
+    #backward[state] maps each state after group i to the configurations of the groups after i
+    #completing it, as a dict of their mines to the number of configurations
+    backward = {(): {0: 1}}
+    groupMines = {}
+    for i in range(len(groups) - 1, -1, -1):
+        earlier = {}
+        for state, mines, nextState, weight in steps[i]:
+            rest = backward.get(nextState)
+            if not rest: continue
+            counts = earlier.get(state)
+            if counts is None: counts = earlier[state] = {}
+            for total, count in rest.items():
+                counts[total + mines] = counts.get(total + mines, 0) + count * weight
+            if mines:
+                for before, x in forward[i][state].items():
+                    for total, y in rest.items():
+                        sums = groupMines.get(before + mines + total)
+                        if sums is None: sums = groupMines[before + mines + total] = [0] * len(groups)
+                        sums[i] += mines * weight * x * y
+        backward = earlier
+    configurations = backward.get((), {})
+    return groups, dict([(total, (count, groupMines.get(total, [0] * len(groups))))
+                         for total, count in configurations.items()])
+
+# returns the convolution of distributions, each a dict of mines to configurations
+def convolve(distributions):
+    result = {0: 1}
+    for distribution in distributions:
+        combined = {}
+        for a, x in result.items():
+            for b, y in distribution.items():
+                combined[a + b] = combined.get(a + b, 0) + x * y
+        result = combined
+    return result
+
+# returns a dict from every hidden cell of game that is not flagged to its
+# probability of being a mine, given the revealed numbers, flags and mine count
+# raises ValueError if no placement of the mines agrees with the board
+def mineProbabilities(game):
+    probabilities, interior = frontierProbabilities(game)
+    if interior is not None:
+        state = game.state
+        pos = state.find(UNKNOWN)
+        while pos != -1:
+            if pos not in probabilities: probabilities[pos] = interior
+            pos = state.find(UNKNOWN, pos + 1)
+    return probabilities
+
+# returns (frontier, interior): a dict from every hidden cell next to a revealed number
+# to its probability of being a mine, and the probability shared by every other hidden
+# cell that is not flagged, None if there is no such cell
+# raises ValueError if no placement of the mines agrees with the board
+# the counting allocates many short lived tuples and dicts but no reference cycles, so the
+# cyclic garbage collector is held off meanwhile: the full collections those allocations
+# set off made up most of the calls on Expert boards that took longer than a frame
+def frontierProbabilities(game):
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        return countProbabilities(game)
+    finally:
+        if collecting: gc.enable()
+
+# returns the result of frontierProbabilities, with the garbage collector left as it is
+def countProbabilities(game):
+    remaining = game.minecount - game.numFlags
+    comps = components(constraints(game))
+    counted = [countComponent(component) for component in comps]
+    frontier = 0
+    for groups, counts in counted:
+        for group in groups:
+            frontier += len(group)
+    interior = game.state.count(UNKNOWN) - frontier
+
+    #ways to place the rest of the mines off the frontier
+    def ways(frontierMines):
+        rest = remaining - frontierMines
+        return comb(interior, rest) if 0 <= rest <= interior else 0
+
+    distributions = [dict([(k, entry[0]) for k, entry in counts.items()]) for groups, counts in counted]
+    total = 0
+    interiorMines = 0
+    for k, configurations in convolve(distributions).items():
+        weight = configurations * ways(k)
+        total += weight
+        interiorMines += weight * (remaining - k)
+    if total == 0: raise ValueError("no placement of the mines agrees with the board")
+
+    probabilities = {}
+    for index, (groups, counts) in enumerate(counted):
+        others = convolve(distributions[:index] + distributions[index + 1:])
+        sums = [0] * len(groups)
+        for k, (configurations, groupMines) in counts.items():
+            factor = sum([x * ways(k + t) for t, x in others.items()])
+            if not factor: continue
+            for group in range(len(groups)):
+                sums[group] += groupMines[group] * factor
+        for group, cells in enumerate(groups):
+            probability = sums[group] / (total * len(cells))
+            for cell in cells:
+                probabilities[cell] = probability
+    if not interior: return probabilities, None
+    return probabilities, interiorMines / (total * interior)
+
+# returns the hidden cell least likely to be a mine, and its probability
+def safest(game):
+    probabilities = mineProbabilities(game)
+    pos = min(probabilities, key = probabilities.get)
+    return pos, probabilities[pos]
@@ -0,0 +1,240 @@
+""" Machine-readable streaming protocol of the command line version
+
+    Run with "python -m minesweeper --protocol jsonl". Every line read from stdin
+    is one JSON command and every command is answered by one JSON event on a line
+    of stdout, written without spaces. Nothing else is printed and nothing is
+    asked, so a bot can drive the game through a pipe. Output is buffered and
+    flushed whenever every command read so far has been answered, so pipelined
+    commands are answered in large writes and a lone command straight away.
+
+    Commands, "id" is optional and copied into the event answering the command:
+        {"cmd": "new", "rows": 16, "cols": 30, "mines": 99, "seed": 1, "id": 1}
+            starts a new game of at most MAX_CELLS cells, seed is optional
+        {"cmd": "show", "pos": 250}      reveals a cell, the first show places the mines
+        {"cmd": "flag", "pos": 250}      toggles a flag
+        {"cmd": "chord", "pos": 250}     reveals around a number with as many flags
+        {"cmd": "batch", "moves": [["show", 250], ["flag", 3]]}
+            plays the moves in order with Game.play, stopping at a loss
+        {"cmd": "state"}                 the whole board
+        {"cmd": "quit"}                  ends the session, as does the end of stdin
+    Events:
+        {"event": "ready", "protocol": "jsonl", "version": 1}     once at the start
+        {"event": "new", "rows": 16, "cols": 30, "mines": 99, "seed": 1}
+        {"event": "move", "changed": [pos, value, ...], "result": "playing"}
+            answers show, flag and chord, changed holds every cell whose Game.state
+            value changed followed by its new value, result is "playing", "won" or "lost"
+        {"event": "batch", "played": 2, "changed": [...], "result": "playing"}
+            played is the number of moves played before the batch stopped
+        {"event": "state", "rows": 16, "cols": 30, "board": [value, ...], "result": "playing"}
+        {"event": "metrics", "metrics": {...}}    after every finished game with --metrics
+        {"event": "error", "message": "..."}      for a command that could not be played
+        {"event": "bye"}
+"""
+
+import json
+import os
+
+from minesweeper.engine import Game, SHOW_MOVE, FLAG_MOVE, CHORD_MOVE
+
+VERSION = 1
+# bytes read from the input at a time, every complete line of a read is answered before the output is flushed
+READ_SIZE = 1 << 16
+# the largest board a new command may ask for, its Game takes about 45MB
+MAX_CELLS = 10**7
+# action names of the moves of a batch command
+BATCH_ACTIONS = {"show": SHOW_MOVE, "flag": FLAG_MOVE, "chord": CHORD_MOVE}
+
+# compact separators, and one encoder for every event instead of one per json.dumps call
+encode = json.JSONEncoder(separators=(",", ":")).encode
+decode = json.JSONDecoder().decode
+
+class Session(object):
+    """ Plays the commands of one protocol session on a Game
+
+        Attributes:
+            game (Game): the game being played, None before the first new command
+            boardPool: optional generator.BoardPool to take no-guess boards from
+            recordDir (str): optional directory the move log of every finished game is saved in
+            metrics: optional metrics.Metrics sent as an event after every finished game
+            finished (bool): True once the current game has been won or lost and reported
+            running (bool): False once the session has been told to quit
+    """
+    def __init__(self, boardPool = None, recordDir = None, metrics = None):
+        self.game = None
+        self.boardPool = boardPool
+        self.recordDir = recordDir
+        self.metrics = metrics
+        self.finished = False
+        self.running = True
+        self.handlers = {
+            "new": self.new,
+            "show": self.show,
+            "flag": self.flag,
+            "chord": self.chord,
+            "batch": self.batch,
+            "state": self.state,
+            "quit": self.quit,
+        }
+
+    # answers one line of input, returns the list of events to write
+    def handle(self, line):
+        try:
+            #decoding the bytes first spares json.loads guessing their encoding
+            command = decode(line.decode("utf-8"))
+            handler = self.handlers[command["cmd"]]
+        except (ValueError, TypeError, KeyError, RecursionError):
+            #json raises RecursionError for arrays and objects nested too deeply
+            return [{"event": "error", "message": "not a command: " + line.decode("utf-8", "replace").strip()}]
+        try:
+            events = handler(command)
+        except KeyError as error:
+            events = [{"event": "error", "message": "missing field " + str(error)}]
+        except (ValueError, TypeError) as error:
+            events = [{"event": "error", "message": str(error)}]
+        except MemoryError:
+            events = [{"event": "error", "message": "out of memory"}]
+        if "id" in command: events[0]["id"] = self.echo(command["id"])
+        return events
+
+    # returns the id to copy into an event, an id nested nearly as deep as json
+    # can decode may be one level too deep to encode and is replaced by None
+    def echo(self, id):
+        if type(id) is list or type(id) is dict:
+            try:
+                encode(id)
+            except RecursionError:
+                return None
+        return id
+
+    # returns the game, raises ValueError if no game has been started
+    def current(self):
+        if self.game is None: raise ValueError("no game, send a new command first")
+        return self.game
+
+    # returns the position of a move, raises ValueError if it is not a cell of the game
+    def position(self, pos):
+        if type(pos) is not int or not 0 <= pos < len(self.game.state):
+            raise ValueError("invalid position " + repr(pos))
+        return pos
+
+    def new(self, command):
+        rows, cols, mines = int(command["rows"]), int(command["cols"]), int(command["mines"])
+        if rows <= 0 or cols <= 0 or not 0 < mines < rows * cols:
+            raise ValueError("invalid board %dx%d with %d mines" % (rows, cols, mines))
+        if rows * cols > MAX_CELLS: raise ValueError("boards have at most %d cells" % MAX_CELLS)
+        seed = command.get("seed")
+        if seed is not None and type(seed) is not int: raise ValueError("invalid seed " + repr(seed))
+        self.game = Game(rows, cols, mines, seed, renderMode="quiet")
+        #the moves are only recorded to be saved
+        if self.recordDir is not None: self.game.recordMoves()
+        self.finished = False
+        if self.boardPool is not None: self.boardPool.prepare(rows, cols, mines)
+        return [{"event": "new", "rows": rows, "cols": cols, "mines": mines, "seed": self.game.seed}]
+
+    # places the mines with pos as the first cell revealed, like App.firstMove
+    def begin(self, pos):
+        game = self.game
+        mines = None
+        if self.boardPool is not None:
+            #falls back to a random board if no no-guess board is ready yet
+            mines = self.boardPool.take(game.row, game.col, game.minecount, pos)
+        game.start(pos, mines)
+
+    def show(self, command):
+        game = self.current()
+        pos = self.position(command["pos"])
+        if not game.started: self.begin(pos)
+        return self.moved(game.reveal(pos) if not game.isOver() else [])
+
+    def flag(self, command):
+        game = self.current()
+        pos = self.position(command["pos"])
+        return self.moved([pos] if not game.isOver() and game.toggleFlag(pos) else [])
+
+    def chord(self, command):
+        game = self.current()
+        pos = self.position(command["pos"])
+        return self.moved(game.chord(pos) if not game.isOver() else [])
+
+    # returns the events answering a single move that changed the given positions
+    def moved(self, changed):
+        state = self.game.state
+        flat = [0] * (2 * len(changed))
+        flat[0::2] = changed
+        flat[1::2] = [state[pos] for pos in changed]
+        result = self.result()
+        events = [{"event": "move", "changed": flat, "result": result}]
+        if result != "playing": events += self.ended()
+        return events
+
+    def batch(self, command):
+        game = self.current()
+        moves = []
+        for action, pos in command["moves"]:
+            if action not in BATCH_ACTIONS: raise ValueError("unknown move action " + repr(action))
+            moves.append((BATCH_ACTIONS[action], self.position(pos)))
+        if game.isOver(): moves = []
+        if not game.started:
+            #the mines are placed at the batch's first show, the flags before it do not depend on them
+            for action, pos in moves:
+                if action == SHOW_MOVE:
+                    self.begin(pos)
+                    break
+        played, diff = game.play(moves)
+        result = self.result()
+        events = [{"event": "batch", "played": played, "changed": diff.tolist(), "result": result}]
+        if result != "playing": events += self.ended()
+        return events
+
+    def state(self, command):
+        game = self.current()
+        return [{"event": "state", "rows": game.row, "cols": game.col, "board": list(game.state),
+                 "result": self.result()}]
+
+    def quit(self, command):
+        self.running = False
+        return [{"event": "bye"}]
+
+    # returns "won", "lost" or "playing"
+    def result(self):
+        game = self.game
+        if game.lost: return "lost"
+        if game.started and game.checkEnd(): return "won"
+        return "playing"
+
+    # returns the events sent once when the game has ended, saving its move log
+    def ended(self):
+        if self.finished: return []
+        self.finished = True
+        if self.recordDir is not None:
+            self.game.log.save(os.path.join(self.recordDir, "game-%d.mlog" % self.game.seed))
+        if self.metrics is None: return []
+        events = [{"event": "metrics", "metrics": self.metrics.snapshot()}]
+        self.metrics.reset()
+        return events
+
+# runs a session reading commands from the binary stream input and writing events to the binary stream output
+# every complete line of a read is answered before the events are written and flushed together
+def serve(input, output, boardPool = None, recordDir = None, metrics = None):
+    session = Session(boardPool, recordDir, metrics)
+    output.write((encode({"event": "ready", "protocol": "jsonl", "version": VERSION}) + "\n").encode())
+    output.flush()
+    #read1 returns what is already buffered or does a single read, so it only waits when nothing is left
+    read = getattr(input, "read1", input.read)
+    pending = b""
+    while session.running:
+        data = read(READ_SIZE)
+        if not data:
+            #the last line may have no newline
+            lines = [pending] if pending.strip() else []
+        else:
+            lines = (pending + data).split(b"\n")
+            pending = lines.pop()
+        events = []
+        for line in lines:
+            if not line.strip(): continue
+            events.extend(session.handle(line))
+            if not session.running: break
+        if events: output.write(("\n".join([encode(event) for event in events]) + "\n").encode())
+        output.flush()
+        if not data: break
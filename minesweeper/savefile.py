@@ -0,0 +1,218 @@
+""" Compact binary save format for a Game
+
+    A save file is a fixed size header followed by three bitplanes, one bit per
+    cell in position order (bit i % 8 of byte i // 8, least significant bit first):
+        mines       1 iff the cell is a mine
+        revealed    1 iff the cell has been revealed (including an exploded mine)
+        flags       1 iff the cell is flagged
+    Every bitplane takes ceil(rows * cols / 8) bytes, so an Expert board is saved
+    in 220 bytes and a 1000x1000 board in 375KB.
+
+    The header is, little endian:
+        magic       4s  b"MSWP"
+        version     H   VERSION
+        flags       H   HAS_SEED, STARTED, LOST
+        rows        I
+        cols        I
+        minecount   I
+        elapsed     d   seconds played before the game was saved
+        seed        q   the Game's seed, only meaningful if flags has HAS_SEED
+
+    SaveFile memory-maps a save so any cell can be looked up without reading the
+    rest of the file, load() unpacks a whole save back into a Game.
+"""
+
+import mmap
+import struct
+
+from minesweeper.engine import Game, UNKNOWN, FLAGGED, MINE
+
+MAGIC = b"MSWP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIdq")
+
+# bits of the header's flags field
+HAS_SEED = 1
+STARTED = 2
+LOST = 4
+
+# UNPACK[byte] is the 8 cells of a bitplane byte as one byte per cell, 0 or 1
+UNPACK = tuple([bytes([(byte >> bit) & 1 for bit in range(8)]) for byte in range(256)])
+# PACK[cells] is the inverse of UNPACK
+PACK = dict([(cells, byte) for byte, cells in enumerate(UNPACK)])
+
+# bytes.translate tables from Game.state to a 0/1 byte per cell
+REVEALED_TABLE = bytes([1 if value <= 8 or value == MINE else 0 for value in range(256)])
+FLAG_TABLE = bytes([1 if value == FLAGGED else 0 for value in range(256)])
+
+# tables used by buildState, from a cell's code to its state without the count
+# and to 255 for revealed numbers, whose count is added on top
+CODE_STATE = bytes([UNKNOWN, UNKNOWN, 0, MINE, FLAGGED, FLAGGED, 0, MINE] + [0] * 248)
+NUMBER_MASK = bytes([0, 0, 255, 0, 0, 0, 255, 0] + [0] * 248)
+
+class SaveError(Exception):
+    """ Raised when a file is not a save this module can read """
+
+# returns the bitplane of cells, a bytes-like object holding 0 or 1 per cell
+def packBits(cells):
+    size = len(cells)
+    cells = bytes(cells) + bytes(-size % 8)
+    return bytes([PACK[cells[i:i + 8]] for i in range(0, len(cells), 8)])
+
+# returns the first size cells of the bitplane plane as a bytearray holding 0 or 1 per cell
+def unpackBits(plane, size):
+    cells = bytearray(b"".join(map(UNPACK.__getitem__, plane)))
+    del cells[size:]
+    return cells
+
+# returns the number of bytes used by a bitplane of size cells
+def planeSize(size):
+    return (size + 7) // 8
+
+# returns the Game.state of cells from their 0/1 mines, revealed and flagged bytes
+# and their counts, all four laid out one byte per cell
+def buildState(mines, revealed, flagged, counts):
+    size = len(counts)
+    #state is built a whole byte array at a time: every cell gets a code
+    #mines + 2*revealed + 4*flagged, which is at most 7 per byte so the
+    #three arrays can be summed as big integers without carrying
+    code = (int.from_bytes(mines, "little") + 2 * int.from_bytes(revealed, "little")
+            + 4 * int.from_bytes(flagged, "little")).to_bytes(size, "little")
+    #hidden cells become UNKNOWN or FLAGGED and revealed mines MINE,
+    #revealed numbers become 0 and get their count added below
+    mask = int.from_bytes(code.translate(NUMBER_MASK), "little")
+    state = int.from_bytes(code.translate(CODE_STATE), "little") + (int.from_bytes(counts, "little") & mask)
+    return bytearray(state.to_bytes(size, "little"))
+
+# writes game to path, elapsed is the number of seconds played so far
+def save(game, path, elapsed = 0.0):
+    flags = 0
+    seed = 0
+    if isinstance(game.seed, int) and -2**63 <= game.seed < 2**63:
+        flags |= HAS_SEED
+        seed = game.seed
+    if game.started: flags |= STARTED
+    if game.lost: flags |= LOST
+    header = HEADER.pack(MAGIC, VERSION, flags, game.row, game.col, game.minecount, elapsed, seed)
+    with open(path, "wb") as output:
+        output.write(header)
+        output.write(packBits(game.mines))
+        output.write(packBits(game.state.translate(REVEALED_TABLE)))
+        output.write(packBits(game.state.translate(FLAG_TABLE)))
+
+class SaveFile(object):
+    """ Read-only memory-mapped view of a save file
+
+        Opening a SaveFile only reads the header, cells are read from the
+        mapping when they are looked up. Use it as a context manager or call
+        close() to release the file.
+
+        Attributes:
+            version (int): format version of the file
+            flags (int): HAS_SEED, STARTED and LOST bits
+            rows (int): number of rows of the board
+            cols (int): number of columns of the board
+            minecount (int): number of mines on the board
+            elapsed (float): seconds played before the game was saved
+            seed (int): the Game's seed, None if it had none
+            mines (memoryview): the mines bitplane
+            revealed (memoryview): the revealed bitplane
+            flagged (memoryview): the flags bitplane
+    """
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+        except ValueError:
+            #an empty file can't be mapped
+            self.file.close()
+            raise SaveError(path + " is not a minesweeper save")
+        try:
+            self.readHeader(path)
+        except SaveError:
+            self.close()
+            raise
+
+    def readHeader(self, path):
+        if len(self.map) < HEADER.size:
+            raise SaveError(path + " is not a minesweeper save")
+        magic, self.version, self.flags, self.rows, self.cols, self.minecount, \
+            self.elapsed, seed = HEADER.unpack_from(self.map)
+        if magic != MAGIC: raise SaveError(path + " is not a minesweeper save")
+        if self.version != VERSION:
+            raise SaveError(path + " has unsupported version " + str(self.version))
+        self.seed = seed if self.flags & HAS_SEED else None
+        size = planeSize(self.rows * self.cols)
+        if len(self.map) < HEADER.size + 3 * size:
+            raise SaveError(path + " is truncated")
+        view = memoryview(self.map)
+        self.mines = view[HEADER.size:HEADER.size + size]
+        self.revealed = view[HEADER.size + size:HEADER.size + 2 * size]
+        self.flagged = view[HEADER.size + 2 * size:HEADER.size + 3 * size]
+
+    def close(self):
+        for plane in ("mines", "revealed", "flagged"):
+            if hasattr(self, plane):
+                getattr(self, plane).release()
+                delattr(self, plane)
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def bit(self, plane, pos):
+        return (plane[pos >> 3] >> (pos & 7)) & 1
+
+    def isMine(self, pos):
+        return self.bit(self.mines, pos) == 1
+
+    def isRevealed(self, pos):
+        return self.bit(self.revealed, pos) == 1
+
+    def isFlagged(self, pos):
+        return self.bit(self.flagged, pos) == 1
+
+    def isStarted(self):
+        return bool(self.flags & STARTED)
+
+    def isLost(self):
+        return bool(self.flags & LOST)
+
+    # returns a Game holding the saved board, see load
+    def toGame(self, renderMode = "full"):
+        size = self.rows * self.cols
+        game = Game(self.rows, self.cols, self.minecount, self.seed, renderMode)
+        game.lost = self.isLost()
+        flagged = unpackBits(self.flagged, size)
+        if not self.isStarted():
+            #cells can be flagged before the first click, nothing else can have changed
+            empty = bytearray(size)
+            game.state = buildState(empty, empty, flagged, empty)
+            game.recount()
+            return game
+        mines = unpackBits(self.mines, size)
+        revealed = unpackBits(self.revealed, size)
+        pos = mines.find(1)
+        layout = []
+        while pos != -1:
+            layout.append(pos)
+            pos = mines.find(1, pos + 1)
+        game.placeMines(layout)
+        #only the revealed cells need their mines counted
+        pos = revealed.find(1)
+        while pos != -1:
+            game.count(pos)
+            pos = revealed.find(1, pos + 1)
+        game.state = buildState(mines, revealed, flagged, game.counts)
+        game.recount()
+        return game
+
+# reads the save at path
+# returns (game, elapsed), the restored Game and the seconds played before it was saved
+def load(path, renderMode = "full"):
+    with SaveFile(path) as saved:
+        return saved.toGame(renderMode), saved.elapsed
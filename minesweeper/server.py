@@ -0,0 +1,273 @@
+""" asyncio game server hosting many independent Game sessions
+
+    Clients talk to the server over TCP or a Unix socket with one JSON object
+    per line in each direction. A connection can hold any number of sessions and
+    may send requests without waiting for the replies, which come back in order.
+    Every request may carry an "id" that is copied into its reply.
+
+    Requests:
+        {"op": "new", "rows": R, "cols": C, "mines": M, "seed": S}
+            starts a session, seed is optional; replies {"session": N}
+        {"op": "show", "session": N, "pos": P}
+            reveals P, the first show of a session places the mines
+        {"op": "flag", "session": N, "pos": P}
+            toggles the flag on P
+        {"op": "chord", "session": N, "pos": P}
+            reveals around the revealed number P if it has as many flags around it
+        {"op": "board", "session": N}
+            replies the whole Game.state as "state", a list with a value per cell
+        {"op": "close", "session": N}
+            ends the session
+    show, flag and chord reply {"cells": [pos, value, pos, value, ...], "lost": bool, "won": bool}
+    with the Game.state value of every cell the move changed.
+    A request that fails replies {"error": message}.
+
+    A session's board has at most MAX_CELLS cells, so no single move keeps the
+    event loop from the other connections for long, and the boards of all the
+    open sessions together have at most maxCells cells.
+
+    Sessions that get no request for idleTimeout seconds are closed. A connection
+    is only read while its replies can be written, so a client that stops reading
+    stops being served instead of filling the server's memory.
+
+    Usage: python -m minesweeper.server [--host HOST] [--port PORT] [--unix PATH]
+                                        [--idle-timeout SECONDS] [--max-sessions N] [--max-cells N]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from minesweeper.engine import Game, neighbourTable
+
+# the longest request line accepted, in bytes
+MAX_LINE = 64 * 1024
+# the largest board a session may ask for, a first click cascading over the
+# whole of a 100x100 board takes about 12ms, a 150x150 one about 100ms
+MAX_CELLS = 100 * 100
+# board shapes (rows, cols) whose neighbourTable is built when the server starts,
+# sessions of any other shape never build one since that would stall the event loop
+TABLE_SHAPES = ((9, 9), (16, 16), (16, 30))
+
+class RequestError(Exception):
+    """ Raised for a request that can't be served, its message is sent back to the client """
+
+# compact separators, and one encoder for every reply instead of one per json.dumps call
+encode = json.JSONEncoder(separators=(",", ":")).encode
+
+# returns the request decoded from a line, raises RequestError if it is not JSON
+def decode(line):
+    try:
+        return json.loads(line)
+    except (ValueError, RecursionError):
+        #json raises RecursionError for arrays and objects nested too deeply
+        raise RequestError("invalid JSON")
+
+class Session(object):
+    """ A Game being played on the server
+
+        Only the Game and the time of the last request are kept per session,
+        the Game itself takes 4 bytes per cell.
+
+        Attributes:
+            game (Game): the game of the session
+            lastActive (float): time.monotonic() of the last request for the session
+    """
+    __slots__ = ("game", "lastActive")
+
+    def __init__(self, game):
+        self.game = game
+        self.lastActive = time.monotonic()
+
+class Server(object):
+    """ Serves the JSON lines protocol described in the module docstring
+
+        Attributes:
+            sessions (dict): session number to Session
+            nextId (int): number of the next session
+            idleTimeout (float): seconds without a request before a session is closed
+            maxSessions (int): most sessions open at once
+            maxCells (int): most cells on the boards of all the open sessions together
+            cells (int): number of cells on the boards of the open sessions
+            moves (int): number of show, flag and chord requests served
+            tables (dict): (rows, cols) to the neighbourTable shared by the sessions of TABLE_SHAPES
+    """
+    def __init__(self, idleTimeout = 300.0, maxSessions = 100000, maxCells = 10**7):
+        self.sessions = {}
+        self.nextId = 1
+        self.idleTimeout = idleTimeout
+        self.maxSessions = maxSessions
+        self.maxCells = maxCells
+        self.cells = 0
+        self.moves = 0
+        self.tables = dict([(shape, neighbourTable(*shape)) for shape in TABLE_SHAPES])
+        self.ops = {
+            "new": self.new,
+            "show": self.show,
+            "flag": self.flag,
+            "chord": self.chord,
+            "board": self.board,
+            "close": self.close,
+        }
+
+    # returns the encoded reply line to the encoded request line
+    def dispatch(self, line):
+        request = None
+        try:
+            request = decode(line)
+            if not isinstance(request, dict): raise RequestError("a request must be a JSON object")
+            #a list or object would not be hashable, so only strings are looked up
+            op = request.get("op")
+            op = self.ops.get(op) if type(op) is str else None
+            if op is None: raise RequestError("unknown op " + repr(request.get("op")))
+            reply = op(request)
+        except RequestError as error:
+            reply = {"error": str(error)}
+        except Exception as error:
+            #a request that breaks the server fails alone, not the connection and the sessions on it
+            reply = {"error": "could not serve the request: " + type(error).__name__}
+        if isinstance(request, dict) and "id" in request: reply["id"] = request["id"]
+        try:
+            return (encode(reply) + "\n").encode()
+        except RecursionError:
+            #an id nested nearly as deep as json can decode may be one level too deep to encode
+            return (encode({"error": "id nested too deeply to send back"}) + "\n").encode()
+
+    # returns the integer field of request, which must be in [low, high)
+    def field(self, request, name, low, high):
+        value = request.get(name)
+        if type(value) is not int or not low <= value < high:
+            raise RequestError(name + " must be an integer in [%d, %d)" % (low, high))
+        return value
+
+    # returns the Session named by request and marks it active
+    def session(self, request):
+        sessionId = request.get("session")
+        session = self.sessions.get(sessionId) if type(sessionId) is int else None
+        if session is None: raise RequestError("no session " + repr(request.get("session")))
+        session.lastActive = time.monotonic()
+        return session
+
+    def new(self, request):
+        if len(self.sessions) >= self.maxSessions: raise RequestError("too many sessions")
+        rows = self.field(request, "rows", 1, MAX_CELLS + 1)
+        cols = self.field(request, "cols", 1, MAX_CELLS // rows + 1)
+        mines = self.field(request, "mines", 0, rows * cols)
+        if self.cells + rows * cols > self.maxCells: raise RequestError("too many cells in play")
+        seed = request.get("seed")
+        if seed is not None and type(seed) is not int: raise RequestError("seed must be an integer")
+        sessionId = self.nextId
+        self.nextId += 1
+        neighbours = self.tables.get((rows, cols), False)
+        self.sessions[sessionId] = Session(Game(rows, cols, mines, seed, renderMode="quiet", neighbours=neighbours))
+        self.cells += rows * cols
+        return {"session": sessionId}
+
+    # plays move on the Game of the session named by request
+    # move(game, pos) returns the list of positions it changed
+    def play(self, request, move):
+        game = self.session(request).game
+        pos = self.field(request, "pos", 0, len(game.state))
+        if game.isOver(): raise RequestError("the game is over")
+        self.moves += 1
+        state = game.state
+        cells = []
+        for changed in move(game, pos):
+            cells.append(changed)
+            cells.append(state[changed])
+        return {"cells": cells, "lost": game.lost, "won": game.isWon()}
+
+    def show(self, request):
+        def reveal(game, pos):
+            if not game.started: game.start(pos)
+            return game.reveal(pos)
+        return self.play(request, reveal)
+
+    def flag(self, request):
+        def toggle(game, pos):
+            return [pos] if game.toggleFlag(pos) else []
+        return self.play(request, toggle)
+
+    def chord(self, request):
+        return self.play(request, lambda game, pos: game.chord(pos))
+
+    def board(self, request):
+        return {"state": list(self.session(request).game.state)}
+
+    def close(self, request):
+        self.drop(request["session"], self.session(request))
+        return {}
+
+    # forgets the session and gives its cells back to the budget
+    def drop(self, sessionId, session):
+        del self.sessions[sessionId]
+        self.cells -= len(session.game.state)
+
+    # serves one connection until the client closes it
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    #the line went over MAX_LINE, the rest of the stream can't be trusted
+                    writer.write(b'{"error":"request too long"}\n')
+                    break
+                if not line: break
+                writer.write(self.dispatch(line))
+                #waits only while the client is not reading its replies
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # closes the sessions that have been idle for longer than idleTimeout
+    # returns the number of sessions closed
+    def reap(self):
+        oldest = time.monotonic() - self.idleTimeout
+        idle = [(sessionId, session) for sessionId, session in self.sessions.items() if session.lastActive < oldest]
+        for sessionId, session in idle:
+            self.drop(sessionId, session)
+        return len(idle)
+
+    async def reapForever(self):
+        while True:
+            await asyncio.sleep(max(self.idleTimeout / 4, 0.1))
+            self.reap()
+
+    # listens on the Unix socket path if one is given, otherwise on host:port
+    async def serve(self, host = "127.0.0.1", port = 8765, path = None):
+        if path is not None: server = await asyncio.start_unix_server(self.handle, path, limit = MAX_LINE)
+        else: server = await asyncio.start_server(self.handle, host, port, limit = MAX_LINE)
+        reaper = asyncio.ensure_future(self.reapForever())
+        try:
+            #the reaper never returns, so connections are served until this is cancelled
+            await reaper
+        finally:
+            reaper.cancel()
+            server.close()
+            await server.wait_closed()
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog="python -m minesweeper.server", description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="seconds before an idle session is closed")
+    parser.add_argument("--max-sessions", type=int, default=100000)
+    parser.add_argument("--max-cells", type=int, default=10**7, help="most cells on the boards of all sessions")
+    args = parser.parse_args(argv)
+    server = Server(args.idle_timeout, args.max_sessions, args.max_cells)
+    #a loop of its own rather than asyncio.run, which needs Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.close()
+
+if __name__ == "__main__":
+    main()
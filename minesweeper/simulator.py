@@ -0,0 +1,161 @@
+""" Headless batch simulator for minesweeper.Game
+
+    Plays many seeded games without any printing or input() across a process pool
+    and reports the aggregate win rate, moves per game and games per second.
+    Game n of a run uses seed + n, so any run can be reproduced exactly.
+
+    A move policy is a function policy(game, rng) that returns a move as a tuple
+    ("show", pos) or ("flag", pos). It is called before every move, including the
+    first one, and rng is a random.Random seeded from the game seed. Policies must be
+    module level functions so they can be sent to the worker processes.
+
+    Usage: python -m minesweeper.simulator [-n GAMES] [--rows R] [--cols C] [--mines M]
+                                               [--workers W] [--seed S] [--policy NAME|module:function]
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import random
+import time
+from minesweeper.engine import Game, UNKNOWN
+
+def randomPolicy(game, rng):
+    """ Shows a random unknown cell """
+    while True:
+        pos = rng.randrange(game.row * game.col)
+        if game.state[pos] == UNKNOWN: return ("show", pos)
+
+def cornerPolicy(game, rng):
+    """ Opens in the top left corner, then shows random unknown cells """
+    if game.numChecked == 0: return ("show", 0)
+    return randomPolicy(game, rng)
+
+POLICIES = {
+    "random": randomPolicy,
+    "corner": cornerPolicy,
+}
+
+def loadPolicy(name):
+    """ Returns the policy registered as name in POLICIES,
+        or the function named by a "module:function" string
+    """
+    if name in POLICIES: return POLICIES[name]
+    module, sep, function = name.partition(":")
+    if not sep: raise ValueError("Unknown policy: " + name)
+    return getattr(importlib.import_module(module), function)
+
+def playGame(rows, cols, mines, seed, policy, maxMoves = None):
+    """ Plays one game with the given policy
+        Returns (won, moves) where moves counts every show and flag action taken
+    """
+    game = Game(rows, cols, mines, seed)
+    rng = random.Random(str(seed) + "/policy")
+    if maxMoves is None: maxMoves = 4 * rows * cols
+    started = False
+    moves = 0
+    while moves < maxMoves:
+        action, pos = policy(game, rng)
+        moves += 1
+        if action == "flag":
+            game.toggleFlag(pos)
+            continue
+        if not started:
+            game.start(pos)
+            started = True
+        game.reveal(pos)
+        if game.lost: return (False, moves)
+        if game.checkEnd(): return (True, moves)
+    return (False, moves)
+
+def playBatch(task):
+    """ Worker entry point, plays count games starting at seed
+        Returns (games, wins, moves) so only three numbers travel back per batch
+    """
+    rows, cols, mines, seed, count, policy = task
+    wins = 0
+    moves = 0
+    for n in range(count):
+        won, taken = playGame(rows, cols, mines, seed + n, policy)
+        wins += won
+        moves += taken
+    return (count, wins, moves)
+
+class Results(object):
+    def __init__(self):
+        """ Attributes:
+                self.games: number of games played
+                self.wins: number of games won
+                self.moves: total number of moves over all games
+                self.elapsed: wall clock seconds taken by the run
+        """
+        self.games = 0
+        self.wins = 0
+        self.moves = 0
+        self.elapsed = 0.0
+
+    def add(self, batch):
+        """ Adds the (games, wins, moves) totals of a finished batch """
+        self.games += batch[0]
+        self.wins += batch[1]
+        self.moves += batch[2]
+
+    def winRate(self):
+        return self.wins / self.games if self.games else 0.0
+
+    def movesPerGame(self):
+        return self.moves / self.games if self.games else 0.0
+
+    def gamesPerSecond(self):
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return ("games: %d  win rate: %.4f  moves/game: %.2f  games/s: %.1f"
+                % (self.games, self.winRate(), self.movesPerGame(), self.gamesPerSecond()))
+
+def batches(rows, cols, mines, games, seed, policy, batchSize):
+    """ Yields the worker tasks for a run, batchSize games at a time """
+    for start in range(0, games, batchSize):
+        yield (rows, cols, mines, seed + start, min(batchSize, games - start), policy)
+
+def simulate(games, rows = 16, cols = 30, mines = 99, policy = randomPolicy,
+             workers = None, seed = 0, batchSize = 200, progress = None):
+    """ Plays games seeded games across a pool of workers processes
+        (defaults to one per core) and returns a Results object.
+        Batches are reduced into the Results as soon as they finish, so memory
+        does not grow with the number of games.
+        progress, if given, is called with the Results after every batch.
+    """
+    results = Results()
+    startTime = time.perf_counter()
+    tasks = batches(rows, cols, mines, games, seed, policy, batchSize)
+    if workers == 1:
+        for task in tasks:
+            results.add(playBatch(task))
+            if progress is not None: progress(results)
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for batch in pool.imap_unordered(playBatch, tasks):
+                results.add(batch)
+                if progress is not None: progress(results)
+    results.elapsed = time.perf_counter() - startTime
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-n", "--games", type=int, default=10000)
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--mines", type=int, default=99)
+    parser.add_argument("--workers", type=int, default=None, help="default: one per core")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--policy", default="random", help="one of " + ", ".join(POLICIES) + " or module:function")
+    args = parser.parse_args()
+
+    results = simulate(args.games, args.rows, args.cols, args.mines, loadPolicy(args.policy),
+                       args.workers, args.seed, args.batch_size)
+    print(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+""" Constraint propagation auto-solver for minesweeper.Game
+
+    The Solver keeps an incremental frontier, the hidden cells next to revealed
+    numbers, and the set of revealed numbers that still touch hidden cells.
+    Both are updated from the cells each reveal changes instead of rescanning
+    Game.state, and only the numbers around a change are looked at again.
+
+    Each deduction step applies two rules:
+        - a number whose remaining mines is 0 makes all its hidden neighbours safe,
+          and one whose remaining mines equals its hidden neighbours makes them all mines
+        - for two numbers A and B where A's hidden neighbours are a subset of B's,
+          the cells only B sees hold exactly (B's remaining - A's remaining) mines
+    Safe cells are opened and mines are flagged on the Game, and the Solver stops
+    once neither rule finds anything, i.e. when the next move has to be a guess.
+
+    The subset rule only runs when the first rule finds nothing, and then scans
+    every number that changed since it last ran, so its cost is spread unevenly:
+    most steps take tens of microseconds, and the slowest look at about 150 stale
+    numbers on Expert. Each number's constraint is worked out once per scan and
+    each pair compared once, which keeps that to at most about 40 constraints
+    (see benchmarks/solver.py for the step times).
+"""
+
+from minesweeper.engine import UNKNOWN, FLAGGED, MINE
+
+class Solver(object):
+    def __init__(self, game):
+        """ Attributes:
+                self.game: the Game being solved
+                self.frontier: set of hidden unflagged cells next to a revealed number
+                self.active: set of revealed numbers that still have hidden neighbours
+                self.dirty: numbers to check with the single cell rule
+                self.stale: numbers to check with the subset rule
+                self.steps: number of deduction steps that found a move
+            Any cells already revealed on the Game are picked up here,
+            everything after that is fed in through self.update()
+        """
+        self.game = game
+        self.frontier = set()
+        self.active = set()
+        self.dirty = set()
+        self.stale = set()
+        self.steps = 0
+        revealed = [pos for pos, value in enumerate(game.state) if value <= 8]
+        self.update(revealed)
+
+    def update(self, changed):
+        """ Updates the frontier from a list of newly revealed positions
+            i.e. the list returned by Game.reveal()
+        """
+        state = self.game.state
+        adjacent = self.game.adjacent
+        for pos in changed:
+            self.frontier.discard(pos)
+            if state[pos] == MINE: continue
+            hidden = False
+            for adj in adjacent(pos):
+                value = state[adj]
+                if value == UNKNOWN:
+                    self.frontier.add(adj)
+                    hidden = True
+                elif 0 < value <= 8:
+                    #a neighbouring number just lost a hidden cell
+                    self.dirty.add(adj)
+                    self.stale.add(adj)
+            if hidden and state[pos] > 0:
+                self.active.add(pos)
+                self.dirty.add(pos)
+                self.stale.add(pos)
+
+    def flagMine(self, pos):
+        """ Flags pos on the Game as a mine and marks the numbers around it for rechecking """
+        game = self.game
+        if game.state[pos] != UNKNOWN: return
+        game.toggleFlag(pos)
+        self.frontier.discard(pos)
+        for adj in game.adjacent(pos):
+            if 0 < game.state[adj] <= 8:
+                self.dirty.add(adj)
+                self.stale.add(adj)
+
+    def constraint(self, pos):
+        """ Returns (hidden, remaining) for the revealed number at pos
+            hidden: frozenset of its hidden unflagged neighbours
+            remaining: number of mines among them
+        """
+        state = self.game.state
+        hidden = []
+        remaining = state[pos]
+        for adj in self.game.adjacent(pos):
+            value = state[adj]
+            if value == UNKNOWN: hidden.append(adj)
+            elif value == FLAGGED: remaining -= 1
+        return frozenset(hidden), remaining
+
+    def singleRule(self):
+        """ Checks the dirty numbers on their own
+            Returns (safe, mines) sets of the cells found, stopping at the first find
+        """
+        while self.dirty:
+            pos = self.dirty.pop()
+            hidden, remaining = self.constraint(pos)
+            if not hidden:
+                self.active.discard(pos)
+            elif remaining == 0:
+                return hidden, ()
+            elif remaining == len(hidden):
+                return (), hidden
+        return (), ()
+
+    def subsetRule(self):
+        """ Compares each stale number with the active numbers that share hidden cells with it
+            Returns (safe, mines) sets of the cells found, stopping at the first find
+        """
+        adjacent = self.game.adjacent
+        active = self.active
+        #the Game does not change during the scan, so each number's constraint is worked out once
+        constraints = {}
+        #both ways of a pair are compared at once, so numbers already scanned are not compared again
+        scanned = set()
+        while self.stale:
+            pos = self.stale.pop()
+            if pos not in active: continue
+            scanned.add(pos)
+            if pos not in constraints: constraints[pos] = self.constraint(pos)
+            hidden, remaining = constraints[pos]
+            if not hidden: continue
+            #every number that shares a hidden cell with pos is next to one of them
+            others = set()
+            for cell in hidden:
+                for adj in adjacent(cell):
+                    if adj in active and adj not in scanned: others.add(adj)
+            for other in others:
+                if other not in constraints: constraints[other] = self.constraint(other)
+                otherHidden, otherRemaining = constraints[other]
+                for small, smallRemaining, big, bigRemaining in (
+                        (hidden, remaining, otherHidden, otherRemaining),
+                        (otherHidden, otherRemaining, hidden, remaining)):
+                    if small < big:
+                        extra = big - small
+                        mines = bigRemaining - smallRemaining
+                        if mines == 0: return extra, ()
+                        if mines == len(extra): return (), extra
+        return (), ()
+
+    def step(self):
+        """ Runs one deduction step and applies what it found to the Game
+            Returns the number of cells opened or flagged, 0 means a guess is needed
+        """
+        game = self.game
+        if game.lost or game.checkEnd(): return 0
+        safe, mines = self.singleRule()
+        if not safe and not mines: safe, mines = self.subsetRule()
+        if not safe and not mines: return 0
+        for pos in mines: self.flagMine(pos)
+        for pos in safe: self.update(game.reveal(pos))
+        self.steps += 1
+        return len(safe) + len(mines)
+
+    def solve(self):
+        """ Runs deduction steps until the game is over or a guess is needed
+            Returns True iff the game has been won
+        """
+        while self.step(): pass
+        return self.game.checkEnd() and not self.game.lost
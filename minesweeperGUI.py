@@ -1,140 +1,318 @@
 # Author: Jay Song
 # Date: May 3, 2018
 
-import random
+import os
+import sys
 import time
+from collections import deque
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
+from minesweeper import Game, UNKNOWN, FLAGGED, MINE
+from minesweeper.engine import START_MOVE, SHOW_MOVE, FLAG_MOVE, CHORD_MOVE
+from minesweeper.savefile import SaveError
+from minesweeper.movelog import MoveLog
+
+# width and height in pixels of every tile image, and of every smiley image
+TILE_SIZE = 20
+SMILE_SIZE = 30
+
+# the images directory sits next to this file, or next to the executable built by setup.py,
+# so the game starts from any working directory
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(sys.executable if getattr(sys, "frozen", False) else __file__)),
+                         "images")
+# every image of the GUI in one file: the 14 tiles side by side on the top row,
+# the 5 smileys side by side below them, see images/buildsheet.py
+SPRITE_SHEET = os.path.join(IMAGE_DIR, "sprites.gif")
+
+# index in Tile.images to show for each Game.state value:
+# revealed numbers show their own number, hidden cells the button,
+# flagged cells the flag and a mine revealed by a click the exploded mine
+STATE_IMAGES = tuple(range(9)) + (10, 11, 13)
+
+# longest time in seconds a Board paints revealed Tiles before letting Tk handle other events,
+# the rest of a large cascade is painted in the following slices
+PAINT_SLICE = 0.008
+
+# largest minefield in pixels a ViewportBoard shows at once, larger boards scroll
+MAX_VIEW_WIDTH = 1200
+MAX_VIEW_HEIGHT = 640
+# cells on every side of the view that a ViewportBoard keeps Tiles for, so short scrolls move no Tiles
+VIEW_MARGIN = 4
+# rows or columns scrolled by one turn of the mouse wheel
+WHEEL_UNITS = 3
+# room in pixels taken by a scrollbar next to the view
+SCROLLBAR_SIZE = 20
+# longest side in pixels of the minimap of a ViewportBoard
+MINIMAP_SIZE = 160
+# colour of each Game.state value on the minimap: revealed cells light,
+# hidden cells dark, flags red and a mine revealed by a click black
+MINIMAP_COLOURS = ("#e0e0e0",) * 9 + ("#707070", "#ff0000", "#000000")
+
+def heatPercent(probability):
+    """ Returns the whole percentage the heat map shows for a mine probability, None for None """
+    if probability is None: return None
+    return int(round(100 * probability))
+
+def heatColour(percent):
+    """ Returns the colour of a mine probability of percent in the heat map,
+        from green for a safe cell through yellow to red for a certain mine
+    """
+    red = min(255, percent * 255 // 50)
+    green = min(255, (100 - percent) * 255 // 50)
+    return "#%02x%02x00" % (red, green)
  
-class Tile(tk.Label):
-    # images[] is a Tile class variable which will hold all the images needed by a Tile
+class Sprites(object):
+    """ Decodes the sprite sheet once and hands out the tile and smiley images cut from it
+        Images scaled up for zoomed boards are cut the first time they are asked for,
+        every list of images is kept and shared by all the Boards
+        Attributes:
+            path: file of the sprite sheet
+            sheet: PhotoImage of the whole sheet, None until the first images are asked for
+            cache: dict of (kind, zoom) to the list of PhotoImages of that kind and zoom
+    """
+    def __init__(self, path=SPRITE_SHEET):
+        self.path = path
+        self.sheet = None
+        self.cache = {}
+
+    def cut(self, x, y, size, zoom):
+        """ Returns a new PhotoImage of the size x size square of the sheet at (x, y), zoom times larger """
+        if self.sheet is None: self.sheet = tk.PhotoImage(file=self.path)
+        image = tk.PhotoImage()
+        image.tk.call(image, "copy", self.sheet, "-from", x, y, x+size, y+size, "-zoom", zoom, zoom)
+        return image
+
+    def images(self, kind, zoom=1):
+        """ Returns the list of images of kind "tile" or "smile" at the given whole number zoom """
+        key = (kind, zoom)
+        if key not in self.cache:
+            if kind == "tile": self.cache[key] = [self.cut(i*TILE_SIZE, 0, TILE_SIZE, zoom) for i in range(14)]
+            else: self.cache[key] = [self.cut(i*SMILE_SIZE, TILE_SIZE, SMILE_SIZE, zoom) for i in range(5)]
+        return self.cache[key]
+
+# the Sprites every Board takes its images from
+SPRITES = Sprites()
+
+def loadTileImages(zoom=1):
+    """ Fills TileView.images with the tile images at the given zoom and sets TileView.size to match """
+    TileView.images[:] = SPRITES.images("tile", zoom)
+    TileView.size = TILE_SIZE * zoom
+
+def windowSize(rows, cols):
+    """ Returns the (width, height) strings of the window fitting a rows x cols Board at the current zoom """
+    zoom = TileView.size // TILE_SIZE
+    return str(TileView.size*cols+40), str(TileView.size*rows+SMILE_SIZE*zoom+30)
+
+class MoveEvent(object):
+    """ Stand-in for the tkinter event of a mouse click, used to play recorded moves """
+    def __init__(self, widget, num):
+        self.widget = widget
+        self.num = num
+
+class TileView(object):
+    # the on-screen part of a single tile, shared by the Label based Tile
+    # and the CanvasTile drawn by a CanvasBoard
+    # the state of the cell itself is kept by the Board's Game
+    # images[] is a class variable which will hold all the images needed by a Tile
     #   [0] is empty background
     #   [1] to [8] are the numbers
     #   [9] is a mine, [10] is empty button, [11] is flag
     #   [12] is incorrect flag, [13] is exploded mine
+    # size is the width and height in pixels of those images, see loadTileImages
     images = []
+    size = TILE_SIZE
         
-    def __init__(self, parent, row, col):
+    def __init__(self, board, row, col):
         """ Attributes:
-                self.shown: boolean that is True when Tile has been revealed
-                self.mine: boolean that is True if the Tile is a mine
-                self.flag: boolean that is True if the Tile has been flagged
-                self.inPlay: boolean that is True if the game is in play
-                self.count: Integer for number of adjacent mine Tiles (-1 if mine)
-                self.numFlags: Integer for number of adjacent Flagged Tiles
-                self.parent: the parent element (should be a Board)
+                self.board: the Board the Tile belongs to
+                self.row/self.col: position of the Tile on the Board
+                self.pos: position of the Tile's cell in the Board's Game
+                self.image: index in Tile.images of the image currently shown
+                self.percent: mine probability in percent shown over the Tile, or None
         """
-        tk.Label.__init__(self,parent)
-        #set up instance variables
+        self.board = board
         self.row = row
         self.col = col
-        self.shown = False
-        self.mine = False
-        self.flag = False
-        self.inPlay = True
-        self.count = 0
-        self.numFlags = 0
-        self.configure(image=Tile.images[10], padx=0, pady=0, borderwidth=0)
-    
-    def replay(self):
-        """ Resets the Tile to for the game to be restarted """
-        self.shown = False
-        self.mine = False
-        self.flag = False
-        self.inPlay = True
-        self.count = 0
-        self.numFlags = 0
-        self.configure(image=Tile.images[10])
+        self.pos = row * board.cols + col
+        self.image = 10
+        self.percent = None
+
+    def draw(self, index):
+        """ Shows Tile.images[index] on the Tile
+            The image is only repainted if index differs from the image already shown,
+            each repaint is counted in the Board's drawCount
+            and the Tile is recorded in the Board's set of changed tiles
+        """
+        if index != self.image:
+            self.image = index
+            self.paint(self.images[index])
+            self.board.drawCount += 1
+            self.board.changed.add(self)
+
+    def paint(self, image):
+        """ Puts the given PhotoImage on screen, defined by the renderer specific subclasses """
+        raise NotImplementedError
 
-    def setMine(self):
-        """ Sets the Tile as a mine
-            self.count attribute is changed to 9, index of the mine image in Tile.images
-            marks self.mine boolean attribute to be true
+    def moveTo(self, row, col, index=10):
+        """ Reuses the Tile for the cell at (row, col) of its Board, showing Tile.images[index],
+            a fresh hidden cell by default
+            A Tile left showing another image is recorded in the Board's set of changed tiles
         """
-        self.count = 13
-        self.mine = True
+        if (row, col) != (self.row, self.col):
+            self.row = row
+            self.col = col
+            self.reposition()
+        self.pos = row * self.board.cols + col
+        if self.image != index:
+            self.image = index
+            self.paint(self.images[index])
+        if index != 10: self.board.changed.add(self)
+        self.shade(None)
+
+    def reposition(self):
+        """ Puts the Tile at its row and col on screen, defined by the renderer specific subclasses """
+        raise NotImplementedError
+
+    def shade(self, percent):
+        """ Shows the mine probability percent over the Tile, None removes it
+            The overlay is only repainted if percent differs from the one already shown
+        """
+        if percent != self.percent:
+            self.percent = percent
+            self.paintShade(percent)
+
+    def paintShade(self, percent):
+        """ Puts the probability overlay on screen, defined by the renderer specific subclasses """
+        raise NotImplementedError
+
+    def refresh(self):
+        """ Draws the image matching the current Game state of the Tile's cell, see Board.imageOf """
+        self.draw(self.board.imageOf(self.pos))
 
     def buttonPress(self):
         """ Changes the image to pressed button, Tile.images[0]
-            Only works for Tiles that are in play (self.inPlay == True)
+            Only works for hidden Tiles that are in play (self.isInPlay() == True)
         """
-        if self.inPlay and not self.shown:
-            self.configure(image = Tile.images[0])
-        
-    def setFlag(self):
-        """ Toggles the flag on the tile if it is still unknown and in play
-            self.flag boolean attribute is toggled
-            Returns 1 if flag is toggled on and -1 if flag is toggled off
-            Returns 0 if flag was not toggled
-        """
-        if self.inPlay and not self.shown:
-            self.flag = not(self.flag)
-            image_index = 11 if self.flag else 10
-            self.configure(image = Tile.images[image_index])
-            return 1 if self.flag else -1
-        return 0
-            
-    def setCount(self, num):
-        """ A function used to set self.count
-            used by Board
-        """
-        self.count=num
-    
-    def show(self):
-        """ Removes the self.button myLabel() that has been hiding the value/mine
-            Has no effect on Tiles that are already being shown
-            Calls self.showAround() to cascade if self.count == 0
-            Returns -1 if one or more of the revealed Tiles is a Mine.
-            Returns the number of Tiles revealed by it as an Integer.
-        """
-        if not self.shown and not self.flag:
-            self.shown = True
-            self.configure(image=Tile.images[self.count])
-            return -1 if self.mine else 1
-        return 0
-
-    def isZero(self):
-        """ returns True only if the Tile has count 0
-            i.e. it has no mines adjacent to it
-        """
-        return self.count == 0
-    
+        if self.isInPlay() and self.board.game.state[self.pos] == UNKNOWN:
+            self.draw(0)
+
     def isShown(self):
-        """ returns self.shown which is True if the Tile is revealed """
-        return self.shown
+        """ returns True if the Tile has been revealed """
+        value = self.board.game.state[self.pos]
+        return value <= 8 or value == MINE
     
     def isMine(self):
-        """ returns self.mine which is True if the Tile is a mine """
-        return self.mine
+        """ returns True if the Tile is a mine """
+        return self.board.game.mines[self.pos] == 1
     
     def isFlagged(self):
-        """ returns true iff shown is 10 i.e. the square is flagged as a mine """
-        return self.flag
+        """ returns True if the Tile has been flagged """
+        return self.board.game.state[self.pos] == FLAGGED
 
     def isInPlay(self):
-        """ returns self.inPlay which is True when the game is being played """
-        return self.inPlay
+        """ returns the Board's inPlay which is True when the game is being played """
+        return self.board.inPlay
+
+class Tile(TileView, tk.Label):
+    def __init__(self, parent, row, col):
+        """ A Tile drawn as its own Label widget, placed on the Board's grid
+            parent: the Board the Tile belongs to
+        """
+        tk.Label.__init__(self,parent)
+        TileView.__init__(self, parent, row, col)
+        self.configure(image=Tile.images[10], padx=0, pady=0, borderwidth=0)
+
+    def paint(self, image):
+        """ Reconfigures the Label to show the given image """
+        self.configure(image=image)
+
+    def reposition(self):
+        """ Puts the Label in its cell of the Board's grid, below the row of counters """
+        self.grid(row=self.row+1, column=self.col)
+
+    def paintShade(self, percent):
+        """ Writes the percentage over the Label's image in its heat map colour """
+        if percent is None: self.configure(text="")
+        else: self.configure(text=str(percent), compound="center", fg=heatColour(percent), font=("TkDefaultFont", 7))
+
+class CanvasTile(TileView):
+    def __init__(self, board, row, col):
+        """ A Tile drawn as an image item on its CanvasBoard's canvas
+            self.item: id of the Tile's image item on board.canvas
+        """
+        TileView.__init__(self, board, row, col)
+        self.item = board.canvas.create_image(col*self.size, row*self.size, image=Tile.images[10], anchor="nw")
+        self.shadeItem = None
+
+    def paint(self, image):
+        """ Changes the image of the Tile's canvas item """
+        self.board.canvas.itemconfigure(self.item, image=image)
+
+    def reposition(self):
+        """ Moves the Tile's canvas items to its row and col """
+        x, y = self.col*self.size, self.row*self.size
+        self.board.canvas.coords(self.item, x, y)
+        if self.shadeItem is not None: self.board.canvas.coords(self.shadeItem, x, y, x+self.size, y+self.size)
+
+    def items(self):
+        """ Returns the ids of the Tile's canvas items """
+        if self.shadeItem is None: return (self.item,)
+        return (self.item, self.shadeItem)
 
-    def isSafe(self):
-        """ a Tile is considered 'safe' if and only if:
-                it is shown
-                its number of adjacent flags is equal to number of adjacent mines
+    def paintShade(self, percent):
+        """ Covers the Tile with a half transparent rectangle in its heat map colour
+            self.shadeItem: id of the rectangle, created the first time the Tile is shaded
         """
-        return self.shown and self.numFlags == self.count
+        canvas = self.board.canvas
+        if percent is None:
+            if self.shadeItem is not None: canvas.itemconfigure(self.shadeItem, state="hidden")
+        elif self.shadeItem is None:
+            x, y = self.col*self.size, self.row*self.size
+            self.shadeItem = canvas.create_rectangle(x, y, x+self.size, y+self.size, fill=heatColour(percent),
+                                                     stipple="gray50", width=0)
+        else:
+            canvas.itemconfigure(self.shadeItem, fill=heatColour(percent), state="normal")
+
+class OffscreenTile(TileView):
+    """ Stand-in for the Tile of a cell a ViewportBoard has not put on screen
+        It answers the same queries as a Tile, drawing on it does nothing
+    """
+    def draw(self, index):
+        pass
+
+    def shade(self, percent):
+        pass
 
 class Board(tk.Frame):
-    def __init__(self, rows, cols, minecount, parent):
+    def __init__(self, rows, cols, minecount, parent, boardPool=None):
         """ Attributes:
                 self.rows: total number of rows
                 self.cols: total number of columns
                 self.numMines: total number of mines
-                self.numFlags: total number of flags
-                self.numChecked: number of revealed that aren't mines Tiles
+                self.numFlags: number of flags shown, the Game's numFlags plus
+                    the mines flagged by revealBombs after a win
+                self.game: the minesweeper Game holding the state and rules of the current game,
+                    recording its moves in self.game.log
+                self.seed: seed for the mine placement of new Games, None for a random one
                 self.parent: parent element should be the root window i.e. App
                 self.tiles: list containing all Tiles on the Board
-                self.images: list of all images used by Board for smiley face
+                self.images: list of all images used by Board for smiley face, taken from SPRITES
                 self.minesArmed: boolean variable is True only if mines have been set
                 self.startTime: time.time() at start to calculate elapsed game time
+                self.inPlay: boolean that is True while the game is being played
+                self.changed: set of Tiles whose image differs from a fresh Tile
+                self.drawCount: total number of Tile image redraws, for benchmarks
+                self.boardPool: optional generator.BoardPool to take no-guess boards from
+                self.playback: id of the after() call playing the next move of replayLog, or None
+                self.heatMap: True to show the mine probability of every hidden Tile over it
+                self.shaded: set of Tiles showing a mine probability
+                self.frontier: dict of position to mine probability of the hidden cells next to
+                    a revealed number at the last heat map update
+                self.interior: mine probability of every other hidden cell that is not flagged
+                    at the last heat map update, None if there is none or the heat map is off
+                self.unpainted: deque of the positions whose Tiles are waiting to be redrawn, see drawChanged
+                self.painting: id of the after_idle() call painting the next slice of self.unpainted, or None
+                self.whenPainted: list of functions to call once self.unpainted has all been painted
 
             following are Label() widgets placed in self.setUpFrame():            
                 self.mineLabel: a Label() for showing numMines
@@ -147,39 +325,59 @@ class Board(tk.Frame):
         self.cols = cols
         self.numMines = minecount
         self.numFlags = 0
-        self.numChecked = 0
+        self.seed = None
+        self.game = None
+        self.newGame()
         self.parent = parent
         self.tiles = []
-        self.images = []
+        self.images = list(SPRITES.images("smile", TileView.size // TILE_SIZE))
         self.minesArmed = False
         self.startTime = None
-
-        #fill self.images with smile-*.gif files
-        for i in range(5):
-            self.images.append(tk.PhotoImage(file = "images/smile-"+str(i)+".gif"))
+        self.inPlay = True
+        self.changed = set()
+        self.drawCount = 0
+        self.boardPool = boardPool
+        self.playback = None
+        self.heatMap = False
+        self.shaded = set()
+        self.frontier = {}
+        self.interior = None
+        self.unpainted = deque()
+        self.painting = None
+        self.whenPainted = []
+        if boardPool is not None: boardPool.prepare(rows, cols, minecount)
 
         self.setUpFrame()
         self.addTiles(rows,cols,minecount)
 
     def resize(self, rows, cols, minecount, event=None):
-        """ clears the self.frame then rebuilds it based on new specifications"""
-        self.clearFrame()
+        """ Resizes the Board to the new specifications
+            the counters are kept and the Tiles reused, see addTiles
+        """
         #reset relevant instance variables
         self.rows = rows
         self.cols = cols
         self.numMines = minecount
-        self.numChecked = 0
         self.numFlags = 0
+        self.stopPlayback()
+        self.stopPainting()
+        self.newGame()
         self.minesArmed = False
         self.startTime = None
+        self.inPlay = True
+        if self.boardPool is not None: self.boardPool.prepare(rows, cols, minecount)
+        self.changed.clear()
+        self.shaded.clear()
 
-        #re-add all elements on the board
-        self.setUpFrame()
+        #reset the counters and lay the tiles out again
+        self.mineLabel.configure(text="Mines: "+str(self.numMines))
+        self.smileButton.configure(image=self.images[1])
+        self.flagLabel.configure(text="Flags: "+str(self.numFlags))
+        self.placeLabels()
         self.addTiles(rows,cols,minecount)
 
         #resize window to fit the new board size
-        windowWidth = str(20*cols+40)
-        windowHeight = str(20*rows+60)
+        windowWidth, windowHeight = self.windowSize()
         self.parent.minsize(windowWidth, windowHeight)
         self.parent.maxsize(windowWidth, windowHeight)
         self.parent.geometry(windowWidth+'x'+windowHeight)
@@ -199,129 +397,278 @@ class Board(tk.Frame):
         """
         #adds labels to the Board
         self.mineLabel = tk.Label(self, text="Mines: "+str(self.numMines))
-        self.mineLabel.grid(row=0, column=0, sticky="W", columnspan=int((self.cols-2)/2))
         self.smileButton = tk.Label(self, image=self.images[1])
-        self.smileButton.grid(row=0, column=int((self.cols-2)/2), sticky="WE", columnspan=2)
         self.flagLabel = tk.Label(self, text="Flags: "+str(self.numFlags))
-        self.flagLabel.grid(row=0, column=int((self.cols-2)/2)+2, sticky="E", columnspan=int((self.cols-1)/2))
+        self.placeLabels()
 
         #left click listeners on smileButton
         self.smileButton.bind('<ButtonPress-1>',  lambda event, num=0: self.changeSmile(num))
         self.smileButton.bind('<ButtonRelease-1>',  self.replay)
-                   
+
+    def placeLabels(self):
+        """ Grids the counters and the smiley above the Tiles, centred for the columns in view """
+        cols = self.viewSize()[1]
+        self.mineLabel.grid(row=0, column=0, sticky="W", columnspan=int((cols-2)/2))
+        self.smileButton.grid(row=0, column=int((cols-2)/2), sticky="WE", columnspan=2)
+        self.flagLabel.grid(row=0, column=int((cols-2)/2)+2, sticky="E", columnspan=int((cols-1)/2))
+
     def addTiles(self, rows, cols, minecount):
-        """ Adds all the needed tiles on the Board
-        """
-        for row in range(rows):
-            self.tiles.append([])
-            for col in range(cols):
-                tile = Tile(self, row, col)
-                tile.grid(row=row+1, column=col)
-                self.tiles[row].append(tile)
-                #left click listeners
-                tile.bind('<ButtonPress-1>',  self.pressTile)
-                tile.bind('<ButtonRelease-1>',  self.showTile)
-                #middle click listeners
-                tile.bind('<ButtonPress-2>', self.pressAdjTiles)
-                tile.bind('<ButtonRelease-2>', self.showAdjTiles)
-                #right click listeners
-                tile.bind('<ButtonPress-3>', self.pressTile)
-                tile.bind('<ButtonRelease-3>', self.toggleFlag)
+        """ Lays out rows x cols Tiles on the Board
+            The Tiles the Board already has are reused for the first cells, keeping their
+            bindings, so only the difference in size is created or destroyed
+        """
+        self.tiles = self.poolTiles(rows, cols, self.newTile)
+
+    def poolTiles(self, rows, cols, newTile):
+        """ Returns rows lists of cols Tiles, reusing the Board's Tiles in order
+            newTile(row, col) makes a Tile when there are not enough,
+            the Tiles left over are destroyed
+        """
+        pool = [tile for tileRow in self.tiles for tile in tileRow]
+        count = rows * cols
+        self.destroyTiles(pool[count:])
+        del pool[count:]
+        for pos, tile in enumerate(pool):
+            tile.moveTo(pos // cols, pos % cols)
+        for pos in range(len(pool), count):
+            pool.append(newTile(pos // cols, pos % cols))
+        return [pool[row*cols:(row+1)*cols] for row in range(rows)]
+
+    def destroyTiles(self, tiles):
+        """ Destroys the given Tiles, which are no longer on the Board """
+        for tile in tiles:
+            tile.destroy()
+
+    def newTile(self, row, col):
+        """ Returns a new Tile at (row, col) with its mouse bindings """
+        tile = Tile(self, row, col)
+        tile.reposition()
+        #left click listeners
+        tile.bind('<ButtonPress-1>',  self.pressTile)
+        tile.bind('<ButtonRelease-1>',  self.showTile)
+        #middle click listeners
+        tile.bind('<ButtonPress-2>', self.pressAdjTiles)
+        tile.bind('<ButtonRelease-2>', self.showAdjTiles)
+        #right click listeners
+        tile.bind('<ButtonPress-3>', self.pressTile)
+        tile.bind('<ButtonRelease-3>', self.toggleFlag)
+        return tile
+
+    def viewSize(self):
+        """ Returns the (rows, columns) of cells shown at once, the whole Board """
+        return self.rows, self.cols
+
+    def windowSize(self):
+        """ Returns the (width, height) strings of the window fitting the Board """
+        return windowSize(*self.viewSize())
 
     def changeSmile(self, num, event=None):
         """ Changes smileButton image to self.images[num]"""
         self.smileButton.configure(image=self.images[num])
 
+    def tileOf(self, pos):
+        """ Returns the Tile of position pos in self.game """
+        return self.tiles[pos // self.cols][pos % self.cols]
+
+    def imageOf(self, pos):
+        """ Returns the index in Tile.images of the image of the cell at pos:
+            the image of its Game state while the game is played,
+            and once it is over the mines and wrong flags the way revealBombs shows them
+        """
+        value = self.game.state[pos]
+        if not self.inPlay:
+            if self.game.mines[pos]:
+                if not self.game.lost: return 11
+                if value != MINE: return 9
+            elif value == FLAGGED:
+                return 12
+        return STATE_IMAGES[value]
+
     def getAdjacentTiles(self, row, col):
         """ Returns a list of Tiles adjacent to self.tiles[row][col]"""
-        adjacency = []
-        if row-1 >= 0:
-            if col-1 >= 0: adjacency.append(self.tiles[row-1][col-1])
-            if col+1 < self.cols: adjacency.append(self.tiles[row-1][col+1])
-            adjacency.append(self.tiles[row-1][col])
-        if col-1 >= 0: adjacency.append(self.tiles[row][col-1])
-        if col+1 < self.cols: adjacency.append(self.tiles[row][col+1])
-        if row+1 < self.rows:
-            if col-1 >= 0: adjacency.append(self.tiles[row+1][col-1])
-            if col+1 < self.cols: adjacency.append(self.tiles[row+1][col+1])
-            adjacency.append(self.tiles[row+1][col])
-        return adjacency
-        
+        return [self.tileOf(adj) for adj in self.game.adjacent(row * self.cols + col)]
     
     def replay(self, event=None):
         """ Resets the Board to be replayed with the same settings
             Note: the mine placement is randomized again
         """
         #reset relevant variables
-        self.numChecked = 0
         self.numFlags = 0
+        self.stopPlayback()
+        self.stopPainting()
+        self.newGame()
         self.minesArmed = False
         self.startTime = None
+        self.inPlay = True
 
         #reset labels
         self.mineLabel.configure(text="Mines: "+str(self.numMines))
         self.smileButton.configure(image=self.images[1])
         self.flagLabel.configure(text="Flags: "+str(self.numFlags))
 
-        #reset all tiles
-        for row in self.tiles:
-            for tile in row:
-                tile.replay()
+        #redraw only the tiles that changed during the last game
+        for tile in list(self.changed):
+            tile.refresh()
+        self.changed.clear()
+        self.updateHeatMap()
         
+    def newGame(self):
+        """ Replaces self.game with a new Game of the Board's size that records its moves """
+        self.game = Game(self.rows, self.cols, self.numMines, self.seed, renderMode="quiet")
+        self.game.recordMoves()
+        return self.game
+
+    def replayLog(self, log, speed=1.0):
+        """ Plays the moves of a movelog.MoveLog back on a fresh Board in real time,
+            or speed times faster, through the same handlers as the mouse clicks
+            The Board is resized first if the log was played on another size
+        """
+        if (log.rows, log.cols, log.minecount) != (self.rows, self.cols, self.numMines):
+            self.resize(log.rows, log.cols, log.minecount)
+        seed = self.seed
+        self.seed = log.seed
+        self.replay()
+        self.seed = seed
+        moves = list(log.moves())
+        def playNext(index):
+            action, pos, when = moves[index]
+            self.playMove(action, pos, log.mines)
+            if index + 1 < len(moves):
+                delay = int(1000 * (moves[index + 1][2] - when) / speed)
+                self.playback = self.after(max(delay, 0), playNext, index + 1)
+            else:
+                self.playback = None
+        #the first move is played straight away, without the wait before the first click
+        if moves: self.playback = self.after(0, playNext, 0)
+
+    def stopPlayback(self):
+        """ Cancels the moves of replayLog that have not been played yet """
+        if self.playback is not None:
+            self.after_cancel(self.playback)
+            self.playback = None
+
+    def playMove(self, action, pos, mines=None):
+        """ Plays one recorded move on the Board, mines is the MoveLog's preset mine layout """
+        event = MoveEvent(self.tileOf(pos), 3 if action == FLAG_MOVE else 1)
+        if action == START_MOVE:
+            self.startTime = self.game.start(pos, mines)
+            self.minesArmed = True
+        elif action == SHOW_MOVE: self.showTile(event)
+        elif action == FLAG_MOVE: self.toggleFlag(event)
+        elif action == CHORD_MOVE: self.showAdjTiles(event)
+
+    def saveGame(self, path):
+        """ Writes the current game and its elapsed time to path (see minesweeper.savefile) """
+        elapsed = 0.0
+        if self.startTime is not None: elapsed = time.time() - self.startTime
+        self.game.save(path, elapsed)
+
+    def loadGame(self, path):
+        """ Replaces the current game with the one saved at path by saveGame
+            The Board is resized if the saved game has another size,
+            and the clock carries on from the saved elapsed time
+        """
+        game, elapsed = Game.load(path, renderMode="quiet")
+        if (game.row, game.col, game.minecount) != (self.rows, self.cols, self.numMines):
+            self.resize(game.row, game.col, game.minecount)
+        else:
+            self.replay()
+        self.game = game
+        self.minesArmed = game.started
+        if game.started: self.startTime = time.time() - elapsed
+        self.numFlags = game.numFlags
+        self.flagLabel.configure(text="Flags: "+str(self.numFlags))
+        #only the cells the saved game has played differ from a fresh Board
+        for pos, value in enumerate(game.state):
+            if value != UNKNOWN: self.tileOf(pos).refresh()
+        #a finished game is shown the way it ended, without the pop up
+        if game.lost:
+            self.changeSmile(3)
+            self.revealBombs(False)
+        elif game.started and game.checkEnd():
+            self.changeSmile(4)
+            self.revealBombs(True)
+            self.flagLabel.configure(text="Flags: "+str(self.numFlags))
+        self.updateHeatMap()
+
+    def showHeatMap(self, show):
+        """ Turns the mine probability overlay on or off """
+        self.heatMap = show
+        self.updateHeatMap()
+
+    def updateHeatMap(self, changed=None):
+        """ Shows the mine probability of every hidden Tile over it while self.heatMap is on
+            and a started game is being played, and removes the overlay otherwise
+            changed, the positions a move changed, limits the repainting to them and to the cells
+            on the frontier before and after the move, as long as the percentage shown over the
+            hidden cells off the frontier is the same; otherwise every hidden Tile is visited
+            Only the Tiles whose percentage changed are repainted
+        """
+        frontier, interior = {}, None
+        if self.heatMap and self.inPlay and self.game.started:
+            #only loaded once the heat map is first turned on
+            from minesweeper.probability import frontierProbabilities
+            try:
+                frontier, interior = frontierProbabilities(self.game)
+            except ValueError:
+                #the flags contradict the numbers, there is nothing to show
+                pass
+        before = self.frontier
+        sameInterior = heatPercent(interior) == heatPercent(self.interior)
+        self.frontier = frontier
+        self.interior = interior
+        if changed is not None and sameInterior:
+            positions = set(changed)
+            positions.update(before)
+            positions.update(frontier)
+        else:
+            positions = set([tile.pos for tile in self.shaded])
+            if interior is None: positions.update(frontier)
+            else:
+                state = self.game.state
+                pos = state.find(UNKNOWN)
+                while pos != -1:
+                    positions.add(pos)
+                    pos = state.find(UNKNOWN, pos + 1)
+        for pos in positions:
+            tile = self.tileOf(pos)
+            tile.shade(self.percentOf(pos))
+            #a cell off screen has no Tile to shade
+            if tile.percent is not None: self.shaded.add(tile)
+            else: self.shaded.discard(tile)
+
+    def percentOf(self, pos):
+        """ Returns the mine probability in percent the heat map shows over pos, or None """
+        if pos in self.frontier: return heatPercent(self.frontier[pos])
+        if self.interior is not None and self.game.state[pos] == UNKNOWN: return heatPercent(self.interior)
+        return None
+
     def setUpBombs(self, event):
-        """ Chooses a random set of tiles and marks them as mines
+        """ Starts self.game with the clicked Tile as the first move, which places the mines
+            (taking a no-guess board from self.boardPool when one is ready)
             then saves current time.time() in self.startTime
             to calculate game duration later
         """
-        pos = (event.widget.row * self.cols) + event.widget.col
-        size = self.rows * self.cols
-        
-        #get a list random indexes in range to be mines
-        mines = random.sample(range(size), self.numMines)
-        if pos in mines:
-            mines.remove(pos)
-            temp = random.sample(range(size), 1)[0]
-            while (temp == pos): temp = random.sample(range(size), 1)[0]
-            mines.append(temp)
-            
-        #mark all mine squares as mines
-        for mine in mines:
-            targetRow = int(mine/self.cols)
-            targetCol = mine % self.cols
-            self.tiles[targetRow][targetCol].setMine()
-
-        #calculate the number in each Square of the current game
-        for row in self.tiles:
-            for tile in row:
-                if not tile.isMine():
-                    counter = 0
-                    for adjTile in self.getAdjacentTiles(tile.row,tile.col):
-                        if adjTile.isMine(): counter += 1
-                    tile.setCount(counter)
-                
+        pos = event.widget.pos
+        mines = None
+        if self.boardPool is not None:
+            mines = self.boardPool.take(self.rows, self.cols, self.numMines, pos)
+        self.startTime = self.game.start(pos, mines)
         self.minesArmed = True
-        self.startTime = time.time()
         return 1
 
-    def checkEnd(self, num):
-        """ Checks if the game should be ended based on the given arguemnt
-            Argument:
-                num: integer returned by show
-            Ends the game as a Loss if num < 0
-            Otherwise adds num to self.numChecked
+    def checkEnd(self):
+        """ Checks if the game should be ended after a reveal
+            Ends the game as a Loss if a mine was revealed
             ends the game as a win if win conditions are met
             i.e. total # of tiles - # of tiles checked == # of mines
         """
-        #negative num means loss case
-        if num < 0:
+        if self.game.lost:
             self.changeSmile(3)
             self.endGame("You Lost!\n", False)
-        #otherwise increment number of tiles revealed and check for win case
-        else:
-            self.numChecked += num
-            if (self.rows * self.cols) - self.numChecked == self.numMines:
-                self.changeSmile(4)
-                self.endGame("You Won!\n", True)
+        elif self.game.checkEnd():
+            self.changeSmile(4)
+            self.endGame("You Won!\n", True)
 
     def pressTile(self, event):
         """ Changes the image on the clicked Tile accordingly
@@ -337,19 +684,19 @@ class Board(tk.Frame):
                 self.setUpBombs(event)
 
     def toggleFlag(self, event):
-        """ Calls setFlag() on the Tile that was right clicked
+        """ Toggles the flag on the Tile that was right clicked
             Updates the self.numFlags counter accordingly and updates label on the board
             Reverts Smiley button's image to default smile to animate on clicks
         """                                                   
         clicked = event.widget
-        if clicked.isInPlay(): self.changeSmile(1)
-        value = clicked.setFlag()
-        for adjTile in self.getAdjacentTiles(clicked.row, clicked.col):
-            adjTile.numFlags += value
-        self.numFlags += value
+        if not clicked.isInPlay(): return
+        self.changeSmile(1)
+        self.game.toggleFlag(clicked.pos)
+        clicked.refresh()
+        self.numFlags = self.game.numFlags
         self.flagLabel.configure(text="Flags: "+str(self.numFlags))
+        if self.heatMap: self.updateHeatMap([clicked.pos])
         
-                
     def pressAdjTiles(self, event):
         """ Changes the image on the adjacent Tiles to be clicked
             only if the adjacent Tile is not flagged.
@@ -358,74 +705,115 @@ class Board(tk.Frame):
         clickedTile = event.widget
         if clickedTile.isInPlay(): self.changeSmile(2)
         for adjTile in self.getAdjacentTiles(clickedTile.row, clickedTile.col):
-            if not adjTile.isFlagged(): adjTile.buttonPress()
-
-    def cascadeShow(self, tile):
-        """ calls show() on every tile adjacent to the given tile
-            continues cascade if shown tile is zero
-            returns the total number of tiles newly revealed
-        """
-        value = 0
-        for adjTile in self.getAdjacentTiles(tile.row, tile.col):
-            returned = adjTile.show()
-            value += returned
-            if returned == 1 and adjTile.isZero():
-                value += self.cascadeShow(adjTile)
-        return value
-            
-    
+            adjTile.buttonPress()
+
+    def drawChanged(self, changed):
+        """ Redraws the Tiles of the given list of positions, returns the list
+            The Tiles are painted for at most PAINT_SLICE seconds straight away,
+            the rest of a large list in slices between which Tk handles input, see paintNext
+        """
+        self.unpainted.extend(changed)
+        if self.painting is None: self.paintNext()
+        return changed
+
+    def paintNext(self):
+        """ Redraws the Tiles of self.unpainted for at most PAINT_SLICE seconds,
+            scheduling the next slice with after_idle() so Tk first shows this one and handles input,
+            and calls the whenPainted functions once they have all been drawn
+            returns the number of Tiles redrawn
+        """
+        self.painting = None
+        unpainted = self.unpainted
+        deadline = time.perf_counter() + PAINT_SLICE
+        count = 0
+        while unpainted:
+            self.tileOf(unpainted.popleft()).refresh()
+            count += 1
+            #reading the clock costs more than a redraw, so it is only read every 64 Tiles
+            if count % 64 == 0 and time.perf_counter() > deadline: break
+        if unpainted:
+            self.painting = self.after_idle(self.paintNext)
+        else:
+            whenPainted = self.whenPainted
+            self.whenPainted = []
+            for function in whenPainted: function()
+        return count
+
+    def afterPainting(self, function):
+        """ Calls function once every Tile waiting to be redrawn has been painted """
+        if self.unpainted: self.whenPainted.append(function)
+        else: function()
+
+    def stopPainting(self):
+        """ Drops the Tiles waiting to be redrawn and the functions waiting for them """
+        if self.painting is not None:
+            self.after_cancel(self.painting)
+            self.painting = None
+        self.unpainted.clear()
+        del self.whenPainted[:]
+
+    def cascadeShow(self, positions):
+        """ reveals the given positions in self.game, cascading outwards from every zero,
+            and redraws the newly revealed tiles
+            returns the list of newly revealed positions
+        """
+        changed = []
+        for pos in positions:
+            changed.extend(self.game.reveal(pos))
+        return self.drawChanged(changed)
+
     def showTile(self, event):
-        """ Calls show() on clicked Tile if applicable
+        """ Reveals the clicked Tile if applicable
             Reverts Smiley button's image to default smile to animate on clicks
         """
         clicked = event.widget
         if clicked.isInPlay():
             self.changeSmile(1)
-            returned = clicked.show()
-            if returned == 1 and clicked.isZero():
-                returned += self.cascadeShow(clicked)
-            self.checkEnd(returned)
+            changed = self.cascadeShow([clicked.pos])
+            self.checkEnd()
+            if self.heatMap: self.updateHeatMap(changed)
 
     def showAdjTiles(self,event):
-        """ calls showAround() on clicked Tile if applicable"""
+        """ reveals the Tiles around the clicked Tile if applicable"""
         clicked = event.widget
         if clicked.isInPlay():
             self.changeSmile(1)
             #if tile is Safe, reveal adjacent tiles and cascade if needed
-            if clicked.isSafe():
-                    returned = 0
-                    for adjTile in self.getAdjacentTiles(clicked.row, clicked.col):
-                        value = adjTile.show()
-                        if value == 1 and adjTile.isZero():
-                            value += self.cascadeShow(adjTile)
-                        returned = -1 if (value == -1 or returned == -1) else value+returned
-                    self.checkEnd(returned)
+            if self.game.isSafe(clicked.pos):
+                changed = self.drawChanged(self.game.chord(clicked.pos))
+                self.checkEnd()
+                if self.heatMap: self.updateHeatMap(changed)
             #if unsafe, return adjacent buttons to unpressed images
             else:
                 for adjTile in self.getAdjacentTiles(clicked.row, clicked.col):
-                    if not adjTile.isFlagged() and not adjTile.isShown():
-                        adjTile.configure(image=Tile.images[10])
+                    adjTile.refresh()
     
     def revealBombs(self, win):
         """ If win == True, flags the unflagged mines
             otherwise it reveals the unrevealed mines and marks the incorrect flags
+            only the mines and the flagged tiles are visited and redrawn, see imageOf
         """
-        for row in self.tiles:
-            for tile in row:
-                tile.inPlay = False
-                if tile.isMine():
-                    if win:
-                        #flag non-flagged mines after winning
-                        if not tile.isFlagged():
-                            tile.configure(image=Tile.images[11])
-                            self.numFlags += 1
-                    else:
-                        #show unexploded mines after losing 
-                        if not tile.isShown():
-                            tile.configure(image=Tile.images[9])
-                #if incorrectly flagged, mark as such          
-                elif tile.isFlagged():
-                    tile.configure(image=Tile.images[12])
+        self.inPlay = False
+        game = self.game
+        shown = []
+        pos = game.mines.find(1)
+        while pos != -1:
+            if win:
+                #flag non-flagged mines after winning
+                if game.state[pos] != FLAGGED:
+                    shown.append(pos)
+                    self.numFlags += 1
+            else:
+                #show unexploded mines after losing 
+                if game.state[pos] != MINE:
+                    shown.append(pos)
+            pos = game.mines.find(1, pos + 1)
+        #if incorrectly flagged, mark as such          
+        pos = game.state.find(FLAGGED)
+        while pos != -1:
+            if not game.mines[pos]: shown.append(pos)
+            pos = game.state.find(FLAGGED, pos + 1)
+        self.drawChanged(shown)
         
     def endGame(self, msg, win):
         """ Calculates game duration based on self.startTime and time.time()
@@ -440,18 +828,318 @@ class Board(tk.Frame):
         msg +="Time: " + readableTime
         self.revealBombs(win)
         self.flagLabel.configure(text="Flags: "+str(self.numFlags))
-        messagebox.showinfo('Game Over', msg)
+        #the pop up waits for the rest of the board to be painted
+        self.afterPainting(lambda: messagebox.showinfo('Game Over', msg))
+
+class CanvasBoard(Board):
+    """ A Board that draws the whole minefield on one tk.Canvas
+        instead of creating a Label widget with its own bindings for every Tile.
+        Each Tile is a CanvasTile image item reusing the Tile.images sprites,
+        and mouse events on the canvas are sent to the Tile under the pointer.
+        Attributes on top of Board's:
+            self.canvas: the Canvas the minefield is drawn on
+            self.pressed: dict of mouse button number to the Tile it was pressed on
+    """
+    def addTiles(self, rows, cols, minecount):
+        """ Lays out one CanvasTile per cell, reusing the CanvasTiles already on the canvas
+            The canvas and its six bindings are only created the first time
+        """
+        self.pressed = {}
+        if self.tiles:
+            self.canvas.configure(width=cols*TileView.size, height=rows*TileView.size)
+        else:
+            self.canvas = tk.Canvas(self, width=cols*TileView.size, height=rows*TileView.size,
+                                    highlightthickness=0, borderwidth=0)
+            self.bindCanvas()
+        self.canvas.grid(row=1, column=0, columnspan=cols)
+        self.tiles = self.poolTiles(rows, cols, lambda row, col: CanvasTile(self, row, col))
+
+    def bindCanvas(self):
+        """ Binds the left, middle and right click listeners of the canvas to the Tile handlers """
+        for button, press, release in ((1, self.pressTile, self.showTile),
+                                       (2, self.pressAdjTiles, self.showAdjTiles),
+                                       (3, self.pressTile, self.toggleFlag)):
+            self.canvas.bind('<ButtonPress-'+str(button)+'>', lambda event, handler=press: self.dispatchPress(event, handler))
+            self.canvas.bind('<ButtonRelease-'+str(button)+'>', lambda event, handler=release: self.dispatchRelease(event, handler))
+
+    def destroyTiles(self, tiles):
+        """ Deletes the canvas items of the given CanvasTiles in a single call """
+        items = [item for tile in tiles for item in tile.items()]
+        if items: self.canvas.delete(*items)
+
+    def tileAt(self, x, y):
+        """ Returns the Tile at canvas coordinates (x, y), or None if there is no Tile there """
+        row = int(self.canvas.canvasy(y)) // TileView.size
+        col = int(self.canvas.canvasx(x)) // TileView.size
+        if 0 <= row < self.rows and 0 <= col < self.cols: return self.tileOf(row * self.cols + col)
+        return None
+
+    def dispatchPress(self, event, handler):
+        """ Calls handler with event.widget set to the Tile that was pressed
+            The Tile is remembered so the release goes to the same Tile,
+            just like a Label keeps the pointer grab between press and release
+        """
+        tile = self.tileAt(event.x, event.y)
+        self.pressed[event.num] = tile
+        if tile is not None:
+            event.widget = tile
+            handler(event)
+
+    def dispatchRelease(self, event, handler):
+        """ Calls handler with event.widget set to the Tile the button was pressed on """
+        tile = self.pressed.pop(event.num, None)
+        if tile is not None:
+            event.widget = tile
+            handler(event)
+
+class ViewportBoard(CanvasBoard):
+    """ A CanvasBoard for boards larger than the screen
+        The canvas shows a view of at most MAX_VIEW_WIDTH x MAX_VIEW_HEIGHT pixels that scrolls over the board,
+        and only the cells in view plus VIEW_MARGIN cells around them have a CanvasTile.
+        When the view scrolls past them the Tiles are moved to the cells coming into view
+        and redrawn from the Game, so the number of Tiles does not grow with the board.
+        A minimap next to the view shows the whole board with the view outlined on it,
+        clicking or dragging on it moves the view there.
+        Attributes on top of CanvasBoard's:
+            self.materialised: dict of position to the Tile of every cell on the canvas
+            self.top/self.left: first row and column of the cells that have a Tile
+            self.span: (rows, columns) of the cells that have a Tile
+            self.xscroll/self.yscroll: the Scrollbars of the view, only shown when the board does not fit in it
+            self.minimap: Canvas of the minimap, only shown when the board does not fit in the view
+            self.minimapImage: PhotoImage on the minimap, one pixel for every scale x scale block of cells
+                showing the top left cell of the block after drawMinimap, and the last
+                changed cell of the block after markMinimap
+            self.viewRect: id of the rectangle outlining the view on the minimap
+            self.scale: number of cells across every pixel of the minimap
+        self.tiles stays empty, the Tiles are found through self.materialised
+    """
+    def __init__(self, rows, cols, minecount, parent, boardPool=None):
+        self.canvas = None
+        self.materialised = {}
+        self.top = 0
+        self.left = 0
+        self.span = (0, 0)
+        CanvasBoard.__init__(self, rows, cols, minecount, parent, boardPool)
+
+    def viewSize(self):
+        """ Returns the (rows, columns) of cells the view shows at once """
+        return min(self.rows, MAX_VIEW_HEIGHT // TileView.size), min(self.cols, MAX_VIEW_WIDTH // TileView.size)
+
+    def scrolls(self):
+        """ Returns True if the board is larger than the view """
+        return self.viewSize() != (self.rows, self.cols)
+
+    def windowSize(self):
+        """ Returns the (width, height) strings of the window fitting the view, its scrollbars and the minimap """
+        viewRows, viewCols = self.viewSize()
+        windowWidth, windowHeight = windowSize(viewRows, viewCols)
+        if not self.scrolls(): return windowWidth, windowHeight
+        minimapWidth = -(-self.cols // self.scale)
+        return str(int(windowWidth)+SCROLLBAR_SIZE+minimapWidth+10), str(int(windowHeight)+SCROLLBAR_SIZE)
+
+    def setUpView(self):
+        """ Creates the canvas, its scrollbars and the minimap with their bindings """
+        self.canvas = tk.Canvas(self, highlightthickness=0, borderwidth=0)
+        self.bindCanvas()
+        #mouse wheel listeners, Shift scrolls sideways
+        #Windows and macOS send <MouseWheel>, X11 sends buttons 4 and 5
+        wheel = lambda event: -WHEEL_UNITS if event.delta > 0 else WHEEL_UNITS
+        self.canvas.bind('<MouseWheel>', lambda event: self.scrollY("scroll", wheel(event), "units"))
+        self.canvas.bind('<Shift-MouseWheel>', lambda event: self.scrollX("scroll", wheel(event), "units"))
+        self.canvas.bind('<Button-4>', lambda event: self.scrollY("scroll", -WHEEL_UNITS, "units"))
+        self.canvas.bind('<Button-5>', lambda event: self.scrollY("scroll", WHEEL_UNITS, "units"))
+        self.canvas.bind('<Shift-Button-4>', lambda event: self.scrollX("scroll", -WHEEL_UNITS, "units"))
+        self.canvas.bind('<Shift-Button-5>', lambda event: self.scrollX("scroll", WHEEL_UNITS, "units"))
+        self.xscroll = tk.Scrollbar(self, orient="horizontal", command=self.scrollX)
+        self.yscroll = tk.Scrollbar(self, orient="vertical", command=self.scrollY)
+        self.canvas.configure(xscrollcommand=self.xscroll.set, yscrollcommand=self.yscroll.set)
+
+        self.minimap = tk.Canvas(self, highlightthickness=1, borderwidth=0)
+        self.minimapImage = tk.PhotoImage(width=1, height=1)
+        self.minimap.create_image(0, 0, image=self.minimapImage, anchor="nw")
+        self.viewRect = self.minimap.create_rectangle(0, 0, 0, 0, outline="#ffff00")
+        #left click listeners on the minimap
+        self.minimap.bind('<ButtonPress-1>', lambda event: self.jumpTo(event.x, event.y))
+        self.minimap.bind('<B1-Motion>', lambda event: self.jumpTo(event.x, event.y))
+
+    def addTiles(self, rows, cols, minecount):
+        """ Lays the view out for a rows x cols board scrolled to its top left corner
+            and gives the cells around it Tiles, reusing the Tiles the Board already has
+        """
+        self.pressed = {}
+        if self.canvas is None: self.setUpView()
+        size = TileView.size
+        viewRows, viewCols = self.viewSize()
+        self.canvas.configure(width=viewCols*size, height=viewRows*size, scrollregion=(0, 0, cols*size, rows*size),
+                              xscrollincrement=size, yscrollincrement=size)
+        self.canvas.grid(row=1, column=0, columnspan=viewCols)
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+
+        self.scale = max(1, -(-max(rows, cols) // MINIMAP_SIZE))
+        width, height = -(-cols // self.scale), -(-rows // self.scale)
+        self.minimapImage.configure(width=width, height=height)
+        self.minimap.configure(width=width, height=height)
+        self.clearMinimap()
+        if self.scrolls():
+            self.yscroll.grid(row=1, column=viewCols, sticky="NS")
+            self.xscroll.grid(row=2, column=0, columnspan=viewCols, sticky="WE")
+            self.minimap.grid(row=1, column=viewCols+1, sticky="N", padx=5)
+        else:
+            for widget in (self.xscroll, self.yscroll, self.minimap): widget.grid_remove()
+
+        self.span = (min(rows, viewRows+2*VIEW_MARGIN), min(cols, viewCols+2*VIEW_MARGIN))
+        spare = list(self.materialised.values())
+        self.materialised = {}
+        self.materialise(0, 0, spare)
+        self.updateView()
+
+    def materialise(self, top, left, spare=()):
+        """ Gives a Tile to every cell of the self.span window starting at (top, left)
+            The Tiles already in the window stay where they are, the ones outside it and
+            the spare Tiles are moved to the cells without one, and only the Tiles
+            still missing are created or the ones left over destroyed
+        """
+        spanRows, spanCols = self.span
+        kept = {}
+        free = list(spare)
+        for pos, tile in self.materialised.items():
+            if top <= tile.row < top+spanRows and left <= tile.col < left+spanCols: kept[pos] = tile
+            else: free.append(tile)
+        for row in range(top, top+spanRows):
+            pos = row*self.cols + left
+            for col in range(left, left+spanCols):
+                if pos not in kept:
+                    if free:
+                        tile = free.pop()
+                        tile.moveTo(row, col, self.imageOf(pos))
+                    else:
+                        tile = CanvasTile(self, row, col)
+                        tile.refresh()
+                    percent = self.percentOf(pos)
+                    if percent is not None:
+                        tile.shade(percent)
+                        self.shaded.add(tile)
+                    kept[pos] = tile
+                pos += 1
+        self.destroyTiles(free)
+        self.shaded.difference_update(free)
+        self.changed.difference_update(free)
+        self.materialised = kept
+        self.top = top
+        self.left = left
+
+    def updateView(self):
+        """ Moves the Tiles to the cells around the view once it has scrolled past them
+            and outlines the view on the minimap
+        """
+        size = TileView.size
+        viewRows, viewCols = self.viewSize()
+        spanRows, spanCols = self.span
+        top = int(self.canvas.canvasy(0)) // size
+        left = int(self.canvas.canvasx(0)) // size
+        #a view scrolled part way into a cell shows one more row and column
+        bottom = min(top+viewRows+1, self.rows)
+        right = min(left+viewCols+1, self.cols)
+        if not (self.top <= top and bottom <= self.top+spanRows and self.left <= left and right <= self.left+spanCols):
+            self.materialise(max(0, min(top-VIEW_MARGIN, self.rows-spanRows)),
+                             max(0, min(left-VIEW_MARGIN, self.cols-spanCols)))
+        self.minimap.coords(self.viewRect, left/self.scale, top/self.scale,
+                            (left+viewCols)/self.scale, (top+viewRows)/self.scale)
+
+    def scrollX(self, *args):
+        """ Scrolls the view sideways, takes the arguments of Canvas.xview from the scrollbar """
+        self.canvas.xview(*args)
+        self.updateView()
+
+    def scrollY(self, *args):
+        """ Scrolls the view up or down, takes the arguments of Canvas.yview from the scrollbar """
+        self.canvas.yview(*args)
+        self.updateView()
+
+    def jumpTo(self, x, y):
+        """ Centres the view on the cells under pixel (x, y) of the minimap """
+        viewRows, viewCols = self.viewSize()
+        self.canvas.xview_moveto((x*self.scale - viewCols/2.0) / self.cols)
+        self.canvas.yview_moveto((y*self.scale - viewRows/2.0) / self.rows)
+        self.updateView()
+
+    def tileOf(self, pos):
+        """ Returns the Tile of position pos in self.game, an OffscreenTile if the cell has none """
+        tile = self.materialised.get(pos)
+        if tile is None: return OffscreenTile(self, pos // self.cols, pos % self.cols)
+        return tile
+
+    def clearMinimap(self):
+        """ Paints the whole minimap as hidden cells """
+        self.minimapImage.put(MINIMAP_COLOURS[UNKNOWN], to=(0, 0, self.minimapImage.width(), self.minimapImage.height()))
+
+    def drawMinimap(self):
+        """ Paints every pixel of the minimap with the top left cell of its block """
+        state = self.game.state
+        cols = self.cols
+        lines = []
+        for row in range(0, self.rows, self.scale):
+            lines.append("{" + " ".join([MINIMAP_COLOURS[state[pos]]
+                                         for pos in range(row*cols, (row+1)*cols, self.scale)]) + "}")
+        self.minimapImage.put(" ".join(lines), to=(0, 0))
+
+    def markMinimap(self, changed):
+        """ Paints the pixels of the minimap holding the given positions with their cells
+            A pixel whose block has several of the positions shows the last of them
+        """
+        if len(changed) > self.minimapImage.width() * self.minimapImage.height():
+            #more cells than pixels, painting every pixel once is cheaper
+            self.drawMinimap()
+            return
+        state = self.game.state
+        pixels = {}
+        for pos in changed:
+            pixels[(pos % self.cols // self.scale, pos // self.cols // self.scale)] = MINIMAP_COLOURS[state[pos]]
+        for pixel, colour in pixels.items():
+            self.minimapImage.put(colour, to=pixel)
+
+    def drawChanged(self, changed):
+        """ Redraws the Tiles of the given list of positions that are on the canvas
+            and their pixels of the minimap, returns the list
+        """
+        materialised = self.materialised
+        for pos in changed:
+            tile = materialised.get(pos)
+            if tile is not None: tile.refresh()
+        self.markMinimap(changed)
+        return changed
+
+    def toggleFlag(self, event):
+        """ Toggles the flag like Board.toggleFlag and paints it on the minimap """
+        CanvasBoard.toggleFlag(self, event)
+        self.markMinimap([event.widget.pos])
+
+    def replay(self, event=None):
+        """ Resets the Board like Board.replay and clears the minimap """
+        CanvasBoard.replay(self, event)
+        self.clearMinimap()
+
+    def loadGame(self, path):
+        """ Loads the game like Board.loadGame and paints it on the minimap """
+        CanvasBoard.loadGame(self, path)
+        self.drawMinimap()
 
 class App(tk.Tk):
-    def __init__(self, rows, cols, mines):
+    def __init__(self, rows, cols, mines, boardClass=Board, boardPool=None, zoom=1):
         """ inherits from tk.Tk()
             creates menu items and makes a board
             Arguments:
                 rows/cols = total # of rows/columns in the board to initialize
                 mines = total # of mines in the inital board
+                boardClass = Board to draw one Label per Tile, CanvasBoard to draw on one Canvas,
+                    ViewportBoard to scroll over boards larger than the screen
+                boardPool = optional generator.BoardPool to take no-guess boards from
+                zoom = whole number the size of every image is multiplied by
             Important variables:
                 self.menuVar = for the radio buttons for the quick start options in menu
                 self.checkVar = for custom options checkbox in menu (4 is on)
+                self.heatVar = for the mine probabilities checkbox in menu (1 is on)
                 self.optionVar = for tracking radio button chosen in optiosn window
                     (defined in self.options)
                 self.entry = list constaining 3 Entry widgets in options window
@@ -460,13 +1148,12 @@ class App(tk.Tk):
         tk.Tk.__init__(self)
         
         #load all needed images into Tile.images
-        for i in range(14):
-            Tile.images.append(tk.PhotoImage(file = "images/tile-"+str(i)+".gif"))
+        loadTileImages(zoom)
         
         self.menu = tk.Menu(self)
         self.configure(menu=self.menu)
         self.title("Minesweeper")
-        self.myBoard = Board(rows, cols, mines, self)
+        self.myBoard = boardClass(rows, cols, mines, self, boardPool)
         self.menuVar = tk.IntVar(self)
         self.menuVar.set(1)
         self.checkVar = tk.IntVar(self)
@@ -474,6 +1161,10 @@ class App(tk.Tk):
         self.gamemenu = tk.Menu(self.menu, tearoff = False)
         self.menu.add_cascade(label="Game", menu=self.gamemenu)
         self.gamemenu.add_command(label="New Game", command=self.myBoard.replay)
+        self.gamemenu.add_command(label="Save Game...", command=self.saveGame)
+        self.gamemenu.add_command(label="Load Game...", command=self.loadGame)
+        self.gamemenu.add_command(label="Save Move Log...", command=self.saveLog)
+        self.gamemenu.add_command(label="Replay Move Log...", command=self.replayLog)
         self.gamemenu.add_separator()
         self.gamemenu.add_radiobutton(variable = self.menuVar, value=1, label="Beginner", command=lambda: self.resize(8,8,10))
         self.gamemenu.add_radiobutton(variable = self.menuVar, value=2, label="Intermediate", command=lambda: self.resize(16,16,40))
@@ -481,9 +1172,13 @@ class App(tk.Tk):
         self.gamemenu.add_separator()
         self.gamemenu.add_checkbutton(variable = self.checkVar, onvalue=4, offvalue=0, label="Custom", command= self.options)
         self.gamemenu.add_separator()
+        self.heatVar = tk.IntVar(self)
+        self.heatVar.set(0)
+        self.gamemenu.add_checkbutton(variable = self.heatVar, onvalue=1, offvalue=0, label="Mine Probabilities",
+                                      command=lambda: self.myBoard.showHeatMap(self.heatVar.get() == 1))
+        self.gamemenu.add_separator()
         self.gamemenu.add_command(label="Exit", command=self.exitGame)
-        windowWidth = str(20*cols+40)
-        windowHeight = str(20*rows+60)
+        windowWidth, windowHeight = self.myBoard.windowSize()
         self.protocol("WM_DELETE_WINDOW", self.exitGame)
         self.minsize(windowWidth, windowHeight)
         self.maxsize(windowWidth, windowHeight)
@@ -495,6 +1190,55 @@ class App(tk.Tk):
         if self.menuVar.get() != 4: self.checkVar.set(0)
         self.myBoard.resize(rows, cols, mines)
         
+    def saveGame(self):
+        """ asks for a file and saves the current game to it """
+        path = filedialog.asksaveasfilename(defaultextension=".msw", filetypes=[("Minesweeper save", "*.msw")])
+        if not path: return
+        try:
+            self.myBoard.saveGame(path)
+        except OSError as error:
+            messagebox.showerror("Save Game", str(error))
+
+    def loadGame(self):
+        """ asks for a save file and continues the game saved in it """
+        path = filedialog.askopenfilename(filetypes=[("Minesweeper save", "*.msw")])
+        if not path: return
+        try:
+            self.myBoard.loadGame(path)
+        except (OSError, SaveError) as error:
+            messagebox.showerror("Load Game", str(error))
+            return
+        #the loaded size may not be one of the quick start options
+        self.checkVar.set(0)
+        self.menuVar.set(0)
+
+    def saveLog(self):
+        """ asks for a file and saves the move log of the current game to it """
+        path = filedialog.asksaveasfilename(defaultextension=".mlog", filetypes=[("Minesweeper move log", "*.mlog")])
+        if not path: return
+        log = self.myBoard.game.log
+        if log is None:
+            #a game continued from a save file has no record of the moves before it
+            messagebox.showerror("Save Move Log", "The moves of this game were not recorded")
+            return
+        try:
+            log.save(path)
+        except OSError as error:
+            messagebox.showerror("Save Move Log", str(error))
+
+    def replayLog(self):
+        """ asks for a move log and plays it back on the board in real time """
+        path = filedialog.askopenfilename(filetypes=[("Minesweeper move log", "*.mlog")])
+        if not path: return
+        try:
+            log = MoveLog.load(path)
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Replay Move Log", str(error))
+            return
+        self.checkVar.set(0)
+        self.menuVar.set(0)
+        self.myBoard.replayLog(log)
+
     def exitGame(self):
         """ destroys everything and exits the program """
         self.myBoard.clearFrame()
@@ -625,4 +1369,21 @@ class App(tk.Tk):
     
         
 if __name__ == "__main__":
-    App(8,8,10)
+    boardPool = None
+    if "--no-guess" in sys.argv:
+        from minesweeper.generator import BoardPool
+        boardPool = BoardPool()
+        #prepare the quick start difficulties so switching to them finds boards ready
+        for rows, cols, mines in ((8,8,10), (16,16,40), (16,30,99)): boardPool.prepare(rows, cols, mines)
+    if "--metrics" in sys.argv:
+        #time the engine's and the Board's hot paths and print a summary on exit
+        import atexit
+        from minesweeper.metrics import enable
+        metrics = enable(Board)
+        atexit.register(lambda: print(metrics.summary()))
+    zoom = 1
+    if "--zoom" in sys.argv: zoom = int(sys.argv[sys.argv.index("--zoom") + 1])
+    boardClass = Board
+    if "--canvas" in sys.argv: boardClass = CanvasBoard
+    if "--viewport" in sys.argv: boardClass = ViewportBoard
+    App(8,8,10, boardClass, boardPool, zoom)
@@ -17,11 +17,7 @@ cx_Freeze.setup(
             ],
             #"packages": ["tkinter"],
             "include_files": [
-		"images/tile-0.gif", "images/tile-1.gif", "images/tile-2.gif", "images/tile-3.gif", 
-		"images/tile-4.gif", "images/tile-5.gif", "images/tile-6.gif", "images/tile-7.gif",
-		"images/tile-8.gif", "images/tile-9.gif", "images/tile-10.gif", "images/tile-11.gif",
-		"images/tile-12.gif", "images/tile-13.gif", "images/smile-0.gif", "images/smile-1.gif",
-		"images/smile-2.gif", "images/smile-3.gif",  "images/smile-4.gif", 
+		"images/sprites.gif",
                 os.path.join(PYTHON_INSTALL_DIR, 'DLLs', 'tk86t.dll'), os.path.join(PYTHON_INSTALL_DIR, 'DLLs', 'tcl86t.dll'),
 	    ]
         }},
@@ -0,0 +1,50 @@
+""" Checks of minesweeper.infinite, run with "python -m unittest discover tests" """
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from minesweeper.infinite import InfiniteGame
+
+class InfiniteGameTest(unittest.TestCase):
+    # asserts every revealed cell shows the number of mines around it, across chunk borders
+    def assertCountsMatchMines(self, game):
+        size = game.chunkSize
+        for (cy, cx), chunk in list(game.chunks.items()):
+            for local, value in enumerate(chunk.state):
+                if value > 8: continue
+                row, col = divmod(local, size)
+                row += cy * size
+                col += cx * size
+                mines = sum([game.isMine(*cell) for cell in game.adjacent((row, col))])
+                self.assertEqual(value, mines, "cell (%d, %d) of seed %r" % (row, col, game.seed))
+
+    def testCountsAfterLookingBeforeTheFirstReveal(self):
+        for seed in range(40):
+            game = InfiniteGame(seed = seed, chunkSize = 8)
+            #creates the chunks around the first click before the safe cells are known,
+            #the safe cells straddle the corner of four chunks
+            for row, col in ((7, 7), (7, 8), (8, 7), (8, 8), (20, 20)): game.stateAt(row, col)
+            game.toggleFlag(25, 13)
+            game.reveal(8, 8)
+            self.assertFalse(game.lost)
+            self.assertCountsMatchMines(game)
+            game.close()
+
+    def testCountsWithoutLookingFirst(self):
+        for seed in range(20):
+            game = InfiniteGame(seed = seed, chunkSize = 8)
+            game.reveal(3, -5)
+            self.assertCountsMatchMines(game)
+            game.close()
+
+    def testFlagsKeptAcrossTheFirstReveal(self):
+        game = InfiniteGame(seed = 1, chunkSize = 8)
+        game.toggleFlag(30, 30)
+        game.reveal(0, 0)
+        self.assertEqual(game.stateAt(30, 30), 10)
+        game.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+""" Checks of minesweeper.protocol, run with "python -m unittest discover tests" """
+
+import io
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from minesweeper.metrics import enable
+from minesweeper.protocol import serve
+
+class ProtocolTest(unittest.TestCase):
+    # serves the commands and returns the decoded events, without the ready event
+    def exchange(self, commands, metrics = None):
+        output = io.BytesIO()
+        serve(io.BytesIO("".join([json.dumps(command) + "\n" for command in commands]).encode()),
+              output, metrics = metrics)
+        return [json.loads(line) for line in output.getvalue().splitlines()[1:]]
+
+    def testMetricsEventHoldsMoveTimings(self):
+        metrics = enable()
+        try:
+            #with 80 mines every cell but the first show at 40 is a mine, so that show wins
+            events = self.exchange([
+                {"cmd": "new", "rows": 9, "cols": 9, "mines": 80, "seed": 1},
+                {"cmd": "flag", "pos": 0},
+                {"cmd": "chord", "pos": 40},
+                {"cmd": "show", "pos": 40},
+                {"cmd": "new", "rows": 9, "cols": 9, "mines": 80, "seed": 1},
+                {"cmd": "batch", "moves": [["show", 40], ["flag", 0], ["show", 0]]},
+            ], metrics)
+        finally:
+            metrics.uninstall()
+        reports = [event["metrics"] for event in events if event["event"] == "metrics"]
+        self.assertEqual(len(reports), 2)
+        single, batch = reports
+        for name in ("Game.start", "Game.reveal", "Game.chord", "Game.toggleFlag"):
+            self.assertGreaterEqual(single[name]["calls"], 1, name)
+            self.assertGreater(single[name]["total"], 0.0, name)
+        self.assertEqual(batch["Game.play"]["calls"], 1)
+        self.assertGreater(batch["Game.play"]["total"], 0.0)
+
+    def testMalformedCommands(self):
+        events = self.exchange([{"cmd": "show", "pos": 0}, {"cmd": ["new"]}, {"cmd": "quit", "id": 7}])
+        self.assertEqual([event["event"] for event in events], ["error", "error", "bye"])
+        self.assertEqual(events[-1]["id"], 7)
+
+    def testDeepNestingAndHugeBoardsAreErrors(self):
+        output = io.BytesIO()
+        lines = [b"[" * 100000 + b"]" * 100000,
+                 b'{"cmd":"state","id":' + b"[" * 995 + b"]" * 995 + b"}",
+                 b'{"cmd":"new","rows":100000,"cols":100000,"mines":1}',
+                 b'{"cmd":"quit"}']
+        serve(io.BytesIO(b"\n".join(lines) + b"\n"), output)
+        events = [json.loads(line) for line in output.getvalue().splitlines()[1:]]
+        self.assertEqual([event["event"] for event in events], ["error", "error", "error", "bye"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+""" Checks of minesweeper.savefile, run with "python -m unittest discover tests" """
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from minesweeper.engine import Game
+from minesweeper.savefile import save, load
+
+class SaveFileTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "game.msav")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    # saves game and returns the Game loaded back from the save
+    def roundTrip(self, game):
+        save(game, self.path, 1.5)
+        loaded, elapsed = load(self.path, "quiet")
+        self.assertEqual(elapsed, 1.5)
+        return loaded
+
+    def testFlagsBeforeTheFirstClickAreKept(self):
+        game = Game(9, 9, 10, 1, renderMode="quiet")
+        game.toggleFlag(0)
+        game.toggleFlag(40)
+        loaded = self.roundTrip(game)
+        self.assertFalse(loaded.started)
+        self.assertEqual(loaded.state, game.state)
+        self.assertEqual(loaded.numFlags, 2)
+
+    def testStartedGame(self):
+        game = Game(16, 30, 99, 1, renderMode="quiet")
+        game.toggleFlag(0)
+        game.start(240)
+        game.reveal(240)
+        loaded = self.roundTrip(game)
+        self.assertEqual(loaded.state, game.state)
+        self.assertEqual(loaded.mines, game.mines)
+        self.assertEqual((loaded.numFlags, loaded.numChecked), (game.numFlags, game.numChecked))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+""" Checks of minesweeper.server, run with "python -m unittest discover tests" """
+
+import asyncio
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from minesweeper.engine import neighbourTable
+from minesweeper.server import Server, MAX_LINE, MAX_CELLS
+
+class ServerTest(unittest.TestCase):
+    # sends the request lines on one connection without waiting and returns the decoded replies
+    def exchange(self, lines):
+        async def run():
+            server = Server()
+            listener = await asyncio.start_server(server.handle, "127.0.0.1", 0, limit = MAX_LINE)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"".join([line + b"\n" for line in lines]))
+            await writer.drain()
+            replies = [json.loads(await reader.readline()) for line in lines]
+            #waits for the server to close its end, so its handler is done before the loop closes
+            writer.write_eof()
+            await reader.read()
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return replies
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+    def testMalformedRequestsKeepTheConnection(self):
+        replies = self.exchange([
+            b'{"op":"new","rows":9,"cols":9,"mines":10,"seed":1,"id":1}',
+            b'{"op":[1],"id":2}',
+            b'{"op":{"a":1}}',
+            b'{"op":"show","session":[1],"pos":40}',
+            b'{"op":"flag","session":{"a":1},"pos":40}',
+            b'{"op":"show","session":1,"pos":"40"}',
+            b'not json',
+            b'[1, 2]',
+            b'[' * 20000 + b']' * 20000,
+            #whether an id this deep can be encoded back depends on the Python version
+            b'{"op":"board","session":1,"id":' + b'[' * 995 + b']' * 995 + b'}',
+            b'{"op":"show","session":1,"pos":40,"id":3}',
+        ])
+        self.assertEqual(replies[0], {"session": 1, "id": 1})
+        for reply in replies[1:-2]:
+            self.assertIn("error", reply)
+        self.assertTrue("error" in replies[-2] or "state" in replies[-2])
+        self.assertEqual(replies[1]["id"], 2)
+        self.assertEqual(replies[-1]["id"], 3)
+        self.assertFalse(replies[-1]["lost"])
+        self.assertEqual(replies[-1]["cells"][0], 40)
+
+    def testNewSessionsNeverBuildATable(self):
+        server = Server()
+        built = neighbourTable.cache_info().misses
+        for rows, cols in ((16, 30), (100, 100), (37, 41)):
+            server.dispatch(('{"op":"new","rows":%d,"cols":%d,"mines":10}' % (rows, cols)).encode())
+        self.assertEqual(neighbourTable.cache_info().misses, built)
+        self.assertEqual(len(server.sessions), 3)
+
+    def testBoardSizesAreCapped(self):
+        server = Server(maxCells = 1000)
+        def request(text):
+            return json.loads(server.dispatch(text.encode()))
+        self.assertIn("error", request('{"op":"new","rows":1000,"cols":1000,"mines":0}'))
+        self.assertIn("error", request('{"op":"new","rows":%d,"cols":2,"mines":0}' % MAX_CELLS))
+        first = request('{"op":"new","rows":16,"cols":30,"mines":99}')["session"]
+        request('{"op":"new","rows":16,"cols":30,"mines":99}')
+        self.assertIn("error", request('{"op":"new","rows":9,"cols":9,"mines":10}'))
+        request('{"op":"close","session":%d}' % first)
+        self.assertNotIn("error", request('{"op":"new","rows":9,"cols":9,"mines":10}'))
+        self.assertEqual(server.cells, 16 * 30 + 9 * 9)
+
+if __name__ == "__main__":
+    unittest.main()